@@ -1,23 +1,46 @@
 """Public API for the CopySVGTranslation package."""
 
-from .extraction import extract
-from .injection import generate_unique_id, inject, start_injects
+from .extraction import extract, extract_streaming
+from .injection import (
+    CompiledMapping,
+    compile_mapping,
+    generate_unique_id,
+    inject,
+    inject_streaming,
+    iter_injects,
+    plan_injection,
+    plan_injections,
+    start_injects,
+    start_reinjects,
+)
+from .session import TranslationSession
 from .text_utils import normalize_text
-from .workflows import svg_extract_and_inject, svg_extract_and_injects
-from .titles import make_title_translations, get_titles_translations
+from .workflows import svg_extract_and_inject, svg_extract_and_inject_many, svg_extract_and_injects
+from .titles import make_title_translations, get_titles_translations, make_title_index
 from .injection import make_translation_ready
 from .nested_analyze import match_nested_tags, fix_nested_file, fix_nested_tspans
 
 __all__ = [
+    "CompiledMapping",
+    "compile_mapping",
     "extract",
+    "extract_streaming",
     "generate_unique_id",
     "inject",
+    "inject_streaming",
+    "iter_injects",
     "normalize_text",
+    "plan_injection",
+    "plan_injections",
     "start_injects",
+    "start_reinjects",
     "svg_extract_and_inject",
+    "svg_extract_and_inject_many",
     "svg_extract_and_injects",
+    "TranslationSession",
     "make_title_translations",
     "get_titles_translations",
+    "make_title_index",
     "make_translation_ready",
     "match_nested_tags",
     "fix_nested_tspans",
@@ -0,0 +1,521 @@
+"""Long-running translation service that keeps the mappings loaded between requests.
+
+The daemon speaks HTTP over a Unix socket or a localhost TCP port. Each job is
+a ``POST`` of the raw SVG bytes to ``/inject``, ``/extract`` or ``/plan``; the
+JSON response carries the result. ``GET /health`` reports the daemon's state.
+
+python -m CopySVGTranslation.daemon --mapping data/translations.json --socket /run/svgtranslate.sock
+"""
+
+from __future__ import annotations
+
+import argparse
+import errno
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Iterable, Protocol, TypedDict
+from urllib.parse import urlsplit
+
+from lxml import etree
+
+from .diagnostics import debug
+from .session import TranslationSession
+
+logger = logging.getLogger("CopySVGTranslation")
+
+JOBS = ("inject", "extract", "plan")
+
+_NESTED_TSPANS_ERROR = "structure-error-nested-tspans-not-supported"
+
+# Per-process state installed by ``_init_worker`` so each worker loads the mappings once
+_worker_options: dict[str, Any] = {}
+
+
+def run_job(session: TranslationSession, job: str, svg: bytes) -> tuple[int, dict]:
+    """Run ``job`` on the uploaded ``svg`` with ``session`` and return ``(http_status, payload)``.
+
+    ``inject`` returns the translated document as ``svg`` along with its
+    ``stats``, ``extract`` its ``translations`` and ``plan`` the
+    :func:`~.injection.planning.plan_injection` result as ``plan``. Documents
+    the library rejects get a 422 status and the ``error``.
+    """
+    with tempfile.TemporaryDirectory(prefix="svgtranslate-") as workdir:
+        path = Path(workdir) / "upload.svg"
+        path.write_bytes(svg)
+
+        if job == "inject":
+            tree, stats = session.inject(path)
+            if tree is None:
+                return 422, {"error": stats.get("error", _NESTED_TSPANS_ERROR), "stats": stats}
+            output = etree.tostring(
+                tree, encoding="UTF-8", xml_declaration=True, pretty_print=session.pretty_print
+            )
+            return 200, {"stats": stats, "svg": output.decode("utf-8")}
+
+        if job == "extract":
+            translations = session.extract(path)
+            if translations is None:
+                return 422, {"error": "Failed to parse SVG file"}
+            return 200, {"translations": translations}
+
+        result = session.plan(path)
+        if "stats" not in result:
+            return 422, {"error": result.get("error", _NESTED_TSPANS_ERROR), "plan": result}
+        return 200, {"plan": result}
+
+
+class SessionOptions(TypedDict):
+    """The :class:`~.session.TranslationSession` options of every session a daemon loads."""
+
+    case_insensitive: bool
+    overwrite: bool
+    pretty_print: bool
+
+
+def _init_worker(mapping_files: list[Path], options: SessionOptions) -> None:
+    """Load the mappings into a session of the worker process."""
+    # Ctrl-C reaches the whole process group; the daemon shuts the pool down itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_options["session"] = TranslationSession(mapping_files=mapping_files, **options)
+
+
+def _worker_ready(_index: int) -> int:
+    return os.getpid()
+
+
+def _worker_run(job: str, svg: bytes) -> tuple[int, dict]:
+    return run_job(_worker_options["session"], job, svg)
+
+
+class _EngineClosed(RuntimeError):
+    """Raised by :meth:`_PoolEngine.run` once the pool was shut down."""
+
+
+class _Engine(Protocol):
+    """Runs jobs on one load of the mappings: :class:`_SessionEngine` or :class:`_PoolEngine`."""
+
+    def run(self, job: str, svg: bytes) -> tuple[int, dict]: ...
+
+    def close(self, wait: bool = True) -> None: ...
+
+
+class _SessionEngine:
+    """Runs jobs in the calling thread on one shared session."""
+
+    def __init__(self, mapping_files: list[Path], options: SessionOptions):
+        self.session = TranslationSession(mapping_files=mapping_files, **options)
+
+    def run(self, job: str, svg: bytes) -> tuple[int, dict]:
+        return run_job(self.session, job, svg)
+
+    def close(self, wait: bool = True) -> None:
+        pass
+
+
+class _PoolEngine:
+    """Runs jobs in a pool of ``workers`` processes, each loading its own session.
+
+    The workers are started and load the mappings before the constructor
+    returns; it raises ``ValueError`` if one of them fails to.
+    """
+
+    def __init__(self, mapping_files: list[Path], options: SessionOptions, workers: int):
+        self._lock = threading.Lock()
+        self._closed = False
+        # Spawned workers: forking a process that runs server threads is unsafe
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(mapping_files, options),
+        )
+        try:
+            list(self._pool.map(_worker_ready, range(workers)))
+        except BrokenProcessPool as exc:
+            self._pool.shutdown(cancel_futures=True)
+            raise ValueError(f"Failed to load the mappings in the workers: {exc}") from exc
+
+    def run(self, job: str, svg: bytes) -> tuple[int, dict]:
+        with self._lock:
+            if self._closed:
+                raise _EngineClosed("The worker pool was shut down")
+            future = self._pool.submit(_worker_run, job, svg)
+        return future.result()
+
+    def close(self, wait: bool = True) -> None:
+        """Shut the pool down.
+
+        With ``wait`` queued jobs are cancelled and the workers joined;
+        without, the jobs already submitted still finish in the background.
+        """
+        with self._lock:
+            self._closed = True
+        self._pool.shutdown(wait=wait, cancel_futures=wait)
+
+
+class TranslationDaemon:
+    """Keeps the compiled mappings of ``mapping_files`` warm and runs jobs against them.
+
+    The HTTP server handles connections on a fixed pool of ``threads``
+    threads, so each thread and the XML parser it keeps in the session are
+    reused across requests; connections beyond that wait for a free thread.
+
+    With ``workers=0`` jobs run in the calling thread on one shared
+    :class:`~.session.TranslationSession`. Otherwise they are sent to a pool of
+    that many processes, each holding its own session, so concurrent requests
+    run in parallel. Every worker loads and compiles its own copy of the
+    mappings, so the pool costs ``workers`` times the memory and load time.
+
+    :meth:`check_mappings` reloads the mappings when the modification time or
+    size of one of their files changes. The new mappings are loaded next to
+    the current ones and swapped in once ready, so requests are not held up;
+    a reload that fails keeps the current mappings. :meth:`serve` checks every
+    ``reload_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        mapping_files: Iterable[Path | str],
+        workers: int = 0,
+        threads: int = 8,
+        case_insensitive: bool = True,
+        overwrite: bool = False,
+        pretty_print: bool = True,
+        reload_interval: float = 2.0,
+        max_upload: int = 64 * 1024 * 1024,
+    ):
+        self.mapping_files = [Path(str(path)) for path in mapping_files]
+        self.workers = workers
+        self.threads = threads
+        self.reload_interval = reload_interval
+        self.max_upload = max_upload
+        self._options = SessionOptions(
+            case_insensitive=case_insensitive, overwrite=overwrite, pretty_print=pretty_print
+        )
+
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._metrics = {job: {"calls": 0, "errors": 0, "seconds": 0.0} for job in JOBS}
+        self.reloads = 0
+
+        self._state = self._mapping_state()
+        self._engine = self._load()
+        self.loaded_at = time.time()
+
+    def _mapping_state(self) -> tuple[tuple[int, int] | None, ...]:
+        state: list[tuple[int, int] | None] = []
+        for path in self.mapping_files:
+            try:
+                stat = path.stat()
+            except OSError:
+                state.append(None)
+            else:
+                state.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(state)
+
+    def _load(self) -> _Engine:
+        """Return an engine with freshly loaded mappings.
+
+        Raises ``ValueError`` if they fail to load.
+        """
+        started = time.perf_counter()
+        engine: _Engine
+        if self.workers:
+            engine = _PoolEngine(self.mapping_files, self._options, self.workers)
+        else:
+            engine = _SessionEngine(self.mapping_files, self._options)
+        seconds = time.perf_counter() - started
+        debug("Mappings loaded", files=self.mapping_files, workers=self.workers, seconds=seconds)
+        return engine
+
+    def _replace_engine(self, expected: _Engine) -> bool:
+        """Load the mappings again and swap them in.
+
+        Does nothing if another thread already replaced ``expected``.
+        """
+        with self._reload_lock:
+            if self._engine is not expected:
+                return False
+            try:
+                engine = self._load()
+            except ValueError as exc:
+                logger.error(f"Keeping the current mappings: {exc}")
+                return False
+            with self._lock:
+                self._engine = engine
+                self.loaded_at = time.time()
+                self.reloads += 1
+        # Jobs already running on the old engine still finish
+        expected.close(wait=False)
+        return True
+
+    def check_mappings(self) -> bool:
+        """Reload the mappings if one of their files changed since the last check.
+
+        Returns whether they were reloaded.
+        """
+        state = self._mapping_state()
+        with self._lock:
+            if state == self._state:
+                return False
+            # Remembered even if the reload fails, so a broken file is not reloaded on every check
+            self._state = state
+            engine = self._engine
+        logger.info("Mapping files changed, reloading")
+        return self._replace_engine(engine)
+
+    def run(self, job: str, svg: bytes) -> tuple[int, dict]:
+        """Run ``job`` on ``svg`` and return ``(http_status, payload)``; see :func:`run_job`."""
+        if job not in JOBS:
+            return 404, {"error": f"Unknown job {job!r}; expected one of {', '.join(JOBS)}"}
+
+        started = time.perf_counter()
+        with self._lock:
+            engine = self._engine
+        try:
+            try:
+                code, payload = engine.run(job, svg)
+            except _EngineClosed:
+                with self._lock:
+                    current = self._engine
+                if current is engine:
+                    raise
+                # A reload swapped the engine between picking and submitting the job
+                engine = current
+                code, payload = engine.run(job, svg)
+        except BrokenProcessPool as exc:
+            logger.error(f"Worker pool failed, restarting it: {exc}")
+            self._replace_engine(engine)
+            code, payload = 500, {"error": "Worker process failed"}
+        except Exception as exc:
+            logger.exception(f"Failed to run {job} job")
+            code, payload = 500, {"error": str(exc)}
+
+        with self._lock:
+            counters = self._metrics[job]
+            counters["calls"] += 1
+            counters["errors"] += int(code != 200)
+            counters["seconds"] += time.perf_counter() - started
+        return code, payload
+
+    def health(self) -> dict[str, Any]:
+        """Return the mapping files, their load time, the reload count and per-job counters."""
+        with self._lock:
+            jobs = {job: dict(counters) for job, counters in self._metrics.items()}
+        return {
+            "status": "ok",
+            "mapping_files": [str(path) for path in self.mapping_files],
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "workers": self.workers,
+            "threads": self.threads,
+            "jobs": jobs,
+        }
+
+    def make_server(
+        self,
+        socket_path: Path | str | None = None,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+    ) -> _UnixHTTPServer | _TCPHTTPServer:
+        """Return an HTTP server for this daemon.
+
+        It listens on the Unix ``socket_path``, or on ``host``:``port`` without one.
+        A socket left behind by a daemon that exited is replaced; ``OSError`` is
+        raised if a server still listens on it.
+        """
+        if not socket_path:
+            return _TCPHTTPServer((host, port), self)
+        socket_path = Path(str(socket_path))
+        _remove_stale_socket(socket_path)
+        return _UnixHTTPServer(str(socket_path), self)
+
+    def serve(
+        self,
+        socket_path: Path | str | None = None,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+    ) -> None:
+        """Serve requests until interrupted.
+
+        The mapping files are checked every ``reload_interval`` seconds.
+        """
+        server = self.make_server(socket_path, host, port)
+        watcher = threading.Thread(target=self._watch, name="mapping-watcher", daemon=True)
+        watcher.start()
+        if isinstance(server, _TCPHTTPServer):
+            logger.info(f"Serving on http://{host}:{server.server_port}")
+        else:
+            logger.info(f"Serving on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if socket_path:
+                Path(str(socket_path)).unlink(missing_ok=True)
+            self.close()
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.reload_interval):
+            try:
+                self.check_mappings()
+            except Exception:
+                logger.exception("Failed to check the mapping files")
+
+    def close(self) -> None:
+        """Stop the mapping watcher and the worker pool."""
+        self._stopped.set()
+        self._engine.close()
+
+    def __enter__(self) -> TranslationDaemon:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _remove_stale_socket(path: Path) -> None:
+    """Remove the socket ``path`` unless a server accepts connections on it."""
+    if not path.is_socket():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except ConnectionRefusedError:
+            path.unlink()
+            return
+    raise OSError(errno.EADDRINUSE, f"A server is already listening on {path}")
+
+
+class _PooledThreadsMixIn(socketserver.ThreadingMixIn):
+    """Handles each connection on a fixed pool of the daemon's ``threads`` threads."""
+
+    translation_daemon: TranslationDaemon
+    _executor: ThreadPoolExecutor
+
+    def _attach(self, daemon: TranslationDaemon) -> None:
+        self.translation_daemon = daemon
+        self._executor = ThreadPoolExecutor(daemon.threads, thread_name_prefix="daemon-request")
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        self._executor.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._executor.shutdown(wait=False)
+
+
+class _UnixHTTPServer(_PooledThreadsMixIn, socketserver.UnixStreamServer):
+    def __init__(self, path: str, daemon: TranslationDaemon):
+        self._attach(daemon)
+        super().__init__(path, _RequestHandler)
+
+
+class _TCPHTTPServer(_PooledThreadsMixIn, HTTPServer):
+    def __init__(self, address: tuple[str, int], daemon: TranslationDaemon):
+        self._attach(daemon)
+        super().__init__(address, _RequestHandler)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Maps ``POST /<job>`` and ``GET /health`` onto the server's :class:`TranslationDaemon`."""
+
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections are closed so they do not hold a pool thread
+    timeout = 60
+    server: _UnixHTTPServer | _TCPHTTPServer
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path.rstrip("/") == "/health":
+            self._send(200, self.server.translation_daemon.health())
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_POST(self) -> None:
+        job = urlsplit(self.path).path.strip("/")
+        length = self.headers.get("Content-Length")
+        if length is None or not length.isdigit():
+            # The unread body would otherwise be parsed as the next request
+            self.close_connection = True
+            self._send(411, {"error": "Content-Length required"})
+            return
+        daemon = self.server.translation_daemon
+        if int(length) > daemon.max_upload:
+            self.close_connection = True
+            self._send(413, {"error": f"Upload larger than {daemon.max_upload} bytes"})
+            return
+        svg = self.rfile.read(int(length))
+        self._send(*daemon.run(job, svg))
+
+    def _send(self, code: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        address = self.client_address
+        # Unix socket peers have no address
+        return str(address[0]) if isinstance(address, tuple) and address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        debug("HTTP request", client=self.address_string(), request=format % args)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve inject, extract and plan jobs with warm mappings."
+    )
+    parser.add_argument(
+        "--mapping", type=Path, nargs="+", required=True, help="translation mapping JSON files"
+    )
+    parser.add_argument("--socket", type=Path, help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="worker processes, each holding a copy of the mappings; 0 runs jobs in threads",
+    )
+    parser.add_argument(
+        "--threads", type=int, default=8, help="connections handled at the same time"
+    )
+    parser.add_argument(
+        "--overwrite", action="store_true", help="update translations already in the files"
+    )
+    parser.add_argument(
+        "--reload-interval", type=float, default=2.0, help="seconds between mapping file checks"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    daemon = TranslationDaemon(
+        args.mapping,
+        workers=args.workers,
+        threads=args.threads,
+        overwrite=args.overwrite,
+        reload_interval=args.reload_interval,
+    )
+    daemon.serve(args.socket, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
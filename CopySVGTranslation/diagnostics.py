@@ -0,0 +1,53 @@
+"""Lazy debug diagnostics for the extraction and injection hot paths.
+
+``logger.debug(f"...")`` renders its message even when DEBUG is off, which is
+costly when it runs once per switch and the message embeds whole lists or
+dictionaries. :func:`debug` checks the level first and leaves the rendering to
+the handler, so a disabled call costs one level check; inner loops check
+:func:`debug_enabled` once instead.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+logger = logging.getLogger("CopySVGTranslation")
+
+
+class _Fields:
+    """Renders ``name=value`` pairs only when the log record is formatted."""
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: dict[str, Any]):
+        self.fields = fields
+
+    def __str__(self) -> str:
+        return ", ".join(f"{name}={value!r}" for name, value in self.fields.items())
+
+
+def debug_enabled() -> bool:
+    """Return whether :func:`debug` would log anything.
+
+    Check it once outside loops that call :func:`debug` for every item.
+    """
+    return logger.isEnabledFor(logging.DEBUG)
+
+
+def debug(event: str, **fields: Any) -> None:
+    """Log ``event`` at DEBUG level with the given ``fields``.
+
+    Nothing is evaluated when DEBUG is off for the package logger. Otherwise
+    the record's message is ``"event: name=value, ..."``, and ``event`` and
+    ``fields`` are also attached to the record as attributes for handlers
+    that want them structured. Pass the values as they are; do not format
+    them in the call.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    extra = {"event": event, "fields": fields}
+    if fields:
+        logger.debug("%s: %s", event, _Fields(fields), extra=extra, stacklevel=2)
+    else:
+        logger.debug(event, extra=extra, stacklevel=2)
@@ -1,5 +1,6 @@
 """Extraction phase helpers for CopySVGTranslation."""
 
 from .extractor import extract
+from .streaming import extract_streaming
 
-__all__ = ["extract"]
+__all__ = ["extract", "extract_streaming"]
@@ -0,0 +1,85 @@
+"""Incremental extraction for source SVG files too large to parse at once.
+
+:func:`extract_streaming` walks the document with ``etree.iterparse`` and hands
+each completed ``<switch>`` to :func:`~.extractor.extract_switch`, the same
+helper :func:`~.extractor.extract` uses, before freeing it. Elements outside
+switches are freed as soon as they end, so memory stays flat no matter how
+large the file is.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+from lxml import etree
+
+from ..diagnostics import debug
+from ..titles import make_title_translations
+from .extractor import extract_switch
+
+logger = logging.getLogger("CopySVGTranslation")
+
+SWITCH_TAG = "{http://www.w3.org/2000/svg}switch"
+
+
+def _release(elem: etree._Element) -> None:
+    """Free ``elem`` and the already processed siblings before it."""
+    elem.clear(keep_tail=True)
+    parent = elem.getparent()
+    if parent is None:
+        return
+    while elem.getprevious() is not None:
+        del parent[0]
+
+
+def extract_streaming(svg_file_path: Path | str, case_insensitive: bool = True) -> dict | None:
+    """Extract translation strings like :func:`~.extractor.extract` without building the whole tree.
+
+    Returns the same dictionary as :func:`~.extractor.extract`, or ``None`` if
+    the file does not exist or could not be parsed.
+    """
+    svg_file_path = Path(str(svg_file_path))
+
+    if not svg_file_path.exists():
+        logger.error(f"SVG file not found: {svg_file_path}")
+        return None
+
+    debug("Streaming translations", path=svg_file_path)
+
+    translations: dict[str, dict] = {
+        "new": {},
+        "title": {},
+        "tspans_by_id": {}
+    }
+
+    switch_count = 0
+    switch_depth = 0
+    try:
+        context = etree.iterparse(
+            str(svg_file_path), events=("start", "end"), remove_blank_text=True
+        )
+        for event, elem in context:
+            if elem.tag == SWITCH_TAG:
+                if event == "start":
+                    switch_depth += 1
+                    continue
+                switch_depth -= 1
+                if switch_depth:
+                    continue
+                # Outermost switch is complete: visit it and any nested switches in document order
+                for switch in elem.iter(SWITCH_TAG):
+                    extract_switch(switch, translations, case_insensitive)
+                    switch_count += 1
+            elif event == "start" or switch_depth:
+                continue
+            _release(elem)
+    except (etree.XMLSyntaxError, OSError) as exc:
+        logger.error(f"Failed to parse SVG file {svg_file_path}: {exc}")
+        return None
+
+    debug("Found switch elements", count=switch_count)
+
+    translations["title"] = make_title_translations(translations["new"])
+
+    return translations
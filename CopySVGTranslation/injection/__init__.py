@@ -1,22 +1,43 @@
 """Injection phase helpers for CopySVGTranslation."""
 
-from .batch import start_injects
+from .batch import iter_injects, start_injects, start_reinjects
 from .injector import (
     generate_unique_id,
     inject,
     load_all_mappings,
     work_on_switches,
 )
+from .ids import IdRegistry
+from .journal import BatchJournal
+from .manifest import InjectManifest
+from .mapping import CompiledMapping, MappingOverlay, compile_mapping, diff_mappings
+from .planning import plan_injection, plan_injections
 from .preparation import make_translation_ready
+from .streaming import inject_streaming
+from .timing import PhaseTimer, write_trace
 from .utils import SvgStructureException, SvgNestedTspanException
 
 __all__ = [
+    "BatchJournal",
+    "CompiledMapping",
+    "compile_mapping",
+    "diff_mappings",
+    "MappingOverlay",
     "generate_unique_id",
+    "IdRegistry",
+    "InjectManifest",
     "inject",
+    "inject_streaming",
+    "iter_injects",
     "load_all_mappings",
     "make_translation_ready",
+    "PhaseTimer",
+    "plan_injection",
+    "plan_injections",
     "start_injects",
+    "start_reinjects",
     "SvgStructureException",
     "SvgNestedTspanException",
     "work_on_switches",
+    "write_trace",
 ]
@@ -2,92 +2,567 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import shutil
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
-from .injector import inject
+from ..diagnostics import debug
+from .injector import inject, new_switch_stats
+from .journal import BatchJournal
+from .manifest import InjectManifest, file_digest, mapping_fingerprint
+from .mapping import CompiledMapping, compile_mapping, diff_mappings
+from .prefilter import (
+    PREFILTER_MATCHED,
+    PREFILTER_SKIPPED,
+    PREFILTER_UNSUPPORTED,
+    compile_needles,
+    prefilter_file,
+)
+from .timing import PhaseTimer, TimingSummary, TraceWriter, trace_event
 logger = logging.getLogger("CopySVGTranslation")
 
+# Per-process state installed by ``_init_worker`` so the mapping is sent once per worker
+_worker_options: dict[str, Any] = {}
+
+
+def _inject_one(
+    file: Path | str,
+    translations: dict | CompiledMapping,
+    output_dir_translated: Path,
+    overwrite: bool = False,
+    output_dir_nested_files: Path | None = None,
+    needles: frozenset[str] | None = None,
+    prefilter: bool = False,
+    index_keys: bool = False,
+    timer: PhaseTimer | None = None,
+) -> tuple[str, str, dict]:
+    """Inject and write a single file, returning ``(name, status, stats)``.
+
+    ``status`` is one of ``"success"``, ``"failed"``, ``"nested"`` or ``"no_changes"``.
+    With ``prefilter`` the raw bytes are checked against ``needles`` first, and
+    the outcome is stored in ``stats["prefilter"]``. With ``index_keys`` the
+    parsed file's key index (see :func:`~.injector.plan_switches`) is returned
+    in ``stats["key_index"]``. With a ``timer`` the phases of the parsed file,
+    its serialization included, are timed into ``stats["timings"]``.
+    """
+    file = Path(str(file))
+
+    outcome = None
+    if prefilter:
+        outcome = prefilter_file(file, needles)
+        if outcome == PREFILTER_SKIPPED:
+            stats = new_switch_stats()
+            stats.update(file_path="", prefilter=outcome)
+            return file.name, "no_changes", stats
+
+    key_index: dict[str, list[int]] | None = {} if index_keys else None
+    tree, stats = inject(
+        file,
+        all_mappings=translations,
+        save_result=False,
+        return_stats=True,
+        overwrite=overwrite,
+        skip_unchanged=True,
+        key_index=key_index,
+        timer=timer,
+    )
+
+    stats["file_path"] = ""
+    if tree and key_index is not None:
+        stats["key_index"] = key_index
+    if outcome is not None:
+        stats["prefilter"] = outcome
+
+    output_file = output_dir_translated / file.name
+    if not tree:
+        debug("Failed to translate", path=file)
+        if stats.get("nested_tspan_error"):
+            if output_dir_nested_files:
+                # copy file to output_dir_nested_files
+                try:
+                    shutil.copy(file, output_dir_nested_files / file.name)
+                except Exception as e:
+                    logger.error(f"Failed copying {file} to {output_dir_nested_files}: {e}")
+            return file.name, "nested", stats
+        return file.name, "failed", stats
+
+    if stats.get("new_languages", 0) == 0 and stats.get("updated_translations", 0) == 0:
+        return file.name, "no_changes", stats
+    try:
+        if timer is None:
+            tree.write(str(output_file), encoding='utf-8', xml_declaration=True, pretty_print=True)
+        else:
+            with timer.phase("serialize"):
+                tree.write(
+                    str(output_file), encoding='utf-8', xml_declaration=True, pretty_print=True
+                )
+            timer.count("output_bytes", output_file.stat().st_size)
+            stats["timings"] = timer.as_dict()
+        stats["file_path"] = str(output_file)
+    except Exception as e:
+        logger.error(f"Failed writing {output_file}: {e}")
+        stats["error"] = "write-failed"
+        stats["file_path"] = ""
+        return file.name, "failed", stats
+
+    return file.name, "success", stats
+
+
+def _init_worker(
+    translations: CompiledMapping,
+    output_dir_translated: Path,
+    overwrite: bool,
+    output_dir_nested_files: Path | None,
+    needles: frozenset[str] | None = None,
+    prefilter: bool = False,
+    index_keys: bool = False,
+    timings: bool = False,
+    trace: bool = False,
+) -> None:
+    """Store the shared batch options in the worker process."""
+    _worker_options.update(
+        translations=translations,
+        output_dir_translated=output_dir_translated,
+        overwrite=overwrite,
+        output_dir_nested_files=output_dir_nested_files,
+        needles=needles,
+        prefilter=prefilter,
+        index_keys=index_keys,
+        timings=timings,
+        trace=trace,
+    )
+
+
+def _manifest_options(output_dir_translated: Path, overwrite: bool, prefilter: bool) -> str:
+    """Return the options that decide a file's output, as stored in the manifest."""
+    return json.dumps({
+        "output_dir_translated": str(Path(str(output_dir_translated)).resolve()),
+        "overwrite": overwrite,
+        "prefilter": prefilter,
+    }, sort_keys=True)
+
+
+def _timed_inject_one(
+    file: Path | str,
+    timings: bool = False,
+    trace: bool = False,
+    **options: Any,
+) -> tuple[str, str, dict, float]:
+    """Run :func:`_inject_one` and add its wall time in seconds to the result.
+
+    With ``timings`` or ``trace`` the file gets a :class:`~.timing.PhaseTimer`.
+    With ``trace`` its phase events and a span for the whole file are returned
+    in ``stats["trace_events"]``.
+    """
+    timer = PhaseTimer(trace=trace) if timings or trace else None
+    started_ns = time.time_ns()
+    started = time.perf_counter()
+    name, status, stats = _inject_one(file, timer=timer, **options)
+    seconds = time.perf_counter() - started
+    if timer is not None and timer.events is not None:
+        span = trace_event(name, "file", started_ns, seconds, path=str(file), status=status)
+        stats["trace_events"] = [span, *timer.events]
+    if not timings:
+        stats.pop("timings", None)
+    return name, status, stats, seconds
+
+
+def _worker_inject(files: list[str]) -> list[tuple[str, str, dict, float]]:
+    """Process a chunk of files inside a pool worker; only the stats travel back."""
+    return [_timed_inject_one(file, **_worker_options) for file in files]
+
+
+def _iter_pool(
+    executor: ProcessPoolExecutor,
+    chunks: list[list[str]],
+    window: int,
+) -> Iterator[tuple[str, str, dict, float]]:
+    """Yield the results of ``chunks`` in order, with at most ``window`` chunks submitted ahead."""
+    in_flight: deque = deque()
+    for chunk in chunks:
+        in_flight.append(executor.submit(_worker_inject, chunk))
+        if len(in_flight) >= window:
+            yield from in_flight.popleft().result()
+    while in_flight:
+        yield from in_flight.popleft().result()
+
+
+def iter_injects(
+    files: Iterable[Path | str],
+    translations: dict | CompiledMapping,
+    output_dir_translated: Path,
+    overwrite: bool = False,
+    output_dir_nested_files: Path | None = None,
+    workers: int = 1,
+    prefilter: bool = False,
+    manifest: Path | str | None = None,
+    timings: bool = False,
+    trace: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """Inject translations into a collection of SVG files, yielding each result as it is ready.
+
+    Takes the same options as :func:`start_injects`, which is built on it, and
+    yields one record per file with its ``path`` as given, its ``name``, its
+    ``status`` and ``stats`` as in the :func:`start_injects` report, the
+    ``output_path`` written (or ``None``) and the wall time in ``seconds``.
+    Files skipped through the ``manifest`` come first, with the ``"cached"``
+    status; the others follow in the order of ``files``. With ``trace=True``
+    the records of processed files also carry their Chrome ``trace_events``:
+    one span for the file and one per phase, with the ``pid`` and ``tid`` of
+    the process that ran them.
+
+    Nothing is accumulated between records. With ``workers`` greater than one,
+    only a few chunks of files per worker are in flight at a time, so a slow
+    consumer holds the pool back instead of letting results pile up. Closing
+    the generator early cancels the files not started yet.
+    """
+    translations = compile_mapping(translations)
+    needles = compile_needles(translations) if prefilter else None
+    files = list(files)
+
+    def record(
+        file: Path | str, name: str, status: str, stats: dict, seconds: float
+    ) -> dict[str, Any]:
+        return {
+            "path": str(file),
+            "name": name,
+            "status": status,
+            "stats": stats,
+            "output_path": stats.get("file_path") or None,
+            "seconds": seconds,
+        }
+
+    manifest_db = None
+    pending: list[tuple[Path | str, str | None]] = [(file, None) for file in files]
+    if manifest:
+        manifest_db = InjectManifest(manifest)
+        mapping_hash = mapping_fingerprint(translations)
+        options = _manifest_options(output_dir_translated, overwrite, prefilter)
+
+    executor = None
+    try:
+        if manifest_db is not None:
+            remaining = []
+            for file in files:
+                started = time.perf_counter()
+                input_hash = file_digest(file)
+                previous = input_hash and manifest_db.lookup(
+                    file, input_hash, mapping_hash, options
+                )
+                # Failures may come from the environment (a full disk, a missing
+                # directory); retry them
+                if previous and previous["status"] != "failed":
+                    stats = {**previous["stats"], "cached": True}
+                    seconds = time.perf_counter() - started
+                    yield record(file, Path(str(file)).name, "cached", stats, seconds)
+                else:
+                    remaining.append((file, input_hash))
+            debug(
+                "Manifest checked",
+                unchanged=len(files) - len(remaining),
+                to_process=len(remaining),
+            )
+            pending = remaining
+
+        index_keys = manifest_db is not None
+        if workers > 1 and len(pending) > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(
+                    translations,
+                    output_dir_translated,
+                    overwrite,
+                    output_dir_nested_files,
+                    needles,
+                    prefilter,
+                    index_keys,
+                    timings,
+                    trace,
+                ),
+            )
+            chunksize = max(1, min(len(pending) // (workers * 4), 32))
+            chunks = [
+                [str(file) for file, _ in pending[start:start + chunksize]]
+                for start in range(0, len(pending), chunksize)
+            ]
+            results = _iter_pool(executor, chunks, window=workers * 2)
+        else:
+            results = (
+                _timed_inject_one(
+                    file,
+                    translations=translations,
+                    output_dir_translated=output_dir_translated,
+                    overwrite=overwrite,
+                    output_dir_nested_files=output_dir_nested_files,
+                    needles=needles,
+                    prefilter=prefilter,
+                    index_keys=index_keys,
+                    timings=timings,
+                    trace=trace,
+                )
+                for file, _ in pending
+            )
+
+        for (file, input_hash), (name, status, stats, seconds) in zip(pending, results):
+            key_index = stats.pop("key_index", None)
+            trace_events = stats.pop("trace_events", None)
+            if manifest_db is not None and input_hash:
+                manifest_db.record(
+                    file, input_hash, mapping_hash, options, status, stats, key_index
+                )
+            result = record(file, name, status, stats, seconds)
+            if trace_events is not None:
+                result["trace_events"] = trace_events
+            yield result
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if manifest_db is not None:
+            manifest_db.close()
+
 
 def start_injects(
     files: list[str],
-    translations: dict,
+    translations: dict | CompiledMapping,
     output_dir_translated: Path,
     overwrite: bool = False,
     output_dir_nested_files: Path | None = None,
+    workers: int = 1,
+    prefilter: bool = False,
+    manifest: Path | str | None = None,
+    journal: Path | str | None = None,
+    resume: bool = False,
+    files_from_journal: bool = False,
+    timings: bool = False,
+    trace: Path | str | None = None,
 ) -> dict[str, Any]:
-    """Inject translations into a collection of SVG files and write the results."""
-    data = {}
-    success = 0
-    failed = 0
-    nested_files = 0
-    no_changes = 0
-
-    files_stats = {}
+    """Inject translations into a collection of SVG files and write the results.
+
+    With ``workers`` greater than one the files are spread over a process pool.
+    Each worker receives ``translations`` once through the pool initializer,
+    writes its own outputs and returns only the per-file stats, so the report
+    is the same as the serial one.
+
+    ``translations`` is compiled into a :class:`CompiledMapping` once for the
+    whole batch.
+
+    With ``prefilter=True`` each file's raw bytes are searched for the words of
+    the mapping keys before parsing (see :mod:`.prefilter`); files that contain
+    none are reported as ``no_changes`` without being parsed, so they are not
+    validated either and their counts stay at zero. The report then has a
+    ``"prefilter"`` entry counting the skipped, matched and unsupported files.
+
+    With a ``manifest`` path, the SHA-256 of every input and output, a hash of
+    the mapping and the options are recorded in that SQLite file after each
+    file is processed. On the next run with the same manifest, files whose
+    input, mapping and options are unchanged and whose output is still in
+    place are not processed again, unless they failed. They are counted as
+    ``cached``, and their stats from the earlier run are reported with
+    ``"cached": True``. The manifest also indexes the default texts of every
+    parsed file, which :func:`start_reinjects` uses after a mapping change.
+
+    With a ``journal`` path, the outcome of every file is appended to that
+    JSONL file as soon as it finishes. With ``resume=True`` the files already
+    in the journal are skipped, and the report covers them as well as the
+    files processed now; otherwise the journal is started afresh. The per-file
+    stats then stay in the journal: the report only has the counters, so its
+    memory use does not grow with the number of files. Read the stats back one
+    at a time with :meth:`~.journal.BatchJournal.iter_file_stats`, or pass
+    ``files_from_journal=True`` to get ``report["files"]`` as a read-only
+    mapping that reads each file's stats from the journal when it is looked
+    up; it needs the journal file to stay in place.
+
+    With ``timings=True`` every parsed file is timed phase by phase (see
+    :class:`~.timing.PhaseTimer`), and ``report["timings"]`` gives the p50,
+    p95 and max wall and CPU time of each phase, node count and output size.
+
+    With a ``trace`` path, a Chrome trace of the run is written there: one
+    span per file and per phase, in the process and thread that ran it, plus
+    a span for the whole batch. Events from the workers are merged into one
+    timeline as they arrive. Open the file in Perfetto or ``chrome://tracing``.
+    """
+    if (resume or files_from_journal) and not journal:
+        raise ValueError("resume=True and files_from_journal=True need a journal")
+
+    data: dict[str, Any] = {}
+    counts = dict.fromkeys(("success", "failed", "nested", "no_changes", "cached"), 0)
+    prefilter_counts = dict.fromkeys(
+        (PREFILTER_SKIPPED, PREFILTER_MATCHED, PREFILTER_UNSUPPORTED), 0
+    )
+
+    files_stats: dict[str, dict] = {}
     nested_files_list = {}
+    timing_summary = TimingSummary() if timings else None
 
-    for file in tqdm(files, total=len(files), desc="Inject files:"):
+    def tally(name: str, status: str, stats: dict) -> None:
+        if prefilter and status != "cached":
+            prefilter_counts[stats.get("prefilter", PREFILTER_MATCHED)] += 1
+        if timing_summary is not None and status != "cached" and "timings" in stats:
+            timing_summary.add(stats["timings"])
+        counts[status] += 1
+        if status == "nested":
+            nested_files_list[name] = stats.get("node", "")
+        elif batch_journal is None:
+            files_stats[name] = stats
 
-        file = Path(str(file))
+    batch_journal = None
+    resumed = 0
+    if journal:
+        batch_journal = BatchJournal(journal)
+        if resume:
+            for entry in batch_journal.replay():
+                tally(entry["name"], entry["status"], entry["stats"])
+                resumed += 1
+            files = [file for file in files if not batch_journal.is_done(file)]
+            debug("Journal replayed", done=resumed, left=len(files))
+        else:
+            batch_journal.reset()
 
-        tree, stats = inject(
-            file,
-            all_mappings=translations,
-            save_result=False,
-            return_stats=True,
+    def finish(file: Path | str, name: str, status: str, stats: dict) -> None:
+        if batch_journal is not None:
+            batch_journal.append(file, name, status, stats)
+        tally(name, status, stats)
+
+    trace_writer = TraceWriter(trace) if trace else None
+    started_ns = time.time_ns()
+    started = time.perf_counter()
+    try:
+        records = iter_injects(
+            files,
+            translations,
+            output_dir_translated,
             overwrite=overwrite,
+            output_dir_nested_files=output_dir_nested_files,
+            workers=workers,
+            prefilter=prefilter,
+            manifest=manifest,
+            timings=timings,
+            trace=trace_writer is not None,
         )
+        for result in tqdm(records, total=len(files), desc="Inject files:"):
+            if trace_writer is not None:
+                trace_writer.write(result.get("trace_events", ()))
+            finish(result["path"], result["name"], result["status"], result["stats"])
+    finally:
+        if batch_journal is not None:
+            batch_journal.close()
+        if trace_writer is not None:
+            seconds = time.perf_counter() - started
+            event = trace_event("start_injects", "batch", started_ns, seconds, files=len(files))
+            trace_writer.write([event])
+            trace_writer.close()
 
-        stats["file_path"] = ""
+    debug("Batch done", files=len(files), **counts)
 
-        output_file = output_dir_translated / file.name
-        if not tree:
-            logger.debug(f"Failed to translate {file.name}")
-            if stats.get("nested_tspan_error"):
-                nested_files += 1
-                nested_files_list[file.name] = stats.get("node", "")
-                if output_dir_nested_files:
-                    # copy file to output_dir_nested_files
-                    try:
-                        shutil.copy(file, output_dir_nested_files / file.name)
-                    except Exception as e:
-                        logger.error(f"Failed copying {file} to {output_dir_nested_files}: {e}")
-            else:
-                failed += 1
-                files_stats[file.name] = stats
-            continue
-
-        if stats.get("new_languages", 0) == 0 and stats.get("updated_translations", 0) == 0:
-            no_changes += 1
-            files_stats[file.name] = stats
-            continue
-        try:
-            tree.write(str(output_file), encoding='utf-8', xml_declaration=True, pretty_print=True)
-            stats["file_path"] = str(output_file)
-            success += 1
-        except Exception as e:
-            logger.error(f"Failed writing {output_file}: {e}")
-            stats["error"] = "write-failed"
-            stats["file_path"] = ""
-            tree = None
-            failed += 1
+    if output_dir_nested_files:
+        data["output_dir_nested_files"] = str(output_dir_nested_files)
 
-        files_stats[file.name] = stats
+    if prefilter:
+        debug("Prefilter", **prefilter_counts)
+        data["prefilter"] = prefilter_counts
 
-    logger.debug(f"all files: {len(files):,} Saved {success:,}, failed {failed:,}, nested_files: {nested_files:,}")
+    if manifest:
+        data["cached"] = counts["cached"]
 
-    if output_dir_nested_files:
-        data["output_dir_nested_files"] = str(output_dir_nested_files)
+    if timing_summary is not None:
+        data["timings"] = timing_summary.as_dict()
+
+    if trace_writer is not None:
+        data["trace"] = str(trace_writer.path)
 
     data.update({
-        "success": success,
-        "failed": failed,
-        "nested_files": nested_files,
-        "no_changes": no_changes,
+        "success": counts["success"],
+        "failed": counts["failed"],
+        "nested_files": counts["nested"],
+        "no_changes": counts["no_changes"],
         "nested_files_list": nested_files_list,
-        "files": files_stats,
+    })
+    if batch_journal is None:
+        data["files"] = files_stats
+    else:
+        data["journal"] = str(batch_journal.path)
+        if resume:
+            data["resumed"] = resumed
+        if files_from_journal:
+            data["files"] = batch_journal.file_stats_view()
+    return data
+
+
+def start_reinjects(
+    old_translations: dict | CompiledMapping,
+    new_translations: dict | CompiledMapping,
+    output_dir_translated: Path,
+    manifest: Path | str,
+    overwrite: bool = False,
+    output_dir_nested_files: Path | None = None,
+    workers: int = 1,
+    prefilter: bool = False,
+) -> dict[str, Any]:
+    """Re-inject only the files of an earlier batch that a mapping change affects.
+
+    ``manifest`` is the one an earlier :func:`start_injects` run with
+    ``old_translations`` and the same options recorded. The keys and titles
+    that differ between the two mappings are looked up in its key index, and
+    only the files containing them are injected again with
+    ``new_translations``. Files the index cannot vouch for are injected too:
+    files that were not parsed, were recorded with another mapping or other
+    options, or whose input changed since. The other files are marked as up
+    to date with ``new_translations`` in the manifest.
+
+    Returns the :func:`start_injects` report of the re-injected files, with
+    ``"affected"`` and ``"unaffected"`` counts and the ``"changed_keys"``.
+    """
+    old_translations = compile_mapping(old_translations)
+    new_translations = compile_mapping(new_translations)
+    changed = diff_mappings(old_translations, new_translations)
+    old_hash = mapping_fingerprint(old_translations)
+    new_hash = mapping_fingerprint(new_translations)
+    options = _manifest_options(output_dir_translated, overwrite, prefilter)
+
+    with InjectManifest(manifest) as manifest_db:
+        entries = manifest_db.entries()
+        keyed = manifest_db.files_with_keys(changed["new"], changed["title"])
+
+    affected = [
+        path for path, entry in entries.items()
+        if path in keyed
+        or not entry["indexed"]
+        or entry["mapping_hash"] != old_hash
+        or entry["options"] != options
+        or file_digest(path) != entry["input_hash"]
+    ]
+    debug(
+        "Mapping change",
+        keys=len(changed["new"]),
+        titles=len(changed["title"]),
+        affected=len(affected),
+        files=len(entries),
+    )
+
+    data = start_injects(
+        affected,
+        new_translations,
+        output_dir_translated,
+        overwrite=overwrite,
+        output_dir_nested_files=output_dir_nested_files,
+        workers=workers,
+        prefilter=prefilter,
+        manifest=manifest,
+    )
+
+    with InjectManifest(manifest) as manifest_db:
+        manifest_db.carry_forward(old_hash, new_hash, options, exclude=affected)
+
+    data.update({
+        "affected": len(affected),
+        "unaffected": len(entries) - len(affected),
+        "changed_keys": sorted(changed["new"] | changed["title"]),
     })
     return data
@@ -0,0 +1,80 @@
+"""Registry of the ids used in one document, with constant-time allocation."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, Set
+
+
+class IdRegistry:
+    """The set of ids in use in one SVG document.
+
+    Behaves like a ``set`` of strings and adds two allocators:
+
+    * :meth:`next_trsvg` hands out ``trsvgN`` ids from a high-water mark that
+      only moves forward, instead of recomputing the highest number in use;
+    * :meth:`unique` appends ``-N`` to a base id, remembering per base where
+      the previous search stopped, instead of probing from ``-1`` every time.
+
+    Both give the same ids as a linear search over the current set. A plain
+    ``set`` passed to the constructor is used as the backing store, so the
+    caller still sees every id that gets added.
+    """
+
+    __slots__ = ("_ids", "_trsvg", "_suffixes")
+
+    def __init__(self, ids: Iterable[str] | None = None, trsvg_start: int = 0):
+        self._ids: Set[str] = ids if isinstance(ids, set) else set(ids or ())
+        self._trsvg = trsvg_start
+        self._suffixes: Dict[str, int] = {}
+
+    def __contains__(self, element_id: object) -> bool:
+        return element_id in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __repr__(self) -> str:
+        return f"IdRegistry({len(self._ids)} ids, trsvg={self._trsvg})"
+
+    def add(self, element_id: str) -> None:
+        self._ids.add(element_id)
+
+    def discard(self, element_id: str) -> None:
+        if element_id in self._ids:
+            self._ids.remove(element_id)
+            # A freed id may fall below a remembered suffix; search again from the start
+            self._suffixes.clear()
+
+    def raise_trsvg(self, number: int) -> None:
+        """Make sure :meth:`next_trsvg` only hands out numbers above ``number``."""
+        if number > self._trsvg:
+            self._trsvg = number
+
+    def next_trsvg(self) -> str:
+        """Reserve and return the next unused ``trsvgN`` id above the high-water mark."""
+        cursor = self._trsvg
+        while True:
+            cursor += 1
+            candidate = f"trsvg{cursor}"
+            if candidate not in self._ids:
+                self._trsvg = cursor
+                self._ids.add(candidate)
+                return candidate
+
+    def unique(self, base: str, first_suffix: int = 1) -> str:
+        """Reserve and return ``base``, or ``base-N`` with the lowest free ``N >= first_suffix``."""
+        if base not in self._ids:
+            self._ids.add(base)
+            return base
+
+        counter = max(self._suffixes.get(base, first_suffix), first_suffix)
+        while f"{base}-{counter}" in self._ids:
+            counter += 1
+        self._suffixes[base] = counter + 1
+
+        candidate = f"{base}-{counter}"
+        self._ids.add(candidate)
+        return candidate
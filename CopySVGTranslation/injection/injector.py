@@ -9,15 +9,18 @@ from typing import Iterable, Mapping
 
 from lxml import etree
 
+from ..diagnostics import debug
 from ..text_utils import extract_text_from_node, normalize_text
-from ..titles import get_titles_translations
 from .utils import (
     SvgNestedTspanException,
     SvgStructureException,
     get_target_path,
     file_langs,
 )
-from .preparation import make_translation_ready
+from .ids import IdRegistry
+from .mapping import CompiledMapping, MappingOverlay, compile_mapping
+from .preparation import TEXT_TAG, TSPAN_TAG, make_translation_ready
+from .timing import NULL_TIMER, PhaseTimer
 
 logger = logging.getLogger("CopySVGTranslation")
 
@@ -59,21 +62,14 @@ def load_all_mappings(mapping_files: Iterable[Path | str]) -> dict:
         for key, value in mappings.items():
             all_mappings.setdefault(key, {}).update(value)
 
-        logger.debug("Loaded mappings from %s, entries: %s", mapping_path, len(mappings))
+        debug("Loaded mappings", path=mapping_path, entries=len(mappings))
 
     return all_mappings
 
 
-def work_on_switches(
-    root: etree._Element,
-    existing_ids: set[str],
-    mappings: Mapping,
-    case_insensitive: bool = True,
-    overwrite: bool = False,
-) -> dict:
-    """Process ``<switch>`` elements and insert or update translations."""
-    svg_ns = {'svg': 'http://www.w3.org/2000/svg'}
-    stats = {
+def new_switch_stats() -> dict:
+    """Return a zeroed stats dictionary as produced by :func:`work_on_switches`."""
+    return {
         'all_languages': 0,
         'new_languages': 0,
         'processed_switches': 0,
@@ -82,121 +78,274 @@ def work_on_switches(
         'updated_translations': 0,
     }
 
-    switches = root.xpath('//svg:switch', namespaces=svg_ns)
-    logger.debug(f"Found {len(switches)} switch elements")
 
-    if not switches:
-        logger.error("No switch elements found in SVG")
+def plan_switch(
+    switch: etree._Element,
+    mapping: MappingOverlay,
+    overwrite: bool = False,
+    missing: list[str] | None = None,
+) -> dict | None:
+    """Work out what :func:`work_on_switch` would do to ``switch`` without changing it.
+
+    Returns ``None`` when the switch has nothing to translate, otherwise a
+    dictionary with the languages to ``insert`` and to ``update`` (in the
+    mapping's order), the number of ``skipped`` languages, and the nodes and
+    translations needed to apply it. Keys of the default text that the
+    mapping lacks are appended to ``missing`` when it is given.
+    """
+    text_elements = [child for child in switch if child.tag == TEXT_TAG]
+    if not text_elements:
+        return None
 
-    all_mappings_title = mappings.get("title", {})
-    all_mappings = mappings.get("new", mappings)
+    default_texts = None
+    default_node = None
 
-    for switch in switches:
-        text_elements = switch.xpath('./svg:text', namespaces=svg_ns)
-        if not text_elements:
+    for text_elem in text_elements:
+        system_lang = text_elem.get('systemLanguage')
+        if system_lang:
             continue
 
-        default_texts = None
-        default_node = None
+        text_contents = extract_text_from_node(text_elem)
+        default_texts = [normalize_text(text, mapping.case_insensitive) for text in text_contents]
+        default_node = text_elem
+        break
+
+    if not default_texts:
+        return None
+
+    # Year-suffixed titles are resolved into the document overlay, never the shared mapping
+    mapping.resolve_titles(default_texts)
+
+    # Determine translations for each text line
+    available_translations = {}
+    for text in default_texts:
+        key = mapping.key(text)
+        translations = mapping.get(key)
+        if translations is not None:
+            available_translations[key] = translations
+        else:
+            debug("No mapping", key=key)
+            if missing is not None:
+                missing.append(key)
+
+    if not available_translations:
+        return None
+
+    # Index the existing translations once, so each language is a single lookup
+    existing_languages: dict[str, etree._Element] = {}
+    for text_elem in text_elements:
+        system_lang = text_elem.get('systemLanguage')
+        if system_lang:
+            existing_languages.setdefault(system_lang, text_elem)
+
+    # We assume all texts share same set of languages; keep the mapping's language order
+    all_langs = {}
+    for data in available_translations.values():
+        all_langs.update(dict.fromkeys(data))
+
+    insert = []
+    update = []
+    skipped = 0
+    for lang in all_langs:
+        existing_node = existing_languages.get(lang)
+        if existing_node is None:
+            insert.append(lang)
+        elif overwrite:
+            update.append((lang, existing_node))
+        else:
+            skipped += 1
+
+    return {
+        "insert": insert,
+        "update": update,
+        "skipped": skipped,
+        "default_node": default_node,
+        "default_texts": default_texts,
+        "available_translations": available_translations,
+    }
+
+
+def describe_switch_plan(plan: dict) -> dict:
+    """Return the element-free part of a :func:`plan_switch` result."""
+    return {
+        "keys": list(plan["available_translations"]),
+        "insert": list(plan["insert"]),
+        "update": [lang for lang, _node in plan["update"]],
+        "skipped": plan["skipped"],
+    }
+
 
-        for text_elem in text_elements:
-            system_lang = text_elem.get('systemLanguage')
-            if system_lang:
+def apply_switch_plan(
+    switch: etree._Element,
+    plan: dict,
+    existing_ids: IdRegistry,
+    mapping: MappingOverlay,
+    stats: dict,
+    inserted_languages: set[str] | None = None,
+) -> None:
+    """Carry out a :func:`plan_switch` result on ``switch`` and count it in ``stats``."""
+    default_node = plan["default_node"]
+    available_translations = plan["available_translations"]
+    stats['skipped_translations'] += plan["skipped"]
+
+    if plan["update"]:
+        line_translations = [
+            available_translations.get(mapping.key(text)) for text in plan["default_texts"]
+        ]
+        for lang, existing_node in plan["update"]:
+            tspans = [child for child in existing_node if child.tag == TSPAN_TAG]
+            for i, tspan in enumerate(tspans):
+                translations = line_translations[i]
+                if translations and lang in translations:
+                    tspan.text = translations[lang]
+
+            stats['updated_translations'] += 1
+
+    # The default tspans, with their English text and translations, are shared by every insert
+    default_tspans = []
+    if plan["insert"]:
+        for tspan in default_node:
+            if tspan.tag != TSPAN_TAG:
                 continue
+            english_text = normalize_text(tspan.text or "")
+            text_translations = mapping.get(mapping.key(english_text)) or {}
+            default_tspans.append((tspan, english_text, text_translations))
+
+    for lang in plan["insert"]:
+        new_node = etree.Element(default_node.tag, attrib=default_node.attrib)
+        new_node.set('systemLanguage', lang)
+        original_id = default_node.get('id')
+        if original_id:
+            new_node.set('id', existing_ids.unique(f"{original_id}-{lang}"))
+
+        if default_tspans:
+            for tspan, english_text, translations in default_tspans:
+                new_tspan = etree.Element(tspan.tag, attrib=tspan.attrib)
+                new_tspan.text = translations.get(lang, english_text)
+
+                # Generate unique ID for tspan if needed
+                original_tspan_id = tspan.get('id')
+                if original_tspan_id:
+                    new_tspan.set('id', existing_ids.unique(f"{original_tspan_id}-{lang}"))
+
+                new_node.append(new_tspan)
+
+        else:
+            english_text = normalize_text(default_node.text or "")
+            new_node.text = _translate(mapping, english_text, lang)
+
+        switch.append(new_node)
+        stats['inserted_translations'] += 1
+        if inserted_languages is not None and lang:
+            inserted_languages.add(lang)
+
+    stats['processed_switches'] += 1
+
+
+def work_on_switch(
+    switch: etree._Element,
+    existing_ids: IdRegistry,
+    mapping: MappingOverlay,
+    stats: dict,
+    overwrite: bool = False,
+    inserted_languages: set[str] | None = None,
+) -> None:
+    """Insert or update the translations of a single ``<switch>`` element.
 
-            text_contents = extract_text_from_node(text_elem)
-            default_texts = [normalize_text(text, case_insensitive) for text in text_contents]
-            default_node = text_elem
-            break
+    ``mapping`` is the overlay of the current document and ``stats`` is
+    updated in place; see :func:`work_on_switches` for the other parameters.
+    """
+    plan = plan_switch(switch, mapping, overwrite=overwrite)
+    if plan is not None:
+        apply_switch_plan(switch, plan, existing_ids, mapping, stats, inserted_languages)
 
-        if not default_texts:
-            continue
 
-        titles_translations = get_titles_translations(all_mappings_title, default_texts)
+def _translate(mapping: MappingOverlay, english_text: str, lang: str) -> str:
+    """Return the ``lang`` translation of ``english_text``, or the text itself."""
+    translations = mapping.get(mapping.key(english_text)) or {}
+    return translations.get(lang, english_text)
 
-        all_mappings.update(titles_translations)
 
-        # Determine translations for each text line
-        available_translations = {}
-        for text in default_texts:
-            key = text.lower() if case_insensitive else text
-            if key in all_mappings:
-                available_translations[key] = all_mappings[key]
-            else:
-                logger.debug(f"No mapping for '{key}'")
+def summarize_plans(plans: Iterable[tuple[etree._Element | None, dict]]) -> dict:
+    """Return the stats :func:`apply_switch_plan` would produce for ``plans``.
 
-        if not available_translations:
-            continue
+    The plans may also be :func:`describe_switch_plan` results.
+    """
+    stats = new_switch_stats()
+    for _switch, plan in plans:
+        stats['processed_switches'] += 1
+        stats['inserted_translations'] += len(plan["insert"])
+        stats['updated_translations'] += len(plan["update"])
+        stats['skipped_translations'] += plan["skipped"]
+    return stats
 
-        existing_languages = {t.get('systemLanguage') for t in text_elements if t.get('systemLanguage')}
 
-        # We assume all texts share same set of languages
-        all_langs = set()
-        for data in available_translations.values():
-            all_langs.update(data.keys())
+def work_on_switches(
+    root: etree._Element,
+    existing_ids: IdRegistry | set[str],
+    mappings: Mapping | CompiledMapping,
+    case_insensitive: bool = True,
+    overwrite: bool = False,
+    inserted_languages: set[str] | None = None,
+) -> dict:
+    """Process ``<switch>`` elements and insert or update translations.
+
+    ``mappings`` may be a plain mapping or a :class:`CompiledMapping`; plain
+    mappings are compiled once for the whole document. Neither is modified:
+    titles resolved for this document go into a :class:`MappingOverlay`.
+    When ``inserted_languages`` is given, every language for which a new
+    ``<text>`` node is created is added to it, so callers can derive the
+    resulting language set without walking the tree again.
+
+    ``existing_ids`` is the :class:`IdRegistry` returned by
+    ``make_translation_ready(..., return_ids=True)``; a plain set of ids is
+    wrapped in one and still receives the new ids.
+    """
+    mapping = compile_mapping(mappings, case_insensitive).overlay()
+    if not isinstance(existing_ids, IdRegistry):
+        existing_ids = IdRegistry(existing_ids)
 
-        for lang in all_langs:
-            if lang in existing_languages and not overwrite:
-                stats['skipped_translations'] += 1
-                continue
+    stats = new_switch_stats()
+    for switch, plan in plan_switches(root, mapping, overwrite=overwrite):
+        apply_switch_plan(switch, plan, existing_ids, mapping, stats, inserted_languages)
 
-            # Create or update node
-            if lang in existing_languages and overwrite:
-                for text_elem in text_elements:
-                    if text_elem.get('systemLanguage') != lang:
-                        continue
-
-                    tspans = text_elem.xpath('./svg:tspan', namespaces=svg_ns)
-                    for i, tspan in enumerate(tspans):
-                        english_text = default_texts[i]
-                        lookup_key = english_text.lower() if case_insensitive else english_text
-                        if english_text in available_translations and lang in available_translations[english_text]:
-                            tspan.text = available_translations[english_text][lang]
-                        elif lookup_key in available_translations and lang in available_translations[lookup_key]:
-                            tspan.text = available_translations[lookup_key][lang]
-
-                    stats['updated_translations'] += 1
-                    break
-                continue
+    return stats
 
-            new_node = etree.Element(default_node.tag, attrib=default_node.attrib)
-            new_node.set('systemLanguage', lang)
-            original_id = default_node.get('id')
-            if original_id:
-                new_id = generate_unique_id(original_id, lang, existing_ids)
-                new_node.set('id', new_id)
-                existing_ids.add(new_id)
-
-            tspans = default_node.xpath('./svg:tspan', namespaces=svg_ns)
-
-            if tspans:
-                for tspan in tspans:
-                    new_tspan = etree.Element(tspan.tag, attrib=tspan.attrib)
-                    english_text = normalize_text(tspan.text or "")
-                    key = english_text.lower() if case_insensitive else english_text
-                    translated = all_mappings.get(key, {}).get(lang, english_text)
-                    new_tspan.text = translated
-
-                    # Generate unique ID for tspan if needed
-                    original_tspan_id = tspan.get('id')
-                    if original_tspan_id:
-                        new_tspan_id = generate_unique_id(original_tspan_id, lang, existing_ids)
-                        new_tspan.set('id', new_tspan_id)
-                        existing_ids.add(new_tspan_id)
-
-                    new_node.append(new_tspan)
 
-            else:
-                english_text = normalize_text(default_node.text or "")
-                key = english_text.lower() if case_insensitive else english_text
-                new_node.text = all_mappings.get(key, {}).get(lang, english_text)
+def plan_switches(
+    root: etree._Element,
+    mapping: MappingOverlay,
+    overwrite: bool = False,
+    key_index: dict[str, list[int]] | None = None,
+) -> list[tuple[etree._Element, dict]]:
+    """Return the ``(switch, plan)`` pairs of every translatable switch under ``root``.
 
-            switch.append(new_node)
-            stats['inserted_translations'] += 1
+    Nothing in the tree is changed; see :func:`plan_switch`. When ``key_index``
+    is given, the lookup key of every default text, with or without a
+    translation, is mapped in it to the indices of the switches containing it.
+    """
+    svg_ns = {'svg': 'http://www.w3.org/2000/svg'}
 
-        stats['processed_switches'] += 1
+    switches = root.xpath('//svg:switch', namespaces=svg_ns)
+    debug("Found switch elements", count=len(switches))
 
-    return stats
+    if not switches:
+        logger.error("No switch elements found in SVG")
+
+    plans = []
+    for index, switch in enumerate(switches):
+        missing: list[str] = []
+        plan = plan_switch(switch, mapping, overwrite=overwrite, missing=missing)
+        if plan is not None:
+            plans.append((switch, plan))
+        if key_index is not None:
+            if plan is not None:
+                keys = missing + list(plan["available_translations"])
+            else:
+                keys = missing
+            for key in dict.fromkeys(keys):
+                key_index.setdefault(key, []).append(index)
+    return plans
 
 
 def sort_switch_texts(elem):
@@ -227,16 +376,36 @@ def sort_switch_texts(elem):
 def inject(
     inject_file: Path | str,
     mapping_files: Iterable[Path | str] | None = None,
-    all_mappings: Mapping | None = None,
+    all_mappings: Mapping | CompiledMapping | None = None,
     case_insensitive: bool = True,
     output_file: Path | None = None,
     output_dir: Path | None = None,
     overwrite: bool = False,
     save_result: bool = False,
     return_stats: bool = False,
+    skip_unchanged: bool = False,
+    key_index: dict[str, list[int]] | None = None,
+    timer: PhaseTimer | None = None,
+    parser: etree.XMLParser | None = None,
     **kwargs,
 ):
-    """Inject translations into the provided SVG file."""
+    """Inject translations into the provided SVG file.
+
+    With ``skip_unchanged=True``, a document in which no translation would be
+    inserted or updated is left as prepared: no switch is touched and nothing
+    is written. The stats are the same as for a full run.
+
+    A ``key_index`` dictionary is filled with the switches of every default
+    text, as described in :func:`plan_switches`.
+
+    Pass a :class:`~.timing.PhaseTimer` as ``timer`` to record the wall and CPU
+    time of the ``parse``, ``prepare``, ``file_langs``, ``plan``, ``apply``,
+    ``rewrite`` and ``serialize`` phases, the parsed node count and the size
+    of the written file in ``stats["timings"]``.
+
+    ``parser`` is the ``lxml`` parser to read the file with; see
+    :func:`~.preparation.make_translation_ready`.
+    """
 
     if not inject_file and kwargs.get("svg_file_path"):
         inject_file = kwargs["svg_file_path"]
@@ -260,11 +429,18 @@ def inject(
         error = {"error": "No valid mappings found"}
         return (None, error) if return_stats else None
 
-    logger.debug(f"Injecting translations into {inject_path}")
+    mapping = compile_mapping(all_mappings, case_insensitive)
+
+    debug("Injecting translations", path=inject_path)
+
+    clock = timer or NULL_TIMER
 
     # Parse SVG as XML
     try:
-        tree, root = make_translation_ready(inject_path, write_back=False)
+        with clock.phase("prepare"):
+            tree, root, existing_ids = make_translation_ready(
+                inject_path, write_back=False, return_ids=True, timer=timer, parser=parser
+            )
     except SvgNestedTspanException as exc:
         error = {"nested_tspan_error": True, "node": exc.node()}
         return (None, error) if return_stats else None
@@ -280,51 +456,69 @@ def inject(
         error = {"error": str(exc)}
         return (None, error) if return_stats else None
 
-    # Collect all existing IDs to ensure uniqueness
-    # existing_ids = {elem.get('id') for elem in root.xpath('//*[@id]') if elem.get('id')}
-    existing_ids = set(root.xpath('//@id'))
-
-    before_languages = file_langs(inject_path)
-
-    stats = work_on_switches(
-        root,
-        existing_ids,
-        all_mappings,
-        case_insensitive=case_insensitive,
-        overwrite=overwrite,
-    )
+    # Languages are tracked on the prepared tree so the file is parsed only once
+    with clock.phase("file_langs"):
+        before_languages = file_langs(root)
+    inserted_languages: set[str] = set()
+
+    overlay = mapping.overlay()
+    with clock.phase("plan"):
+        plans = plan_switches(root, overlay, overwrite=overwrite, key_index=key_index)
+
+    if skip_unchanged and not any(plan["insert"] or plan["update"] for _, plan in plans):
+        stats = summarize_plans(plans)
+        stats["all_languages"] = len(before_languages)
+        stats["new_languages_list"] = []
+        if clock.enabled:
+            stats["timings"] = clock.as_dict()
+        debug("Nothing to insert or update", path=inject_path)
+        return (tree, stats) if return_stats else tree
+
+    stats = new_switch_stats()
+    with clock.phase("apply"):
+        for switch, plan in plans:
+            apply_switch_plan(switch, plan, existing_ids, overlay, stats, inserted_languages)
 
     # Fix old <svg:switch> tags if present
-    for elem in root.findall(".//svg:switch", namespaces={"svg": "http://www.w3.org/2000/svg"}):
-        elem.tag = "switch"
-        sort_switch_texts(elem)
+    with clock.phase("rewrite"):
+        for elem in root.findall(".//svg:switch", namespaces={"svg": "http://www.w3.org/2000/svg"}):
+            elem.tag = "switch"
+            sort_switch_texts(elem)
 
     after_languages = set()
     if save_result:
         try:
             target_path = get_target_path(output_file, output_dir, inject_path)
-            tree.write(
-                str(target_path),
-                encoding='utf-8',
-                xml_declaration=True,
-                pretty_print=kwargs.get("pretty_print", True)
-            )
-            after_languages = file_langs(target_path)
-            logger.debug(f"Saved modified SVG to {target_path}")
+            with clock.phase("serialize"):
+                tree.write(
+                    str(target_path),
+                    encoding='utf-8',
+                    xml_declaration=True,
+                    pretty_print=kwargs.get("pretty_print", True)
+                )
+            if clock.enabled:
+                clock.count("output_bytes", target_path.stat().st_size)
+            after_languages = before_languages | inserted_languages
+            debug("Saved modified SVG", path=target_path)
         except Exception as e:
             logger.error(f"Failed writing {inject_path.name}: {e}")
             tree = None
     else:
-        after_languages = file_langs(tree)
+        after_languages = before_languages | inserted_languages
     new_languages = after_languages - before_languages
     stats["all_languages"] = len(after_languages)
     stats["new_languages"] = len(new_languages)
     stats["new_languages_list"] = sorted(new_languages)
-
-    logger.debug(f"Processed {stats['processed_switches']} switches")
-    logger.debug(f"Inserted {stats['inserted_translations']} translations")
-    logger.debug(f"Updated {stats['updated_translations']} translations")
-    logger.debug(f"Skipped {stats['skipped_translations']} existing translations")
+    if clock.enabled:
+        stats["timings"] = clock.as_dict()
+
+    debug(
+        "Injected translations",
+        processed_switches=stats["processed_switches"],
+        inserted=stats["inserted_translations"],
+        updated=stats["updated_translations"],
+        skipped=stats["skipped_translations"],
+    )
 
     if return_stats:
         return tree, stats
@@ -0,0 +1,137 @@
+"""Append-only JSONL journal of a batch run, used to resume it after a crash."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Mapping
+
+logger = logging.getLogger("CopySVGTranslation")
+
+
+class JournalFileStats(Mapping):
+    """Read-only ``{name: stats}`` view of the journaled files.
+
+    Only the byte offset of each entry is kept in memory; the stats are read
+    back from the journal when they are looked up.
+    """
+
+    def __init__(self, path: Path, offsets: Dict[str, int]):
+        self._path = path
+        self._offsets = offsets
+
+    def __getitem__(self, name: str) -> dict:
+        offset = self._offsets[name]
+        with open(self._path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())["stats"]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __repr__(self) -> str:
+        return f"JournalFileStats({len(self._offsets)} files from {self._path})"
+
+
+class BatchJournal:
+    """One JSON line per finished file: its path, name, status and stats.
+
+    Each line is flushed and synced to disk with ``os.fsync`` as soon as it is
+    written, so a killed run, or a power loss, loses at most the line it was
+    writing. :meth:`replay` reads the entries of an
+    earlier run back and drops such a truncated last line, including one that
+    lost only its newline.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(str(path))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.done: set[str] = set()
+        self._offsets: Dict[str, int] = {}
+        self._file: BinaryIO | None = None
+
+    def replay(self) -> Iterator[dict[str, Any]]:
+        """Yield the complete entries already in the journal, in the order they were written."""
+        if not self.path.exists():
+            return
+        end = 0
+        with open(self.path, "rb") as f:
+            for line in iter(f.readline, b""):
+                # A line without its newline was cut short, even if what was written parses
+                try:
+                    entry = json.loads(line) if line.endswith(b"\n") else None
+                except ValueError:
+                    entry = None
+                if entry is None:
+                    logger.warning(f"Ignoring the incomplete end of {self.path}")
+                    break
+                self._remember(entry, end)
+                end += len(line)
+                yield entry
+        if end != self.path.stat().st_size:
+            with open(self.path, "r+b") as f:
+                f.truncate(end)
+
+    def append(self, file: Path | str, name: str, status: str, stats: dict) -> None:
+        """Write the outcome of ``file`` and sync it to disk."""
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        entry = {
+            "file": str(Path(str(file)).resolve()),
+            "name": name,
+            "status": status,
+            "stats": stats,
+        }
+        offset = self._file.tell()
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        self._file.write(line.encode("utf-8") + b"\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._remember(entry, offset)
+
+    def reset(self) -> None:
+        """Empty the journal, forgetting every entry."""
+        self.path.write_bytes(b"")
+        self.done.clear()
+        self._offsets.clear()
+
+    def is_done(self, file: Path | str) -> bool:
+        return str(Path(str(file)).resolve()) in self.done
+
+    def iter_file_stats(self) -> Iterator[tuple[str, dict]]:
+        """Yield the name and stats of every journaled file that was not nested.
+
+        The journal is read one line at a time, so the stats are never all in
+        memory; a truncated last line is skipped as in :meth:`replay`.
+        """
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            for line in iter(f.readline, b""):
+                try:
+                    entry = json.loads(line) if line.endswith(b"\n") else None
+                except ValueError:
+                    entry = None
+                if entry is None:
+                    break
+                if entry["status"] != "nested":
+                    yield entry["name"], entry["stats"]
+
+    def file_stats_view(self) -> JournalFileStats:
+        """Return the ``{name: stats}`` of the journaled files as a mapping read on lookup."""
+        return JournalFileStats(self.path, self._offsets)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _remember(self, entry: dict, offset: int) -> None:
+        self.done.add(entry["file"])
+        if entry["status"] != "nested":
+            self._offsets[entry["name"]] = offset
@@ -0,0 +1,225 @@
+"""Content-hash manifest that lets batch runs skip files they already processed.
+
+The manifest also keeps a reverse index from the lookup key of every default
+text to the files and switches containing it, so a mapping change only needs
+to touch the files that use the changed keys.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from ..diagnostics import debug
+from ..titles import split_title_year
+from .mapping import CompiledMapping
+
+logger = logging.getLogger("CopySVGTranslation")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    input_hash TEXT NOT NULL,
+    mapping_hash TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    output_path TEXT,
+    output_hash TEXT,
+    stats TEXT NOT NULL,
+    indexed INTEGER NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS keys (
+    path TEXT NOT NULL,
+    key TEXT NOT NULL,
+    title_base TEXT,
+    switches TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS keys_key ON keys (key);
+CREATE INDEX IF NOT EXISTS keys_title_base ON keys (title_base);
+CREATE INDEX IF NOT EXISTS keys_path ON keys (path);
+"""
+
+
+def file_digest(path: Path | str) -> str | None:
+    """Return the SHA-256 of the file at ``path``, or ``None`` if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def mapping_fingerprint(mapping: CompiledMapping) -> str:
+    """Return a hash that changes whenever the content or case mode of ``mapping`` does."""
+    plain = {
+        section: {key: dict(value) for key, value in data.items()}
+        for section, data in mapping.source.items()
+    }
+    payload = json.dumps([mapping.case_insensitive, plain], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class InjectManifest:
+    """SQLite record of the input, mapping, options and output of every processed file.
+
+    Each :meth:`record` is its own transaction, so an interrupted batch keeps
+    the entries of the files it finished. Files recorded with a key index can
+    be found again by key with :meth:`files_with_keys`.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(str(path))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path))
+        self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> InjectManifest:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def lookup(
+        self, file: Path | str, input_hash: str, mapping_hash: str, options: str
+    ) -> dict[str, Any] | None:
+        """Return the stored ``status`` and ``stats`` of ``file`` if a re-run would repeat them.
+
+        That is the case when the input, the mapping and the options are the
+        same as last time and the output written then is still in place.
+        """
+        row = self._db.execute(
+            "SELECT input_hash, mapping_hash, options, status, output_path, output_hash, stats "
+            "FROM files WHERE path = ?",
+            (str(Path(str(file)).resolve()),),
+        ).fetchone()
+        if row is None or row[:3] != (input_hash, mapping_hash, options):
+            return None
+        status, output_path, output_hash, stats = row[3:]
+        if output_path and file_digest(output_path) != output_hash:
+            debug("Output changed since the last run", path=file)
+            return None
+        return {"status": status, "stats": json.loads(stats)}
+
+    def record(
+        self,
+        file: Path | str,
+        input_hash: str,
+        mapping_hash: str,
+        options: str,
+        status: str,
+        stats: dict,
+        key_index: dict[str, list[int]] | None = None,
+    ) -> None:
+        """Store the outcome of processing ``file``.
+
+        ``key_index`` maps the lookup key of each default text to the switches
+        containing it, as filled by :func:`~.injector.plan_switches`. Without
+        it the file is recorded as not indexed.
+        """
+        path = str(Path(str(file)).resolve())
+        output_path = stats.get("file_path") or None
+        output_hash = file_digest(output_path) if output_path else None
+        with self._db:
+            self._db.execute("DELETE FROM keys WHERE path = ?", (path,))
+            if key_index:
+                self._db.executemany(
+                    "INSERT INTO keys VALUES (?, ?, ?, ?)",
+                    [
+                        (path, key, (split_title_year(key) or (None,))[0], json.dumps(switches))
+                        for key, switches in key_index.items()
+                    ],
+                )
+            self._db.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    path,
+                    input_hash,
+                    mapping_hash,
+                    options,
+                    status,
+                    output_path,
+                    output_hash,
+                    json.dumps(stats, ensure_ascii=False, default=str),
+                    int(key_index is not None),
+                    time.time(),
+                ),
+            )
+
+    def entries(self) -> dict[str, dict[str, Any]]:
+        """Return the hashes, options and ``indexed`` flag of every recorded file.
+
+        Each entry has ``input_hash``, ``mapping_hash``, ``options`` and ``indexed``.
+        """
+        rows = self._db.execute(
+            "SELECT path, input_hash, mapping_hash, options, indexed FROM files"
+        )
+        return {
+            path: {
+                "input_hash": input_hash,
+                "mapping_hash": mapping_hash,
+                "options": options,
+                "indexed": bool(indexed),
+            }
+            for path, input_hash, mapping_hash, options, indexed in rows
+        }
+
+    def files_with_keys(
+        self, keys: Iterable[str], title_bases: Iterable[str] = ()
+    ) -> dict[str, list[int]]:
+        """Return the files containing any of ``keys``, with the indices of the matching switches.
+
+        ``title_bases`` also matches year titles: the base ``"population"``
+        matches the default text ``"population 2020"``.
+        """
+        found: dict[str, set[int]] = {}
+        with self._db:
+            self._db.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (key TEXT, title INTEGER)")
+            self._db.executemany("INSERT INTO wanted VALUES (?, 0)", [(key,) for key in keys])
+            self._db.executemany(
+                "INSERT INTO wanted VALUES (?, 1)", [(base,) for base in title_bases]
+            )
+            rows = self._db.execute(
+                "SELECT keys.path, keys.switches FROM keys "
+                "JOIN wanted ON wanted.title = 0 AND keys.key = wanted.key "
+                "UNION ALL "
+                "SELECT keys.path, keys.switches FROM keys "
+                "JOIN wanted ON wanted.title = 1 AND keys.title_base = wanted.key"
+            )
+            for path, switches in rows:
+                found.setdefault(path, set()).update(json.loads(switches))
+            self._db.execute("DELETE FROM wanted")
+        return {path: sorted(switches) for path, switches in found.items()}
+
+    def carry_forward(
+        self, old_mapping_hash: str, new_mapping_hash: str, options: str, exclude: Iterable[str]
+    ) -> int:
+        """Mark files recorded under ``old_mapping_hash`` as up to date with ``new_mapping_hash``.
+
+        Only call this for files the mapping change cannot affect; paths in
+        ``exclude`` are left alone. Returns the number of files updated.
+        """
+        excluded = {str(Path(str(path)).resolve()) for path in exclude}
+        paths = [
+            path for path, entry in self.entries().items()
+            if path not in excluded
+            and entry["mapping_hash"] == old_mapping_hash
+            and entry["options"] == options
+        ]
+        with self._db:
+            self._db.executemany(
+                "UPDATE files SET mapping_hash = ? WHERE path = ?",
+                [(new_mapping_hash, path) for path in paths],
+            )
+        return len(paths)
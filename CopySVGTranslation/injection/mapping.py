@@ -0,0 +1,203 @@
+"""Translation mappings compiled once for fast lookups during injection."""
+
+from __future__ import annotations
+
+import logging
+import sys
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping
+
+from ..diagnostics import debug
+from ..titles import get_titles_translations, make_title_index
+
+logger = logging.getLogger("CopySVGTranslation")
+
+
+def _freeze(translations: Mapping[str, str]) -> Mapping[str, str]:
+    """Return a read-only copy of ``translations`` with interned language codes."""
+    return MappingProxyType({sys.intern(lang): value for lang, value in translations.items()})
+
+
+class CompiledMapping:
+    """Read-only translation mapping prepared once for repeated lookups.
+
+    Accepts the ``{"new": ..., "title": ...}`` layout produced by
+    :func:`~CopySVGTranslation.extraction.extractor.extract` and
+    :func:`~.injector.load_all_mappings`, or a flat ``{english: {lang: text}}``
+    dictionary. Keys are case-folded when ``case_insensitive`` is true, title
+    bases are pre-normalized and language codes are interned, so a lookup is a
+    single dictionary probe on an already normalized key.
+
+    The input is copied, and the instance cannot be changed afterwards. One
+    instance can therefore be shared by any number of threads or
+    :func:`~.injector.inject` calls. Per-document state lives in a
+    :class:`MappingOverlay`.
+
+    When keys differ only by case, the lower-case spelling wins; otherwise the
+    first one seen is kept.
+    """
+
+    __slots__ = ("case_insensitive", "source", "_entries", "_languages", "_titles")
+
+    case_insensitive: bool
+    source: Mapping[str, Mapping[str, Mapping[str, str]]]
+    _entries: dict[str, Mapping[str, str]]
+    _languages: dict[str, frozenset[str]]
+    _titles: dict[str, Mapping[str, str]]
+
+    def __init__(self, mappings: Mapping, case_insensitive: bool = True):
+        titles = mappings.get("title", {}) or {}
+        new = mappings.get("new", mappings)
+
+        snapshot: dict[str, Mapping[str, str]] = {}
+        entries: dict[str, Mapping[str, str]] = {}
+        for key, translations in new.items():
+            if not isinstance(translations, Mapping):
+                continue
+            frozen = _freeze(translations)
+            snapshot[key] = frozen
+            lookup = key.lower() if case_insensitive else key
+            if lookup in entries and lookup != key:
+                continue
+            entries[lookup] = frozen
+
+        title_snapshot = {
+            base: _freeze(translations)
+            for base, translations in titles.items()
+            if isinstance(translations, Mapping)
+        }
+
+        set_slot = object.__setattr__
+        set_slot(self, "case_insensitive", case_insensitive)
+        # Exact-key copy of the input, used to recompile with another case mode
+        source = {"new": MappingProxyType(snapshot), "title": MappingProxyType(title_snapshot)}
+        set_slot(self, "source", MappingProxyType(source))
+        set_slot(self, "_entries", entries)
+        set_slot(
+            self,
+            "_languages",
+            {key: frozenset(translations) for key, translations in entries.items()},
+        )
+        set_slot(self, "_titles", make_title_index(title_snapshot))
+
+        debug("Compiled mapping", entries=len(entries), titles=len(title_snapshot))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __reduce__(self) -> tuple[type[CompiledMapping], tuple[dict, bool]]:
+        # Mapping proxies cannot be pickled; rebuild from plain dictionaries
+        plain = {
+            section: {key: dict(value) for key, value in data.items()}
+            for section, data in self.source.items()
+        }
+        return type(self), (plain, self.case_insensitive)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        return bool(self._entries or self._titles)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def key(self, text: str) -> str:
+        """Return the lookup key for already normalized ``text``."""
+        return text.lower() if self.case_insensitive else text
+
+    def get(self, key: str) -> Mapping[str, str] | None:
+        """Return the translations of lookup ``key`` by language, or ``None``."""
+        return self._entries.get(key)
+
+    def languages(self, key: str) -> frozenset[str]:
+        """Return the languages available for lookup ``key``."""
+        return self._languages.get(key, frozenset())
+
+    def title_translations(self, texts: Iterable[str]) -> dict[str, dict[str, str]]:
+        """Rebuild year-suffixed titles.
+
+        Same as :func:`~CopySVGTranslation.titles.get_titles_translations`.
+        """
+        return get_titles_translations({}, texts, title_index=self._titles)
+
+    def overlay(self) -> MappingOverlay:
+        """Return a fresh per-document :class:`MappingOverlay` on top of this mapping."""
+        return MappingOverlay(self)
+
+
+class MappingOverlay:
+    """Per-document view of a :class:`CompiledMapping`.
+
+    Year titles resolved while injecting one document are kept here, on top of
+    the shared mapping, and take precedence over its entries. The base mapping
+    is never written to, so results do not depend on which documents were
+    processed before.
+    """
+
+    __slots__ = ("base", "case_insensitive", "titles")
+
+    def __init__(self, base: CompiledMapping):
+        self.base = base
+        self.case_insensitive = base.case_insensitive
+        self.titles: dict[str, dict[str, str]] = {}
+
+    def key(self, text: str) -> str:
+        """Return the lookup key for already normalized ``text``."""
+        return self.base.key(text)
+
+    def resolve_titles(self, texts: Iterable[str]) -> None:
+        """Add the year titles of ``texts`` that are not resolved yet."""
+        pending = [text for text in texts if text not in self.titles]
+        if pending:
+            self.titles.update(self.base.title_translations(pending))
+
+    def get(self, key: str) -> Mapping[str, str] | None:
+        """Return the translations of lookup ``key``, preferring resolved titles."""
+        translations = self.titles.get(key)
+        if translations is not None:
+            return translations
+        return self.base.get(key)
+
+
+def diff_mappings(
+    old: Mapping | CompiledMapping, new: Mapping | CompiledMapping
+) -> dict[str, set[str]]:
+    """Return the lookup keys and title bases whose translations differ between ``old`` and ``new``.
+
+    Keys added, removed or changed in any language are listed under ``"new"``;
+    title bases, normalized as in :func:`~CopySVGTranslation.titles.make_title_index`,
+    under ``"title"``. Keys follow the case mode of ``new``, which ``old`` is
+    compiled with as well.
+    """
+    new = compile_mapping(new)
+    old = compile_mapping(old, new.case_insensitive)
+
+    def entries(mapping: CompiledMapping) -> Mapping[str, Mapping[str, str] | None]:
+        return {key: mapping.get(key) for key in map(mapping.key, mapping.source["new"])}
+
+    def titles(mapping: CompiledMapping) -> Mapping[str, Mapping[str, str] | None]:
+        return make_title_index(mapping.source["title"])
+
+    changed = {}
+    for section, collect in (("new", entries), ("title", titles)):
+        before, after = collect(old), collect(new)
+        changed[section] = {
+            key for key in before.keys() | after.keys()
+            if dict(before.get(key) or {}) != dict(after.get(key) or {})
+        }
+    return changed
+
+
+def compile_mapping(
+    mappings: Mapping | CompiledMapping, case_insensitive: bool = True
+) -> CompiledMapping:
+    """Return ``mappings`` as a :class:`CompiledMapping`, compiling it only when needed."""
+    if isinstance(mappings, CompiledMapping):
+        if mappings.case_insensitive == case_insensitive:
+            return mappings
+        mappings = mappings.source
+    return CompiledMapping(mappings, case_insensitive)
@@ -0,0 +1,189 @@
+"""Dry-run planning: what an injection would change, without changing anything."""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+from lxml import etree
+
+from ..diagnostics import debug
+from .injector import describe_switch_plan, load_all_mappings, plan_switch, summarize_plans
+from .mapping import CompiledMapping, MappingOverlay, compile_mapping
+from .preparation import SWITCH_TAG, make_translation_ready
+from .streaming import StreamingUnsupported, plan_streaming
+from .utils import SvgNestedTspanException, SvgStructureException, file_langs
+
+logger = logging.getLogger("CopySVGTranslation")
+
+# Per-process state installed by ``_init_worker`` so the mapping is sent once per worker
+_worker_options: dict[str, Any] = {}
+
+
+def _plan_tree(
+    svg_path: Path,
+    mapping: MappingOverlay,
+    overwrite: bool,
+    parser: etree.XMLParser | None = None,
+) -> dict:
+    """Plan ``svg_path`` on a fully prepared tree; see :func:`~.streaming.plan_streaming`."""
+    try:
+        _tree, root = make_translation_ready(svg_path, write_back=False, parser=parser)
+    except SvgNestedTspanException as exc:
+        return {"nested_tspan_error": True, "node": exc.node()}
+    except Exception as exc:
+        logger.error("Failed to parse SVG file: %s", exc)
+        return {"error": str(exc)}
+
+    plans: list[dict] = []
+    missing: list[str] = []
+    for index, switch in enumerate(root.iter(SWITCH_TAG)):
+        plan = plan_switch(switch, mapping, overwrite=overwrite, missing=missing)
+        if plan is not None:
+            plans.append({"switch": index, **describe_switch_plan(plan)})
+
+    return {"plans": plans, "languages": file_langs(root), "missing": missing}
+
+
+def plan_injection(
+    inject_file: Path | str,
+    mapping_files: Iterable[Path | str] | None = None,
+    all_mappings: Mapping | CompiledMapping | None = None,
+    case_insensitive: bool = True,
+    overwrite: bool = False,
+    parser: etree.XMLParser | None = None,
+) -> dict:
+    """Report what :func:`~.injector.inject` would do to ``inject_file`` without doing it.
+
+    The file is read one ``<switch>`` at a time, as :func:`~.streaming.inject_streaming`
+    does, and nothing is written. Documents the streaming reader cannot handle are
+    planned on a freshly parsed tree instead, read with ``parser`` when given.
+
+    Returns a dictionary with:
+
+    * ``stats``: the stats ``inject(..., return_stats=True)`` would return;
+    * ``changes``: whether any translation would be inserted or updated;
+    * ``switches``: for each switch that would change, its ``switch`` index in
+      document order, its mapping ``keys`` and the languages to ``insert`` and
+      ``update``, plus the number of ``skipped`` ones;
+    * ``missing_keys``: default texts with no entry in the mapping.
+
+    Errors are reported with the same dictionaries ``inject`` returns.
+    """
+    inject_path = Path(str(inject_file))
+
+    if not inject_path.exists():
+        logger.error(f"SVG file not found: {inject_path}")
+        return {"error": "File does not exist"}
+
+    if not all_mappings and mapping_files:
+        all_mappings = load_all_mappings(list(mapping_files))
+
+    if not all_mappings:
+        logger.error("No valid mappings found")
+        return {"error": "No valid mappings found"}
+
+    mapping = compile_mapping(all_mappings, case_insensitive)
+
+    try:
+        result = plan_streaming(inject_path, mapping.overlay(), overwrite=overwrite)
+    except (StreamingUnsupported, SvgStructureException, etree.XMLSyntaxError) as exc:
+        debug("Streaming plan not possible, using the tree path", path=inject_path, reason=exc)
+        result = _plan_tree(inject_path, mapping.overlay(), overwrite, parser)
+        if "plans" not in result:
+            return result
+
+    plans = result["plans"]
+    stats = summarize_plans((None, plan) for plan in plans)
+    before_languages = result["languages"]
+    after_languages = before_languages | {lang for plan in plans for lang in plan["insert"]}
+    new_languages = after_languages - before_languages
+    stats["all_languages"] = len(after_languages)
+    stats["new_languages"] = len(new_languages)
+    stats["new_languages_list"] = sorted(new_languages)
+
+    return {
+        "stats": stats,
+        "changes": bool(stats["inserted_translations"] or stats["updated_translations"]),
+        "switches": [plan for plan in plans if plan["insert"] or plan["update"]],
+        "missing_keys": list(dict.fromkeys(result["missing"])),
+    }
+
+
+def _init_worker(translations: CompiledMapping, overwrite: bool) -> None:
+    """Store the shared planning options in the worker process."""
+    _worker_options.update(translations=translations, overwrite=overwrite)
+
+
+def _worker_plan(file: str) -> tuple[str, dict]:
+    """Plan one file inside a pool worker."""
+    return Path(file).name, plan_injection(
+        file, all_mappings=_worker_options["translations"], overwrite=_worker_options["overwrite"]
+    )
+
+
+def plan_injections(
+    files: list[str],
+    translations: dict | CompiledMapping,
+    overwrite: bool = False,
+    workers: int = 1,
+) -> dict[str, Any]:
+    """Plan the injection of ``translations`` into a collection of SVG files.
+
+    Takes the same arguments as :func:`~.batch.start_injects` minus the output
+    directories and writes nothing. The report counts the files that would be
+    ``changed``, left ``unchanged`` or ``failed``, totals the inserted and
+    updated translations, counts in how many files each key is missing, and
+    keeps the :func:`plan_injection` result of every file under ``files``.
+    """
+    translations = compile_mapping(translations)
+
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(translations, overwrite),
+        ) as executor:
+            chunksize = max(1, len(files) // (workers * 4))
+            paths = [str(file) for file in files]
+            results = list(executor.map(_worker_plan, paths, chunksize=chunksize))
+    else:
+        results = [
+            (
+                Path(str(file)).name,
+                plan_injection(file, all_mappings=translations, overwrite=overwrite),
+            )
+            for file in files
+        ]
+
+    report: dict[str, Any] = {
+        "changed": 0,
+        "unchanged": 0,
+        "failed": 0,
+        "inserted_translations": 0,
+        "updated_translations": 0,
+        "missing_keys": {},
+        "files": {},
+    }
+    missing_keys: dict[str, int] = report["missing_keys"]
+    for name, plan in results:
+        report["files"][name] = plan
+        if "stats" not in plan:
+            report["failed"] += 1
+            continue
+        report["changed" if plan["changes"] else "unchanged"] += 1
+        report["inserted_translations"] += plan["stats"]["inserted_translations"]
+        report["updated_translations"] += plan["stats"]["updated_translations"]
+        for key in plan["missing_keys"]:
+            missing_keys[key] = missing_keys.get(key, 0) + 1
+
+    debug(
+        "Planned files",
+        files=len(files),
+        changed=report["changed"],
+        unchanged=report["unchanged"],
+        failed=report["failed"],
+    )
+    return report
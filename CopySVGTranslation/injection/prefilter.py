@@ -0,0 +1,94 @@
+"""Raw-byte prefilter that rules out files no mapping key can match."""
+
+from __future__ import annotations
+
+import logging
+import re
+from pathlib import Path
+from typing import AbstractSet, FrozenSet
+
+from .mapping import CompiledMapping
+
+logger = logging.getLogger("CopySVGTranslation")
+
+PREFILTER_SKIPPED = "skipped"
+PREFILTER_MATCHED = "matched"
+PREFILTER_UNSUPPORTED = "unsupported"
+
+UTF8_ENCODINGS = {"utf-8", "utf8", "us-ascii", "ascii"}
+XML_ENCODING_RE = re.compile(rb'^\s*<\?xml[^>]*?encoding\s*=\s*["\']([^"\']+)["\']')
+# Each run of non-space text that follows a '>', overlapping ones included
+AFTER_TAG_RE = re.compile(r"(?=>([^\s<]+))")
+
+
+def _fold(text: str) -> str:
+    # Final sigma lowers differently depending on what follows it
+    return text.lower().replace("ς", "σ")
+
+
+def _needle(text: str) -> str | None:
+    """Return the longest word of ``text``, or ``None`` when it has none."""
+    words = _fold(text).split()
+    return max(words, key=len) if words else None
+
+
+def compile_needles(mapping: CompiledMapping) -> FrozenSet[str] | None:
+    """Return one word per mapping key and title that any match must contain.
+
+    A key can only match a text whose words include all of the key's words, so
+    a file containing none of the returned words cannot be changed by
+    ``mapping``. Returns ``None`` when the prefilter cannot be used: the
+    mapping is empty or has a key without any word.
+    """
+    if not mapping:
+        return None
+    needles = set()
+    for key in list(mapping.source["new"]) + list(mapping.source["title"]):
+        needle = _needle(key)
+        if needle is None:
+            return None
+        needles.add(needle)
+    return frozenset(needles)
+
+
+def _file_words(text: str) -> set[str]:
+    """Return every string that could be a word of a text node in ``text``."""
+    words = set(text.replace("<", " ").split())
+    # A text node starts right after the '>' closing a tag
+    words.update(AFTER_TAG_RE.findall(text))
+    # A year title may be written without a space before the year
+    words.update([word[:-4] for word in words if len(word) > 4 and word[-4:].isdigit()])
+    return words
+
+
+def prefilter_file(path: Path | str, needles: AbstractSet[str] | None) -> str:
+    """Decide from the raw bytes of ``path`` whether it needs to be parsed.
+
+    Returns :data:`PREFILTER_SKIPPED` when no text in the file can match any
+    of ``needles`` (see :func:`compile_needles`), :data:`PREFILTER_MATCHED`
+    when one might, and :data:`PREFILTER_UNSUPPORTED` when the bytes cannot be
+    judged without a parser: unreadable or non-UTF-8 files, entity or
+    character references and CDATA sections.
+    """
+    if needles is None:
+        return PREFILTER_UNSUPPORTED
+    try:
+        data = Path(str(path)).read_bytes()
+    except OSError:
+        return PREFILTER_UNSUPPORTED
+
+    if b"&" in data or b"<![CDATA[" in data or b"\x00" in data:
+        return PREFILTER_UNSUPPORTED
+    declaration = XML_ENCODING_RE.match(data)
+    if declaration:
+        encoding = declaration.group(1).decode("ascii", "replace").lower()
+        if encoding not in UTF8_ENCODINGS:
+            return PREFILTER_UNSUPPORTED
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return PREFILTER_UNSUPPORTED
+
+    if needles.isdisjoint(_file_words(_fold(text))):
+        return PREFILTER_SKIPPED
+    return PREFILTER_MATCHED
@@ -6,9 +6,11 @@ import copy
 import logging
 import re
 from pathlib import Path
-from typing import List, Set, Tuple
+from typing import Callable, Iterable, List, Set
 from lxml import etree
 
+from .ids import IdRegistry
+from .timing import NULL_TIMER, PhaseTimer
 from .utils import SvgStructureException, SvgNestedTspanException
 
 logger = logging.getLogger("CopySVGTranslation")
@@ -16,6 +18,12 @@ logger = logging.getLogger("CopySVGTranslation")
 SVG_NS = "http://www.w3.org/2000/svg"
 XMLNS_ATTR = "{http://www.w3.org/2000/xmlns/}xmlns"
 
+SWITCH_TAG = f"{{{SVG_NS}}}switch"
+TEXT_TAG = f"{{{SVG_NS}}}text"
+TSPAN_TAG = f"{{{SVG_NS}}}tspan"
+TREF_TAG = f"{{{SVG_NS}}}tref"
+STYLE_TAG = f"{{{SVG_NS}}}style"
+
 
 def normalize_lang(lang: str) -> str:
     """
@@ -46,57 +54,35 @@ def clone_element(el: etree._Element) -> etree._Element:
     return copy.deepcopy(el)
 
 
-def reorder_texts(root: etree._Element):
+def reorder_switch_texts(sw: etree._Element) -> None:
+    """Sort the child ``<text>`` elements of a single ``<switch>`` (see :func:`reorder_texts`)."""
+    texts = [c for c in sw if isinstance(c.tag, str) and c.tag in ({f"{{{SVG_NS}}}text", "text"})]
+
+    def sort_key(el: etree._Element) -> tuple[int, int, str]:
+        lang = el.get("systemLanguage") or "fallback"
+        m = re.search(r'trsvg(\d+)', (el.get("id") or ""))
+        num = int(m.group(1)) if m else 10**9
+        return (0 if lang == "fallback" else 1, num, lang)
+    texts_sorted = sorted(texts, key=sort_key)
+    # re-append in sorted order, leaving non-text children (if any) as-is
+    for t in texts_sorted:
+        sw.remove(t)
+    for t in texts_sorted:
+        sw.append(t)
+
+
+def reorder_texts(root: etree._Element) -> None:
     """
     Simple deterministic reordering: for every <switch>, sort child <text> elements
     by numeric part of their id if present, otherwise keep original order.
     'fallback' (no systemLanguage) will be placed last.
     """
-    switches = root.findall(".//{%s}switch" % SVG_NS)
-    for sw in switches:
-        texts = [c for c in sw if isinstance(c.tag, str) and c.tag in ({f"{{{SVG_NS}}}text", "text"})]
-
-        def sort_key(el):
-            lang = el.get("systemLanguage") or "fallback"
-            m = re.search(r'trsvg(\d+)', (el.get("id") or ""))
-            num = int(m.group(1)) if m else 10**9
-            return (0 if lang == "fallback" else 1, num, lang)
-        texts_sorted = sorted(texts, key=sort_key)
-        # re-append in sorted order, leaving non-text children (if any) as-is
-        for t in texts_sorted:
-            sw.remove(t)
-        for t in texts_sorted:
-            sw.append(t)
-
-
-def make_translation_ready(svg_file_path: Path, write_back: bool = False) -> Tuple[etree._ElementTree, etree._Element]:
-    """Prepare an SVG file for translation and return its tree and root."""
-    svg_file_path = Path(str(svg_file_path))
-    if not svg_file_path.exists():
-        raise FileNotFoundError(f"SVG file not found: {svg_file_path}")
-
-    parser = etree.XMLParser(remove_blank_text=True)
-    tree = etree.parse(str(svg_file_path), parser)
-    root = tree.getroot()
-    if root is None:
-        raise SvgStructureException('structure-error-no-doc-element')
-
-    # Ensure default namespace (xmlns) exists and is sane
-    default_ns = root.nsmap.get(None)
-    if default_ns is None or re.match(r'^(&[^;]+;)+$', str(default_ns)):
-        root.set(XMLNS_ATTR, SVG_NS)
-        default_ns = SVG_NS
+    for sw in root.iterdescendants(SWITCH_TAG):
+        reorder_switch_texts(sw)
 
-    ns = {"svg": SVG_NS}
-
-    # Check for any <text> elements
-    texts = root.findall(".//{%s}text" % SVG_NS)
-    if len(texts) == 0:
-        logger.warning("File %s has nothing to translate", svg_file_path)
-        return tree, root
 
-    # Check <style> elements for IDs and syntactic complexity
-    styles = root.findall(".//{%s}style" % SVG_NS)
+def check_styles(styles: Iterable[etree._Element]) -> None:
+    """Reject ``<style>`` elements whose CSS is too complex or targets ids."""
     css_simple_re = re.compile(r'^([^{]+\{[^}]*\})*[^{]+$')
     for s in styles:
         css = (s.text or "")
@@ -109,10 +95,10 @@ def make_translation_ready(svg_file_path: Path, write_back: bool = False) -> Tup
                 if '#' in selector:
                     raise SvgStructureException('structure-error-css-has-ids', None, [s.get("id", "")])
 
-    translatable_nodes: List[etree._Element] = []
 
-    # Process tspans
-    tspans = root.findall(".//{%s}tspan" % SVG_NS)
+def collect_translatable_tspans(tspans: Iterable[etree._Element]) -> List[etree._Element]:
+    """Return the given ``<tspan>`` nodes, rejecting any with element children."""
+    translatable_nodes: List[etree._Element] = []
     for tspan in tspans:
         # nested content check: tspan should not have element children
         element_children = [c for c in tspan if isinstance(c.tag, str)]
@@ -123,54 +109,26 @@ def make_translation_ready(svg_file_path: Path, write_back: bool = False) -> Tup
             # raise SvgStructureException('structure-error-nested-tspans-not-supported', tspan, element_children)
             node_text = etree.tostring(tspan, pretty_print=True).decode("utf-8")
             raise SvgNestedTspanException(tspan, [tspan.get("id", "")], node_text=node_text)
+    return translatable_nodes
 
-    # tref not supported
-    trefs = root.findall(".//{%s}tref" % SVG_NS)
-    if len(trefs) != 0:
-        raise SvgStructureException('structure-error-contains-tref')
 
-    # Track all IDs in the document and normalise whitespace around them early
-    existing_ids: Set[str] = set()
-    for element in root.xpath('//*[@id]'):
-        element_id = element.get("id")
-        if not element_id:
-            continue
-        trimmed = element_id.strip()
-        if trimmed != element_id:
-            element.set("id", trimmed)
-        existing_ids.add(trimmed)
+def register_id(element: etree._Element, existing_ids: IdRegistry | Set[str]) -> None:
+    """Strip surrounding whitespace from ``element``'s id and record it."""
+    element_id = element.get("id")
+    if not element_id:
+        return
+    trimmed = element_id.strip()
+    if trimmed != element_id:
+        element.set("id", trimmed)
+    existing_ids.add(trimmed)
 
-    # Collect translatable nodes and prepare idsInUse
-    ids_in_use: List[int] = [0]
-
-    def allocate_trsvg_id() -> str:
-        """Allocate a new unique ``trsvg`` identifier."""
-        next_id = max(ids_in_use) if ids_in_use else 0
-        while True:
-            next_id += 1
-            candidate = f"trsvg{next_id}"
-            if candidate not in existing_ids:
-                ids_in_use.append(next_id)
-                existing_ids.add(candidate)
-                return candidate
 
-    def allocate_clone_id(base_id: str | None, lang: str) -> str:
-        """Allocate a unique identifier for a cloned ``<text>`` node."""
-        if base_id and re.match(r'^trsvg[0-9]+$', base_id):
-            return allocate_trsvg_id()
-        if base_id:
-            base_candidate = f"{base_id}-{lang}"
-            candidate = base_candidate
-            suffix = 1
-            while candidate in existing_ids:
-                suffix += 1
-                candidate = f"{base_candidate}-{suffix}"
-            existing_ids.add(candidate)
-            return candidate
-        return allocate_trsvg_id()
+def wrap_text_nodes(texts: Iterable[etree._Element]) -> List[etree._Element]:
+    """Wrap raw text inside ``<text>`` elements into ``<tspan>`` nodes.
 
-    # Process text elements: wrap raw text nodes into <tspan>
-    texts = root.findall(".//{%s}text" % SVG_NS)
+    Returns the created tspans and the text elements in document order.
+    """
+    translatable_nodes: List[etree._Element] = []
     for text in texts:
         # handle text before first child
         if (text.text or "").strip():
@@ -181,22 +139,30 @@ def make_translation_ready(svg_file_path: Path, write_back: bool = False) -> Tup
             translatable_nodes.append(tspan)
 
         # handle tails after children
-        children = list(text)
-        for idx, child in enumerate(children):
+        for child in list(text):
             if (child.tail or "").strip():
                 new_tspan = etree.Element("{%s}tspan" % SVG_NS)
                 new_tspan.text = child.tail
                 child.tail = None
-                # insert after child
-                insert_index = list(text).index(child) + 1
-                text.insert(insert_index, new_tspan)
+                child.addnext(new_tspan)
                 translatable_nodes.append(new_tspan)
 
         # accumulate the text element itself as translatable node
         translatable_nodes.append(text)
+    return translatable_nodes
 
-    # Clean ids and remove empty nodes
-    for node in list(translatable_nodes):
+
+def clean_translatable_nodes(
+    translatable_nodes: List[etree._Element],
+    existing_ids: IdRegistry | Set[str],
+    ids_in_use: List[int],
+) -> None:
+    """Normalise ids of translatable nodes and drop the empty ones.
+
+    ``translatable_nodes`` is updated in place to the nodes that were kept.
+    """
+    kept: List[etree._Element] = []
+    for node in translatable_nodes:
         node_id = node.get("id")
         if node_id is not None:
             original_id = node_id
@@ -227,120 +193,259 @@ def make_translation_ready(svg_file_path: Path, write_back: bool = False) -> Tup
             parent = node.getparent()
             if parent is not None:
                 parent.remove(node)
-            # also remove from translatable_nodes list
-            try:
-                translatable_nodes.remove(node)
-            except ValueError:
-                pass
+            continue
+        kept.append(node)
+    translatable_nodes[:] = kept
+
+
+def trsvg_allocator(existing_ids: IdRegistry, start: int) -> Callable[[], str]:
+    """Return a callable handing out unused ``trsvg`` ids numbered above ``start``."""
+    cursor = start
+
+    def allocate() -> str:
+        nonlocal cursor
+        while True:
+            cursor += 1
+            candidate = f"trsvg{cursor}"
+            if candidate not in existing_ids:
+                existing_ids.add(candidate)
+                return candidate
 
-    # Rebuild translatable_nodes after removals
-    translatable_nodes = []
-    translatable_nodes.extend(root.findall(".//{%s}tspan" % SVG_NS))
-    translatable_nodes.extend(root.findall(".//{%s}text" % SVG_NS))
+    return allocate
+
+
+def allocate_clone_id(
+    base_id: str | None,
+    lang: str,
+    existing_ids: IdRegistry,
+    allocate_trsvg_id: Callable[[], str],
+) -> str:
+    """Allocate a unique identifier for a cloned ``<text>`` node."""
+    if base_id and re.match(r'^trsvg[0-9]+$', base_id):
+        return allocate_trsvg_id()
+    if base_id:
+        return existing_ids.unique(f"{base_id}-{lang}", first_suffix=2)
+    return allocate_trsvg_id()
+
+
+def prepare_text(text: etree._Element) -> None:
+    """Validate a ``<text>`` element and make sure it sits inside a ``<switch>``."""
+    content = get_text_content(text)
+    if re.search(r'\$[0-9]+', content):
+        raise SvgStructureException('structure-error-text-contains-dollar', text, [content])
+
+    # normalize systemLanguage if present
+    if text.get("systemLanguage"):
+        text.set("systemLanguage", normalize_lang(text.get("systemLanguage")))
+
+    parent = text.getparent()
+    if parent is None or (parent.tag not in ({f"{{{SVG_NS}}}switch", "switch"})):
+        # Create a switch element in the SVG namespace and move the text into it
+        switch = etree.Element("{%s}switch" % SVG_NS)
+        parent_of_text = parent
+        if parent_of_text is None:
+            raise SvgStructureException('structure-error-no-parent-for-text', text, text)
+        # insert switch before text
+        text.addprevious(switch)
+        switch.append(text)
+
+    # move style from text to switch (parent)
+    if text.get("style"):
+        switch_parent = text.getparent()
+        if switch_parent is not None:
+            switch_parent.set("style", text.get("style"))
+
+    # verify that children of text are only tspans or text nodes
+    for child in text:
+        if child.tag not in ({f"{{{SVG_NS}}}tspan", "tspan"}):
+            raise SvgStructureException('structure-error-non-tspan-inside-text', child, child)
+
+
+def split_switch_languages(
+    sw: etree._Element,
+    existing_ids: IdRegistry,
+    allocate_trsvg_id: Callable[[], str],
+) -> None:
+    """Validate a ``<switch>`` and split comma-separated ``systemLanguage`` values."""
+    # gather existing languages for duplicate detection
+    existing_langs: Set[str] = set()
+    # collect children first to avoid modifying while iterating
+    children = list(sw)
+    for child in children:
+        if not isinstance(child.tag, str):
+            # ignore comments etc, but if there's text content outside elements, check whitespace
+            if (child.text or "").strip():
+                raise SvgStructureException(
+                    'structure-error-switch-text-content-outside-text', child, child
+                )
+            continue
+        if child.tag not in ({f"{{{SVG_NS}}}text", "text"}):
+            raise SvgStructureException('structure-error-switch-child-not-text', child, child)
+
+        language_attr = child.get("systemLanguage")
+        real_langs = re.split(r',\s*', language_attr) if language_attr else ["fallback"]
+
+        languages_present: Set[str] = set()
+        for real in real_langs:
+            if real in languages_present:
+                raise SvgStructureException('structure-error-multiple-lang-in-text', child, [real])
+            languages_present.add(real)
+            if real in existing_langs:
+                raise SvgStructureException('structure-error-multiple-text-same-lang', sw, [real])
+
+        if len(real_langs) == 1:
+            lang_value = real_langs[0]
+            if lang_value == "fallback":
+                if language_attr:
+                    child.attrib.pop("systemLanguage", None)
+            else:
+                child.set("systemLanguage", lang_value)
+            existing_langs.add(lang_value)
+            continue
+
+        original_lang = real_langs[0]
+        if original_lang == "fallback":
+            child.attrib.pop("systemLanguage", None)
+        else:
+            child.set("systemLanguage", original_lang)
+        existing_langs.add(original_lang)
+
+        base_id = child.get("id")
+        for real in real_langs[1:]:
+            if real in existing_langs:
+                raise SvgStructureException('structure-error-multiple-text-same-lang', sw, [real])
+            cloned = clone_element(child)
+            if real == "fallback":
+                cloned.attrib.pop("systemLanguage", None)
+            else:
+                cloned.set("systemLanguage", real)
+            new_id = allocate_clone_id(base_id, real, existing_ids, allocate_trsvg_id)
+            cloned.set("id", new_id)
+            existing_langs.add(real)
+            sw.append(cloned)
+
+
+def make_translation_ready(
+    svg_file_path: Path,
+    write_back: bool = False,
+    return_ids: bool = False,
+    timer: PhaseTimer | None = None,
+    parser: etree.XMLParser | None = None,
+):
+    """Prepare an SVG file for translation and return its tree and root.
+
+    The document is walked a fixed number of times regardless of its size, and
+    every step is linear in the number of nodes it touches. With
+    ``return_ids=True`` the :class:`~.ids.IdRegistry` of the prepared document
+    is returned as a third item, ready to be handed to
+    :func:`~.injector.work_on_switches`. A ``timer`` is charged the ``parse``
+    phase and given the parsed ``nodes`` count. ``parser`` replaces the default
+    ``XMLParser(remove_blank_text=True)``.
+    """
+    svg_file_path = Path(str(svg_file_path))
+    if not svg_file_path.exists():
+        raise FileNotFoundError(f"SVG file not found: {svg_file_path}")
+
+    clock = timer or NULL_TIMER
+    if parser is None:
+        parser = etree.XMLParser(remove_blank_text=True)
+    with clock.phase("parse"):
+        tree = etree.parse(str(svg_file_path), parser)
+    root = tree.getroot()
+    if root is None:
+        raise SvgStructureException('structure-error-no-doc-element')
+    if clock.enabled:
+        clock.count("nodes", sum(1 for _ in root.iter()))
+
+    # Ensure default namespace (xmlns) exists and is sane
+    default_ns = root.nsmap.get(None)
+    if default_ns is None or re.match(r'^(&[^;]+;)+$', str(default_ns)):
+        root.set(XMLNS_ATTR, SVG_NS)
+        default_ns = SVG_NS
+
+    # One pass collects every element the checks below look at
+    texts: List[etree._Element] = []
+    tspans: List[etree._Element] = []
+    styles: List[etree._Element] = []
+    has_tref = False
+    for element in root.iterdescendants(TEXT_TAG, TSPAN_TAG, STYLE_TAG, TREF_TAG):
+        tag = element.tag
+        if tag == TEXT_TAG:
+            texts.append(element)
+        elif tag == TSPAN_TAG:
+            tspans.append(element)
+        elif tag == STYLE_TAG:
+            styles.append(element)
+        else:
+            has_tref = True
+
+    # Check for any <text> elements
+    if len(texts) == 0:
+        logger.warning("File %s has nothing to translate", svg_file_path)
+        if return_ids:
+            return tree, root, IdRegistry(root.xpath('//@id'))
+        return tree, root
+
+    # Check <style> elements for IDs and syntactic complexity
+    check_styles(styles)
+
+    # Process tspans
+    translatable_nodes = collect_translatable_tspans(tspans)
+
+    # tref not supported
+    if has_tref:
+        raise SvgStructureException('structure-error-contains-tref')
+
+    # Track all IDs in the document and normalise whitespace around them early
+    existing_ids = IdRegistry()
+    # A plain walk: libxml2 evaluates '//*[@id]' far more slowly on large documents
+    for element in root.iter():
+        if isinstance(element.tag, str):
+            register_id(element, existing_ids)
+
+    # Collect translatable nodes and prepare idsInUse
+    ids_in_use: List[int] = [0]
+
+    # Process text elements: wrap raw text nodes into <tspan>
+    translatable_nodes.extend(wrap_text_nodes(texts))
+
+    # Clean ids and remove empty nodes
+    clean_translatable_nodes(translatable_nodes, existing_ids, ids_in_use)
+
+    # New ids continue after the highest trsvg id already in the document
+    existing_ids.raise_trsvg(max(ids_in_use))
+    allocate_trsvg_id = existing_ids.next_trsvg
+
+    # Rebuild translatable_nodes after removals: tspans first, then texts, in document order
+    tspans = []
+    texts = []
+    for node in root.iterdescendants(TSPAN_TAG, TEXT_TAG):
+        (tspans if node.tag == TSPAN_TAG else texts).append(node)
 
     # Assign new ids where missing
-    for node in translatable_nodes:
+    for node in tspans + texts:
         if node.get("id") is None:
             new_id = allocate_trsvg_id()
             node.set("id", new_id)
 
     # Second pass on text elements for extra checks and switch creation
-    texts = root.findall(".//{%s}text" % SVG_NS)
     for text in texts:
-        content = get_text_content(text)
-        if re.search(r'\$[0-9]+', content):
-            raise SvgStructureException('structure-error-text-contains-dollar', text, [content])
-
-        # normalize systemLanguage if present
-        if text.get("systemLanguage"):
-            text.set("systemLanguage", normalize_lang(text.get("systemLanguage")))
-
-        parent = text.getparent()
-        if parent is None or (parent.tag not in ({f"{{{SVG_NS}}}switch", "switch"})):
-            # Create a switch element in the SVG namespace and move the text into it
-            switch = etree.Element("{%s}switch" % SVG_NS)
-            parent_of_text = parent
-            if parent_of_text is None:
-                raise SvgStructureException('structure-error-no-parent-for-text', text, text)
-            # insert switch before text
-            idx = list(parent_of_text).index(text)
-            parent_of_text.insert(idx, switch)
-            switch.append(text)
-
-        # move style from text to switch (parent)
-        if text.get("style"):
-            switch_parent = text.getparent()
-            if switch_parent is not None:
-                switch_parent.set("style", text.get("style"))
-
-        # verify that children of text are only tspans or text nodes
-        for child in text:
-            if child.tag not in ({f"{{{SVG_NS}}}tspan", "tspan"}):
-                raise SvgStructureException('structure-error-non-tspan-inside-text', child, child)
-
-    # Process all switches: split comma-separated systemLanguage values
-    switches = root.findall(".//{%s}switch" % SVG_NS)
-    for sw in switches:
-        # gather existing languages for duplicate detection
-        existing_langs: Set[str] = set()
-        # collect children first to avoid modifying while iterating
-        children = list(sw)
-        for child in children:
-            if not isinstance(child.tag, str):
-                # ignore comments etc, but if there's text content outside elements, check whitespace
-                if (child.text or "").strip():
-                    raise SvgStructureException('structure-error-switch-text-content-outside-text', child, child)
-                continue
-            if child.tag not in ({f"{{{SVG_NS}}}text", "text"}):
-                raise SvgStructureException('structure-error-switch-child-not-text', child, child)
-
-            language_attr = child.get("systemLanguage")
-            real_langs = re.split(r',\s*', language_attr) if language_attr else ["fallback"]
-
-            languages_present: Set[str] = set()
-            for real in real_langs:
-                if real in languages_present:
-                    raise SvgStructureException('structure-error-multiple-lang-in-text', child, [real])
-                languages_present.add(real)
-                if real in existing_langs:
-                    raise SvgStructureException('structure-error-multiple-text-same-lang', sw, [real])
-
-            if len(real_langs) == 1:
-                lang_value = real_langs[0]
-                if lang_value == "fallback":
-                    if language_attr:
-                        child.attrib.pop("systemLanguage", None)
-                else:
-                    child.set("systemLanguage", lang_value)
-                existing_langs.add(lang_value)
-                continue
+        prepare_text(text)
 
-            original_lang = real_langs[0]
-            if original_lang == "fallback":
-                child.attrib.pop("systemLanguage", None)
-            else:
-                child.set("systemLanguage", original_lang)
-            existing_langs.add(original_lang)
-
-            base_id = child.get("id")
-            for real in real_langs[1:]:
-                if real in existing_langs:
-                    raise SvgStructureException('structure-error-multiple-text-same-lang', sw, [real])
-                cloned = clone_element(child)
-                if real == "fallback":
-                    cloned.attrib.pop("systemLanguage", None)
-                else:
-                    cloned.set("systemLanguage", real)
-                new_id = allocate_clone_id(base_id, real)
-                cloned.set("id", new_id)
-                existing_langs.add(real)
-                sw.append(cloned)
+    # Process all switches, including the ones just created: split comma-separated
+    # systemLanguage values
+    switches = list(root.iterdescendants(SWITCH_TAG))
+    for sw in switches:
+        split_switch_languages(sw, existing_ids, allocate_trsvg_id)
 
     # Final reorder
-    reorder_texts(root)
+    for sw in switches:
+        reorder_switch_texts(sw)
 
     # Optionally write back to file
     if write_back:
         tree.write(str(svg_file_path), pretty_print=True, xml_declaration=True, encoding="utf-8")
 
+    if return_ids:
+        return tree, root, existing_ids
     return tree, root
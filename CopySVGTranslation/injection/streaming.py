@@ -0,0 +1,671 @@
+"""Streaming injection engine that works on one ``<switch>`` at a time.
+
+The tree-based :func:`~CopySVGTranslation.injection.injector.inject` keeps the
+whole document in memory. :func:`inject_streaming` instead reads the file with
+``iterparse`` and handles every ``<switch>`` (or bare ``<text>``) as an
+independent chunk: the chunk is prepared, translated, serialized and released
+before the parser moves on, so peak memory is bounded by the largest switch.
+
+The file is read twice. The first pass only records ids and counts the nodes
+that will receive ``trsvg`` ids, so the second pass can hand out exactly the
+ids the tree-based preparation would. Output is written with the same
+formatting rules libxml2 uses for ``pretty_print``, which keeps the result
+byte-identical to the tree-based path. Documents the streaming engine cannot
+reproduce faithfully (structure errors, internal DTD subsets, mixed content
+in containers, ids of copied texts that may collide with inserted ones, ...)
+are handed to the tree-based path instead.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import IO, Callable, Iterable, Mapping
+
+from lxml import etree
+
+from ..diagnostics import debug
+from .injector import (
+    describe_switch_plan,
+    load_all_mappings,
+    inject,
+    new_switch_stats,
+    plan_switch,
+    sort_switch_texts,
+    work_on_switch,
+)
+from .ids import IdRegistry
+from .mapping import CompiledMapping, MappingOverlay, compile_mapping
+from .preparation import (
+    SVG_NS,
+    check_styles,
+    clean_translatable_nodes,
+    collect_translatable_tspans,
+    prepare_text,
+    register_id,
+    reorder_switch_texts,
+    split_switch_languages,
+    trsvg_allocator,
+    wrap_text_nodes,
+)
+from .utils import SvgStructureException, get_target_path
+
+logger = logging.getLogger("CopySVGTranslation")
+
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+SWITCH_TAG = f"{{{SVG_NS}}}switch"
+TEXT_TAG = f"{{{SVG_NS}}}text"
+TSPAN_TAG = f"{{{SVG_NS}}}tspan"
+TREF_TAG = f"{{{SVG_NS}}}tref"
+STYLE_TAG = f"{{{SVG_NS}}}style"
+CHUNK_TAGS = (SWITCH_TAG, TEXT_TAG)
+
+# libxml2 caps pretty-print indentation at 60 characters
+MAX_INDENT_LEVEL = 30
+
+# The ``-N`` suffixes IdRegistry.unique() appends when an id is taken
+ID_SUFFIX_RE = re.compile(r"(-[0-9]+)+$")
+
+
+class StreamingUnsupported(Exception):
+    """Raised when a document has to be processed by the tree-based path."""
+
+
+def _escape_text(value: str) -> str:
+    """Escape character data the way libxml2 does for UTF-8 output."""
+    return (
+        value.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace("\r", "&#13;")
+    )
+
+
+def _escape_attr(value: str) -> str:
+    """Escape an attribute value the way libxml2 does for UTF-8 output."""
+    return (
+        value.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("\n", "&#10;")
+        .replace("\r", "&#13;")
+        .replace("\t", "&#9;")
+    )
+
+
+def _indent(level: int) -> str:
+    return "  " * min(level, MAX_INDENT_LEVEL)
+
+
+def _qname(tag: str, prefix: str | None) -> str:
+    local = tag.split("}", 1)[1] if tag.startswith("{") else tag
+    return f"{prefix}:{local}" if prefix else local
+
+
+def _start_tag(elem: etree._Element, declarations: Iterable[tuple[str, str]]) -> str:
+    """Render ``<tag xmlns... attrs`` without the closing bracket.
+
+    ``declarations`` are the ``(prefix, uri)`` namespace declarations made on
+    ``elem`` itself, as reported by iterparse ``start-ns`` events.
+    """
+    nsmap = elem.nsmap
+    parts = ["<", _qname(elem.tag, elem.prefix)]
+    for prefix, uri in declarations:
+        if not prefix:
+            parts.append(f' xmlns="{_escape_attr(uri)}"')
+        else:
+            parts.append(f' xmlns:{prefix}="{_escape_attr(uri)}"')
+    for name, value in elem.attrib.items():
+        if name.startswith("{"):
+            uri, local = name[1:].split("}", 1)
+            if uri == XML_NS:
+                attr_prefix: str | None = "xml"
+            else:
+                attr_prefix = next((p for p, u in nsmap.items() if p and u == uri), None)
+                if attr_prefix is None:
+                    raise StreamingUnsupported(f"no prefix for attribute namespace {uri}")
+            name = f"{attr_prefix}:{local}"
+        parts.append(f' {name}="{_escape_attr(value)}"')
+    return "".join(parts)
+
+
+def _has_text_children(elem: etree._Element) -> bool:
+    """Return ``True`` when libxml2 would switch formatting off for ``elem``."""
+    if elem.text is not None:
+        return True
+    return any(child.tail is not None or child.tag is etree.Entity for child in elem)
+
+
+def _serialize(
+    write: Callable[[str], None],
+    node: etree._Element,
+    level: int,
+    fmt: bool,
+    declarations: Iterable[tuple[str, str]] = (),
+) -> None:
+    """Serialize ``node`` (without its tail) as a child at ``level``.
+
+    Descendants are written without namespace declarations of their own.
+    """
+    if node.tag is etree.Entity:
+        write(f"&{node.name};")
+        return
+
+    if fmt:
+        write(_indent(level))
+
+    if node.tag is etree.Comment:
+        write(f"<!--{node.text or ''}-->")
+        return
+    if node.tag is etree.ProcessingInstruction:
+        write(f"<?{node.target} {node.text}?>" if node.text else f"<?{node.target}?>")
+        return
+
+    write(_start_tag(node, declarations))
+    if node.text is None and len(node) == 0:
+        write("/>")
+        return
+
+    child_fmt = fmt and not _has_text_children(node)
+    write(">")
+    if child_fmt:
+        write("\n")
+    if node.text is not None:
+        write(_escape_text(node.text))
+
+    for child in node:
+        _serialize(write, child, level + 1, child_fmt)
+        if child_fmt:
+            write("\n")
+        if child.tail is not None:
+            write(_escape_text(child.tail))
+
+    if child_fmt:
+        write(_indent(level))
+    write(f"</{_qname(node.tag, node.prefix)}>")
+
+
+def _check_root(root: etree._Element) -> None:
+    """Reject documents whose root the streaming engine cannot reproduce."""
+    if root.nsmap.get(None) != SVG_NS:
+        raise StreamingUnsupported("default namespace is not SVG")
+
+    dtd = root.getroottree().docinfo.internalDTD
+    if dtd is not None and (list(dtd.iterentities()) or list(dtd.iterelements())):
+        raise StreamingUnsupported("internal DTD subset")
+
+
+def _release(node: etree._Element) -> None:
+    """Free a processed element and the siblings before it."""
+    node.clear()
+    parent = node.getparent()
+    if parent is None:
+        return
+    while node.getprevious() is not None:
+        del parent[0]
+
+
+def _ids_in(switch: etree._Element) -> set[str]:
+    ids = set()
+    for element in switch.iter():
+        element_id = element.get("id") if isinstance(element.tag, str) else None
+        if element_id:
+            ids.add(element_id)
+    return ids
+
+
+def _id_base(element_id: str) -> str:
+    """Return ``element_id`` without the suffixes :meth:`IdRegistry.unique` may have added."""
+    return ID_SUFFIX_RE.sub("", element_id)
+
+
+def _advance_trsvg(existing_ids: IdRegistry, start: int, count: int) -> int:
+    """Return the ``trsvg`` number reached after ``count`` allocations from ``start``."""
+    cursor = start
+    for _ in range(count):
+        cursor += 1
+        while f"trsvg{cursor}" in existing_ids:
+            cursor += 1
+    return cursor
+
+
+def _prepare_chunk(
+    chunk: etree._Element,
+    existing_ids: IdRegistry,
+    ids_in_use: list[int],
+) -> list[etree._Element]:
+    """Run the id-related preparation steps on one chunk and return its texts."""
+    for element in chunk.iter():
+        if isinstance(element.tag, str):
+            register_id(element, existing_ids)
+
+    translatable_nodes = collect_translatable_tspans(list(chunk.iter(TSPAN_TAG)))
+    if next(chunk.iter(TREF_TAG), None) is not None:
+        raise StreamingUnsupported("tref")
+
+    texts = list(chunk.iter(TEXT_TAG))
+    translatable_nodes.extend(wrap_text_nodes(texts))
+    clean_translatable_nodes(translatable_nodes, existing_ids, ids_in_use)
+    return texts
+
+
+def scan_document(svg_path: Path) -> dict:
+    """First streaming pass: collect ids and the numbers of nodes needing ids.
+
+    Returns a dictionary with ``existing_ids``, ``max_trsvg``, ``tspan_count``,
+    ``text_count`` and ``has_texts``.
+    """
+    existing_ids = IdRegistry()
+    ids_in_use: list[int] = [0]
+    tspan_count = 0
+    text_count = 0
+    has_texts = False
+    chunk = None
+
+    context = etree.iterparse(str(svg_path), events=("start", "end"), remove_blank_text=True)
+    for event, node in context:
+        if chunk is not None:
+            if event == "end" and node is chunk:
+                chunk = None
+                texts = _prepare_chunk(node, existing_ids, ids_in_use)
+                has_texts = has_texts or bool(texts)
+                if node.getparent() is not None:
+                    tspan_count += sum(1 for t in node.iter(TSPAN_TAG) if t.get("id") is None)
+                    text_count += sum(1 for t in node.iter(TEXT_TAG) if t.get("id") is None)
+                _release(node)
+            continue
+
+        if event == "start":
+            if node.getparent() is None:
+                _check_root(node)
+            if node.tag in CHUNK_TAGS:
+                chunk = node
+                continue
+            if node.tag in (TSPAN_TAG, TREF_TAG):
+                raise StreamingUnsupported(f"{node.tag} outside <text>")
+            register_id(node, existing_ids)
+        else:
+            if node.tag == STYLE_TAG:
+                check_styles([node])
+            _release(node)
+
+    return {
+        "existing_ids": existing_ids,
+        "max_trsvg": max(ids_in_use),
+        "tspan_count": tspan_count,
+        "text_count": text_count,
+        "has_texts": has_texts,
+    }
+
+
+def plan_streaming(svg_path: Path, mapping: MappingOverlay, overwrite: bool = False) -> dict:
+    """Plan the injection of ``svg_path`` one chunk at a time, writing nothing.
+
+    Each chunk is prepared as in :func:`inject_streaming`, planned with
+    :func:`~.injector.plan_switch` and released. Returns a dictionary with the
+    element-free ``plans`` of the translatable switches (each with its
+    ``switch`` index in document order), the ``languages`` already present
+    and the ``missing`` keys. Raises :class:`StreamingUnsupported` or
+    :class:`SvgStructureException` for documents the tree-based path must plan.
+    """
+    existing_ids = IdRegistry()
+    plans: list[dict] = []
+    languages: set[str] = set()
+    missing: list[str] = []
+    switch_count = 0
+    chunk = None
+
+    context = etree.iterparse(str(svg_path), events=("start", "end"), remove_blank_text=True)
+    for event, node in context:
+        if chunk is not None:
+            if event == "end" and node is chunk:
+                chunk = None
+                _prepare_chunk(node, existing_ids, [])
+                if node.getparent() is None:
+                    # An empty bare <text> was dropped by the preparation
+                    continue
+                for text in list(node.iter(TEXT_TAG)):
+                    prepare_text(text)
+                switch = node if node.tag == SWITCH_TAG else node.getparent()
+                split_switch_languages(switch, existing_ids, existing_ids.next_trsvg)
+
+                for text in switch.iter(TEXT_TAG):
+                    system_language = text.get("systemLanguage")
+                    if system_language:
+                        languages.add(system_language)
+
+                plan = plan_switch(switch, mapping, overwrite=overwrite, missing=missing)
+                if plan is not None:
+                    plans.append({"switch": switch_count, **describe_switch_plan(plan)})
+                switch_count += 1
+                _release(switch)
+            continue
+
+        if event == "start":
+            if node.getparent() is None:
+                _check_root(node)
+            if node.tag in CHUNK_TAGS:
+                chunk = node
+                continue
+            if node.tag in (TSPAN_TAG, TREF_TAG):
+                raise StreamingUnsupported(f"{node.tag} outside <text>")
+        else:
+            if node.tag == STYLE_TAG:
+                check_styles([node])
+            _release(node)
+
+    return {"plans": plans, "languages": languages, "missing": missing}
+
+
+class _SwitchStreamer:
+    """Second streaming pass: translate each chunk and write the document."""
+
+    def __init__(
+        self,
+        out: IO[bytes],
+        scan: dict,
+        mapping: CompiledMapping,
+        overwrite: bool,
+        pretty_print: bool,
+    ):
+        self.out = out
+        self.pretty_print = pretty_print
+        self.overwrite = overwrite
+        self.prepare = scan["has_texts"]
+
+        self.existing_ids: IdRegistry = scan["existing_ids"]
+        start = scan["max_trsvg"]
+        text_start = _advance_trsvg(self.existing_ids, start, scan["tspan_count"])
+        clone_start = _advance_trsvg(self.existing_ids, text_start, scan["text_count"])
+        self.allocate_tspan_id = trsvg_allocator(self.existing_ids, start)
+        self.allocate_text_id = trsvg_allocator(self.existing_ids, text_start)
+        self.allocate_clone_id = trsvg_allocator(self.existing_ids, clone_start)
+
+        self.mapping = mapping.overlay()
+
+        self.stats = new_switch_stats()
+        self.before_languages: set[str] = set()
+        self.inserted_languages: set[str] = set()
+        # Bases of the ids inserted so far; see translate_chunk()
+        self.inserted_bases: set[str] = set()
+
+        # Each frame is [element, opened, format_children, namespace_declarations]
+        self.stack: list[list] = []
+        # The last finished child of the top frame, waiting for its tail:
+        # (node, written, namespace_declarations)
+        self.pending: tuple[etree._Element, bool, list] | None = None
+
+    def write(self, value: str) -> None:
+        self.out.write(value.encode("utf-8"))
+
+    def translate_chunk(self, chunk: etree._Element) -> etree._Element | None:
+        """Prepare and translate one chunk, returning the ``<switch>`` to write."""
+        if self.prepare:
+            _prepare_chunk(chunk, self.existing_ids, [])
+            if chunk.getparent() is None:
+                # An empty bare <text> was dropped by the preparation
+                return None
+
+            for tspan in chunk.iter(TSPAN_TAG):
+                if tspan.get("id") is None:
+                    tspan.set("id", self.allocate_tspan_id())
+            texts = list(chunk.iter(TEXT_TAG))
+            for text in texts:
+                if text.get("id") is None:
+                    text.set("id", self.allocate_text_id())
+            for text in texts:
+                prepare_text(text)
+
+        switch = chunk if chunk.tag == SWITCH_TAG else chunk.getparent()
+
+        if self.prepare:
+            ids_before = _ids_in(switch)
+            split_switch_languages(switch, self.existing_ids, self.allocate_clone_id)
+            # The tree-based path copies the texts of every switch before inserting any
+            # translation, so a copy sharing a base with an id already inserted here may
+            # get another suffix there
+            copied_bases = {_id_base(element_id) for element_id in _ids_in(switch) - ids_before}
+            if copied_bases & self.inserted_bases:
+                raise StreamingUnsupported("copied text id may collide with an inserted id")
+            reorder_switch_texts(switch)
+
+        for text in switch.iter(TEXT_TAG):
+            system_language = text.get("systemLanguage")
+            if system_language:
+                self.before_languages.add(system_language)
+
+        ids_before = _ids_in(switch)
+        work_on_switch(
+            switch,
+            self.existing_ids,
+            self.mapping,
+            self.stats,
+            overwrite=self.overwrite,
+            inserted_languages=self.inserted_languages,
+        )
+        inserted_ids = _ids_in(switch) - ids_before
+        self.inserted_bases.update(_id_base(element_id) for element_id in inserted_ids)
+
+        # Fix old <svg:switch> tags, as the tree-based path does
+        if switch.tag == SWITCH_TAG:
+            switch.tag = "switch"
+            sort_switch_texts(switch)
+
+        return switch
+
+    def write_prolog(self, root: etree._Element) -> None:
+        self.write("<?xml version='1.0' encoding='UTF-8'?>\n")
+        doctype = root.getroottree().docinfo.doctype
+        if doctype:
+            self.write(doctype + "\n")
+        for sibling in reversed(list(root.itersiblings(preceding=True))):
+            _serialize(self.write, sibling, 0, False)
+            if self.pretty_print:
+                self.write("\n")
+
+    def write_epilogue(self, root: etree._Element) -> None:
+        for sibling in root.itersiblings():
+            if self.pretty_print:
+                self.write("\n")
+            _serialize(self.write, sibling, 0, False)
+        if self.pretty_print:
+            self.write("\n")
+
+    def open_top(self) -> None:
+        """Write the start tag of the innermost open element once it gets a child."""
+        frame = self.stack[-1]
+        elem = frame[0]
+        level = len(self.stack) - 1
+        if level == 0:
+            parent_fmt = self.pretty_print
+        else:
+            parent_fmt = self.stack[-2][2]
+            if parent_fmt:
+                self.write(_indent(level))
+
+        self.write(_start_tag(elem, frame[3]))
+        self.write(">")
+        frame[1] = True
+        frame[2] = parent_fmt and elem.text is None
+        if frame[2]:
+            self.write("\n")
+        if elem.text is not None:
+            self.write(_escape_text(elem.text))
+
+    def flush_pending(self) -> None:
+        """Write the pending child of the innermost open element and its tail."""
+        if self.pending is None:
+            return
+        node, written, declarations = self.pending
+        self.pending = None
+
+        parent, _, fmt, _ = self.stack[-1]
+        if not written:
+            if node.tag in CHUNK_TAGS:
+                node = self.translate_chunk(node)
+                if node is None:
+                    return
+            _serialize(self.write, node, len(self.stack), fmt, declarations)
+        if fmt:
+            self.write("\n")
+        if node.tail is not None:
+            if fmt:
+                # The tree-based path would not pretty print this container
+                raise StreamingUnsupported("mixed content in a container")
+            self.write(_escape_text(node.tail))
+        parent.remove(node)
+
+    def child_started(self) -> None:
+        """Make room for a new child of the innermost open element."""
+        if self.stack[-1][1]:
+            self.flush_pending()
+        else:
+            self.open_top()
+
+    def run(self, svg_path: Path) -> etree._Element:
+        chunk = None
+        root = None
+        declarations: list[tuple[str, str]] = []
+        context = etree.iterparse(
+            str(svg_path),
+            events=("start-ns", "start", "end", "comment", "pi"),
+            remove_blank_text=True,
+        )
+        for event, node in context:
+            if event == "start-ns":
+                declarations.append(node)
+                continue
+
+            if chunk is not None:
+                if declarations:
+                    # lxml may strip these when the preparation moves nodes around
+                    raise StreamingUnsupported("namespace declaration inside a switch")
+                if event == "end" and node is chunk:
+                    chunk = None
+                    self.pending = (node, False, [])
+                continue
+
+            if event in ("comment", "pi"):
+                if self.stack:
+                    self.child_started()
+                    self.pending = (node, False, [])
+                continue
+
+            if event == "start":
+                node_declarations, declarations = declarations, []
+                if root is None:
+                    root = node
+                    self.write_prolog(root)
+                else:
+                    self.child_started()
+                    if node.tag in CHUNK_TAGS:
+                        if node_declarations:
+                            raise StreamingUnsupported("namespace declaration on a switch")
+                        chunk = node
+                        continue
+                    if node.tag in (TSPAN_TAG, TREF_TAG):
+                        raise StreamingUnsupported(f"{node.tag} outside <text>")
+                if self.prepare:
+                    register_id(node, self.existing_ids)
+                self.stack.append([node, False, False, node_declarations])
+                continue
+
+            # "end" of an element outside any chunk
+            elem, opened, fmt, node_declarations = self.stack[-1]
+            if opened:
+                self.flush_pending()
+                if fmt:
+                    self.write(_indent(len(self.stack) - 1))
+                self.write(f"</{_qname(elem.tag, elem.prefix)}>")
+            self.stack.pop()
+            if self.stack:
+                self.pending = (node, opened, node_declarations)
+            elif not opened:
+                _serialize(self.write, node, 0, self.pretty_print, node_declarations)
+
+        if root is None:
+            raise StreamingUnsupported("empty document")
+        self.write_epilogue(root)
+        return root
+
+
+def inject_streaming(
+    inject_file: Path | str,
+    mapping_files: Iterable[Path | str] | None = None,
+    all_mappings: Mapping | CompiledMapping | None = None,
+    case_insensitive: bool = True,
+    output_file: Path | None = None,
+    output_dir: Path | None = None,
+    overwrite: bool = False,
+    pretty_print: bool = True,
+) -> dict:
+    """Inject translations into an SVG file one ``<switch>`` at a time.
+
+    Takes the same arguments as :func:`~CopySVGTranslation.injection.injector.inject`
+    with ``save_result=True`` and writes the same output, but never holds more
+    than one ``<switch>`` subtree in memory. Returns the injection stats, or an
+    error dictionary when the file could not be processed.
+    """
+    inject_path = Path(str(inject_file))
+
+    if not inject_path.exists():
+        logger.error(f"SVG file not found: {inject_path}")
+        return {"error": "File does not exist"}
+
+    if not all_mappings and mapping_files:
+        all_mappings = load_all_mappings(list(mapping_files))
+
+    if not all_mappings:
+        logger.error("No valid mappings found")
+        return {"error": "No valid mappings found"}
+
+    mapping = compile_mapping(all_mappings, case_insensitive)
+    target_path = get_target_path(output_file, output_dir, inject_path)
+
+    tmp_path = None
+    try:
+        scan = scan_document(inject_path)
+        if not scan["has_texts"]:
+            logger.warning("File %s has nothing to translate", inject_path)
+
+        with tempfile.NamedTemporaryFile(
+            dir=target_path.parent, prefix=f".{target_path.name}.", suffix=".tmp", delete=False
+        ) as out:
+            tmp_path = Path(out.name)
+            streamer = _SwitchStreamer(out, scan, mapping, overwrite, pretty_print)
+            streamer.run(inject_path)
+        os.replace(tmp_path, target_path)
+        tmp_path = None
+    except (StreamingUnsupported, SvgStructureException, etree.XMLSyntaxError) as exc:
+        debug("Streaming injection not possible, using the tree path", path=inject_path, reason=exc)
+        _, stats = inject(
+            inject_path,
+            all_mappings=mapping,
+            case_insensitive=case_insensitive,
+            output_file=target_path,
+            overwrite=overwrite,
+            save_result=True,
+            return_stats=True,
+            pretty_print=pretty_print,
+        )
+        return stats
+    except OSError as exc:
+        logger.error(f"Failed writing {inject_path.name}: {exc}")
+        return {"error": str(exc)}
+    finally:
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+
+    stats = streamer.stats
+    after_languages = streamer.before_languages | streamer.inserted_languages
+    new_languages = after_languages - streamer.before_languages
+    stats["all_languages"] = len(after_languages)
+    stats["new_languages"] = len(new_languages)
+    stats["new_languages_list"] = sorted(new_languages)
+
+    debug("Saved modified SVG", path=target_path)
+    return stats
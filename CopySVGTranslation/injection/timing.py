@@ -0,0 +1,212 @@
+"""Opt-in wall and CPU time collection for the phases of an injection.
+
+The phases can also be recorded as Chrome trace events and written to a file
+that ``chrome://tracing`` and Perfetto open.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from array import array
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Protocol
+
+
+class Timer(Protocol):
+    """What the injection code needs from a timer: :class:`PhaseTimer` or :data:`NULL_TIMER`."""
+
+    enabled: bool
+
+    def phase(self, name: str) -> ContextManager[None]: ...
+
+    def count(self, name: str, value: int) -> None: ...
+
+    def as_dict(self) -> dict[str, Any]: ...
+
+
+class PhaseTimer:
+    """Collects the wall and CPU time spent in each named phase.
+
+    Phases may nest; each one is charged only the time not spent in the phases
+    nested inside it. Counters such as the parsed node count are recorded with
+    :meth:`count`.
+
+    With ``trace=True`` every phase is also kept in :attr:`events` as a
+    complete trace event spanning its whole wall time, nested phases included.
+    """
+
+    enabled = True
+
+    def __init__(self, trace: bool = False):
+        self.phases: Dict[str, List[float]] = {}
+        self.counts: Dict[str, int] = {}
+        self.events: List[dict] | None = [] if trace else None
+        # Wall and CPU time of the nested phases of each open phase
+        self._children: List[List[float]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        nested = [0.0, 0.0]
+        self._children.append(nested)
+        started = time.time_ns() if self.events is not None else 0
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            if self.events is not None:
+                self.events.append(trace_event(name, "phase", started, wall))
+            self._children.pop()
+            if self._children:
+                self._children[-1][0] += wall
+                self._children[-1][1] += cpu
+            totals = self.phases.setdefault(name, [0.0, 0.0])
+            totals[0] += wall - nested[0]
+            totals[1] += cpu - nested[1]
+
+    def count(self, name: str, value: int) -> None:
+        self.counts[name] = value
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return ``{"phases": {name: {"wall": s, "cpu": s}}, **counts}``."""
+        return {
+            "phases": {
+                name: {"wall": wall, "cpu": cpu} for name, (wall, cpu) in self.phases.items()
+            },
+            **self.counts,
+        }
+
+
+class _NullTimer:
+    """Stand-in for :class:`PhaseTimer` when timing is off; every call is a no-op."""
+
+    enabled = False
+    _phase = nullcontext()
+
+    def phase(self, name: str) -> nullcontext:
+        return self._phase
+
+    def count(self, name: str, value: int) -> None:
+        pass
+
+    def as_dict(self) -> dict[str, Any]:
+        return {}
+
+
+NULL_TIMER: Timer = _NullTimer()
+
+
+def trace_event(name: str, category: str, started_ns: int, seconds: float, **args: Any) -> dict:
+    """Return a complete (``"ph": "X"``) trace event of the current process and thread.
+
+    ``started_ns`` is a :func:`time.time_ns` reading, so events recorded in
+    different processes share one timeline.
+    """
+    event = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": started_ns / 1000,
+        "dur": seconds * 1_000_000,
+        "pid": os.getpid(),
+        "tid": threading.get_native_id(),
+    }
+    if args:
+        event["args"] = args
+    return event
+
+
+class TraceWriter:
+    """Streams trace events to a Chrome trace file in the JSON array format.
+
+    Events are written as they arrive, so memory does not grow with the
+    number of files. The first event of every process is preceded by a
+    ``process_name`` metadata event naming it the main process or a worker.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(str(path))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write("[\n")
+        self._first = True
+        self._pids: set[int] = set()
+
+    def write(self, events: Iterable[dict]) -> None:
+        for event in events:
+            pid = event["pid"]
+            if pid not in self._pids:
+                self._pids.add(pid)
+                name = "CopySVGTranslation" if pid == os.getpid() else f"worker {pid}"
+                metadata = {"name": "process_name", "ph": "M", "pid": pid, "tid": 0}
+                self._write({**metadata, "args": {"name": name}})
+            self._write(event)
+
+    def _write(self, event: dict) -> None:
+        if not self._first:
+            self._file.write(",\n")
+        self._first = False
+        self._file.write(json.dumps(event, ensure_ascii=False, default=str))
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.write("\n]\n")
+            self._file.close()
+
+    def __enter__(self) -> TraceWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def write_trace(path: Path | str, events: Iterable[dict]) -> Path:
+    """Write ``events``, such as :attr:`PhaseTimer.events`, to a Chrome trace file at ``path``."""
+    with TraceWriter(path) as writer:
+        writer.write(events)
+    return writer.path
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of already sorted ``values``."""
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+class TimingSummary:
+    """Aggregates the :meth:`PhaseTimer.as_dict` results of many files."""
+
+    def __init__(self) -> None:
+        self.files = 0
+        self._series: Dict[str, array] = {}
+
+    def add(self, timings: dict[str, Any]) -> None:
+        self.files += 1
+        for name, spent in timings.get("phases", {}).items():
+            self._series.setdefault(f"{name}.wall", array("d")).append(spent["wall"])
+            self._series.setdefault(f"{name}.cpu", array("d")).append(spent["cpu"])
+        for name, value in timings.items():
+            if name != "phases":
+                self._series.setdefault(name, array("d")).append(value)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return ``p50``, ``p95`` and ``max`` of each phase's wall and CPU time and counter."""
+        summary: dict[str, Any] = {"files": self.files, "phases": {}}
+        for key, series in self._series.items():
+            values = sorted(series)
+            stats = {
+                "p50": _percentile(values, 0.5),
+                "p95": _percentile(values, 0.95),
+                "max": values[-1],
+            }
+            name, _, clock = key.partition(".")
+            if clock:
+                summary["phases"].setdefault(name, {})[clock] = stats
+            else:
+                summary[name] = stats
+        return summary
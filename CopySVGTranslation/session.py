@@ -0,0 +1,169 @@
+"""Long-lived translation engine that pays the mapping and parser setup once."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+from lxml import etree
+
+from .diagnostics import debug
+from .extraction import extract
+from .injection.batch import start_injects
+from .injection.injector import inject, load_all_mappings
+from .injection.mapping import CompiledMapping, compile_mapping
+from .injection.planning import plan_injection
+from .injection.timing import PhaseTimer
+
+logger = logging.getLogger("CopySVGTranslation")
+
+OPERATIONS = ("inject", "extract", "plan", "batch")
+
+
+class TranslationSession:
+    """Holds a compiled mapping and the injection options for many calls.
+
+    The mapping files are loaded and compiled once, with the title index,
+    when the session is created; every :meth:`inject`, :meth:`plan` and
+    :meth:`batch` call then reuses them instead of loading and compiling the
+    mapping again. Each thread gets one XML parser, reused for every file it
+    reads. The per-document state (the id registry and resolved year titles)
+    is still built for each file, so results are the same as with the
+    module-level functions.
+
+    A session can be shared by threads. :meth:`metrics` reports the calls,
+    files, errors and seconds of each operation.
+    """
+
+    def __init__(
+        self,
+        translations: Mapping | CompiledMapping | None = None,
+        mapping_files: Iterable[Path | str] | None = None,
+        case_insensitive: bool = True,
+        overwrite: bool = False,
+        output_dir: Path | str | None = None,
+        pretty_print: bool = True,
+    ):
+        started = time.perf_counter()
+        if not translations and mapping_files:
+            translations = load_all_mappings(list(mapping_files))
+        if not translations:
+            raise ValueError("No valid mappings found")
+
+        self.mapping = compile_mapping(translations, case_insensitive)
+        self.case_insensitive = case_insensitive
+        self.overwrite = overwrite
+        self.output_dir = Path(str(output_dir)) if output_dir else None
+        self.pretty_print = pretty_print
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._metrics = {
+            op: {"calls": 0, "files": 0, "errors": 0, "seconds": 0.0} for op in OPERATIONS
+        }
+        self.setup_seconds = time.perf_counter() - started
+        debug("Session ready", entries=len(self.mapping), seconds=self.setup_seconds)
+
+    def parser(self) -> etree.XMLParser:
+        """Return the XML parser of the calling thread; threads must not share lxml parsers."""
+        parser = getattr(self._local, "parser", None)
+        if parser is None:
+            parser = self._local.parser = etree.XMLParser(remove_blank_text=True)
+        return parser
+
+    def inject(
+        self,
+        file: Path | str,
+        output_file: Path | None = None,
+        output_dir: Path | str | None = None,
+        save_result: bool = False,
+        skip_unchanged: bool = False,
+        timer: PhaseTimer | None = None,
+    ) -> tuple[etree._ElementTree | None, dict]:
+        """Inject the session's translations into ``file``.
+
+        Same as :func:`~.injection.injector.inject` with ``return_stats=True``;
+        ``output_dir`` defaults to the session's.
+        """
+        started = time.perf_counter()
+        target_dir = Path(str(output_dir)) if output_dir else self.output_dir
+        tree, stats = inject(
+            file,
+            all_mappings=self.mapping,
+            case_insensitive=self.case_insensitive,
+            output_file=output_file,
+            output_dir=target_dir,
+            overwrite=self.overwrite,
+            save_result=save_result,
+            return_stats=True,
+            skip_unchanged=skip_unchanged,
+            timer=timer,
+            parser=self.parser(),
+            pretty_print=self.pretty_print,
+        )
+        self._count("inject", started, errors=int(tree is None))
+        return tree, stats
+
+    def extract(self, file: Path | str) -> dict | None:
+        """Extract the translations of ``file`` like :func:`~.extraction.extractor.extract`."""
+        started = time.perf_counter()
+        translations = extract(file, case_insensitive=self.case_insensitive, parser=self.parser())
+        self._count("extract", started, errors=int(translations is None))
+        return translations
+
+    def plan(self, file: Path | str) -> dict:
+        """Report what :meth:`inject` would do to ``file``.
+
+        See :func:`~.injection.planning.plan_injection`.
+        """
+        started = time.perf_counter()
+        result = plan_injection(
+            file,
+            all_mappings=self.mapping,
+            case_insensitive=self.case_insensitive,
+            overwrite=self.overwrite,
+            parser=self.parser(),
+        )
+        self._count("plan", started, errors=int("stats" not in result))
+        return result
+
+    def batch(
+        self,
+        files: list[str],
+        output_dir: Path | str | None = None,
+        **options: Any,
+    ) -> dict[str, Any]:
+        """Inject into ``files`` with :func:`~.injection.batch.start_injects` and return its report.
+
+        ``output_dir`` defaults to the session's and is created if needed; the
+        other ``options``, such as ``workers`` or ``manifest``, are passed on.
+        """
+        target_dir = Path(str(output_dir)) if output_dir else self.output_dir
+        if target_dir is None:
+            raise ValueError("batch() needs an output_dir")
+        target_dir.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        report = start_injects(files, self.mapping, target_dir, overwrite=self.overwrite, **options)
+        self._count("batch", started, files=len(files), errors=report["failed"])
+        return report
+
+    def metrics(self) -> dict[str, Any]:
+        """Return ``setup_seconds`` and the counters of every method.
+
+        Each method has ``calls``, ``files``, ``errors`` and ``seconds``.
+        """
+        with self._lock:
+            operations = {op: dict(counters) for op, counters in self._metrics.items()}
+        return {"setup_seconds": self.setup_seconds, "operations": operations}
+
+    def _count(self, op: str, started: float, files: int = 1, errors: int = 0) -> None:
+        seconds = time.perf_counter() - started
+        with self._lock:
+            counters = self._metrics[op]
+            counters["calls"] += 1
+            counters["files"] += files
+            counters["errors"] += errors
+            counters["seconds"] += seconds
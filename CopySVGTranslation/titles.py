@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, List
+from typing import Dict, Iterable, Mapping, Optional, Tuple
 
 logger = logging.getLogger("CopySVGTranslation")
 
@@ -52,9 +52,47 @@ def make_title_translations(
     return all_mappings_title
 
 
+def make_title_index(
+    all_mappings_title: Mapping[str, Mapping[str, str]]
+) -> Dict[str, Mapping[str, str]]:
+    """
+    Normalize the base titles of ``all_mappings_title`` once for repeated lookups.
+
+    The index maps ``base.strip().lower()`` to the translations without year and
+    can be shared by every switch and file of a batch.
+    """
+    return {x.strip().lower(): v for x, v in all_mappings_title.items()}
+
+
+def split_title_year(text: str) -> Optional[Tuple[str, str]]:
+    """Split ``text`` into its normalized base title and trailing 4-digit year.
+
+    Returns ``None`` when ``text`` does not end with a year.
+    """
+    if len(text) > 4 and text[-4:].isdigit():
+        return text[:-4].strip().lower(), text[-4:]
+    return None
+
+
+def lookup_title(
+    title_index: Mapping[str, Mapping[str, str]],
+    text: str,
+) -> Optional[Dict[str, str]]:
+    """Return the translations of a year-suffixed ``text`` using a prebuilt index, or ``None``."""
+    split = split_title_year(text)
+    if split is None:
+        return None
+    base, year = split
+    translations = title_index.get(base)
+    if not translations:
+        return None
+    return {lang: f"{value} {year}" for lang, value in translations.items()}
+
+
 def get_titles_translations(
     all_mappings_title: Dict[str, Dict[str, str]],
-    default_texts: List[str],
+    default_texts: Iterable[str],
+    title_index: Optional[Mapping[str, Mapping[str, str]]] = None,
 ) -> Dict[str, Dict[str, str]]:
     """
     Build reconstructed translations by reattaching the year to the base titles.
@@ -73,22 +111,20 @@ def get_titles_translations(
     Args:
         all_mappings_title: Dictionary from year -> translations without year.
         default_texts: List of default titles (with years) to reconstruct translations for.
+        title_index: Optional index from :func:`make_title_index`; pass it when calling
+            repeatedly with the same titles to skip re-normalizing them on every call.
 
     Returns:
         Dictionary mapping original title -> translations including the year.
     """
     titles_translations: Dict[str, Dict[str, str]] = {}
 
-    all_mappings_title_fixed = {
-        x.strip().lower(): v for x, v in all_mappings_title.items()
-    }
+    if title_index is None:
+        title_index = make_title_index(all_mappings_title)
 
     for text in default_texts:
-        if len(text) > 4 and text[-4:].isdigit():
-            year = text[-4:]
-            key = text[:-4]
-            translations = all_mappings_title_fixed.get(key.strip().lower())
-            if translations:
-                titles_translations[text] = {lang: f"{value} {year}" for lang, value in translations.items()}
+        translations = lookup_title(title_index, text)
+        if translations:
+            titles_translations[text] = translations
 
     return titles_translations
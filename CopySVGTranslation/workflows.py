@@ -4,15 +4,29 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
 from pathlib import Path
-from typing import Mapping
+from typing import Any, Iterable, Mapping
 
+from .diagnostics import debug
 from .extraction import extract
-from .injection import inject
+from .injection import inject, start_injects
 
 logger = logging.getLogger("CopySVGTranslation")
 
 
+def save_translations(translations: Mapping, data_output_file: Path) -> None:
+    """Write extracted translations to ``data_output_file`` as pretty-printed JSON."""
+    try:
+        with open(data_output_file, 'w', encoding='utf-8') as handle:
+            json.dump(translations, handle, indent=2, ensure_ascii=False)
+    except (OSError, TypeError, ValueError) as exc:
+        logger.error(f"Failed to save translations to {data_output_file}: {exc}")
+        return
+
+    debug("Saved translations", path=data_output_file)
+
+
 def svg_extract_and_inject(
     extract_file: Path | str,
     inject_file: Path | str,
@@ -20,10 +34,15 @@ def svg_extract_and_inject(
     data_output_file: Path | None = None,
     overwrite: bool | None = None,
     save_result: bool = False,
+    save_data: bool = True,
 ):
     """
     Extract translations from one SVG and inject them into another.
 
+    The extracted translations are handed to the injector in memory. The JSON
+    copy in `data_output_file` is only a side output, written in a background
+    thread while the injection runs.
+
     Parameters:
         extract_file (Path | str): Path to the SVG file to extract translations from.
         inject_file (Path | str): Path to the SVG file to inject translations into.
@@ -31,6 +50,7 @@ def svg_extract_and_inject(
         data_output_file (Path | None): Optional path for the JSON file that will store extracted translations. If omitted, a file named after `extract_file` is created in a `data` directory under the current working directory.
         overwrite (bool | None): If `True`, existing translation nodes inside the SVG are updated; when `False`, they are left as-is. Ignored for file I/O: when `save_result=True`, the output file is written regardless. `None` is treated as `False`.
         save_result (bool): If `True`, the injection result will be saved to `output_file`.
+        save_data (bool): If `False`, the extracted translations are not written to JSON at all.
 
     Returns:
         ElementTree | None: The parsed tree of the injected SVG when successful, `None` if extraction or injection failed.
@@ -43,43 +63,111 @@ def svg_extract_and_inject(
         logger.error(f"Failed to extract translations from {extract_path}")
         return None
 
-    if not data_output_file:
-        json_output_dir = Path.cwd() / "data"
-        json_output_dir.mkdir(parents=True, exist_ok=True)
+    writer = None
+    if save_data:
+        if not data_output_file:
+            json_output_dir = Path.cwd() / "data"
+            json_output_dir.mkdir(parents=True, exist_ok=True)
 
-        data_output_file = json_output_dir / f"{extract_path.name}.json"
+            data_output_file = json_output_dir / f"{extract_path.name}.json"
 
-    data_output_file = Path(str(data_output_file))
-    data_output_file.parent.mkdir(parents=True, exist_ok=True)
+        data_output_file = Path(str(data_output_file))
+        data_output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    # Save translations to JSON
-    with open(data_output_file, 'w', encoding='utf-8') as handle:
-        json.dump(translations, handle, indent=2, ensure_ascii=False)
-
-    logger.debug(f"Saved translations to {data_output_file}")
+        writer = threading.Thread(
+            target=save_translations, args=(translations, data_output_file), daemon=True
+        )
+        writer.start()
 
     if not output_file:
         output_dir = Path.cwd() / "translated"
         output_dir.mkdir(parents=True, exist_ok=True)
         output_file = output_dir / inject_path.name
 
-    tree, stats = inject(
-        inject_path,
-        mapping_files=[data_output_file],
-        output_file=output_file,
-        overwrite=bool(overwrite),
-        save_result=save_result,
-        return_stats=True,
-    )
+    try:
+        tree, stats = inject(
+            inject_path,
+            all_mappings=translations,
+            output_file=output_file,
+            overwrite=bool(overwrite),
+            save_result=save_result,
+            return_stats=True,
+        )
+    finally:
+        if writer is not None:
+            writer.join()
 
     if tree is None:
         logger.error(f"Failed to inject translations into {inject_path}")
     else:
-        logger.debug("Injection stats: %s", stats)
+        debug("Injection stats", stats=stats)
 
     return tree
 
 
+def svg_extract_and_inject_many(
+    extract_file: Path | str,
+    inject_files: Iterable[Path | str],
+    output_dir: Path | None = None,
+    data_output_file: Path | None = None,
+    overwrite: bool = False,
+    output_dir_nested_files: Path | None = None,
+    **batch_options: Any,
+) -> dict[str, Any] | None:
+    """
+    Extract translations from one SVG once and inject them into many others.
+
+    Parameters:
+        extract_file (Path | str): Path to the SVG file to extract translations from.
+        inject_files (Iterable[Path | str]): SVG files to inject translations into.
+        output_dir (Path | None): Directory for the translated files. Defaults to a
+            `translated` directory under the current working directory.
+        data_output_file (Path | None): If given, the extracted translations are also
+            written there as JSON.
+        overwrite (bool): If `True`, existing translation nodes are updated.
+        output_dir_nested_files (Path | None): If given, files with nested tspans are copied there.
+        **batch_options: Passed on to :func:`start_injects`, e.g. `workers`,
+            `prefilter`, `manifest`, `journal` or `trace`.
+
+    Returns:
+        dict | None: The :func:`start_injects` report with per-target stats, or `None`
+            if extraction failed.
+    """
+    extract_path = Path(str(extract_file))
+
+    translations = extract(extract_path, case_insensitive=True)
+    if not translations:
+        logger.error(f"Failed to extract translations from {extract_path}")
+        return None
+
+    writer = None
+    if data_output_file:
+        data_output_file = Path(str(data_output_file))
+        data_output_file.parent.mkdir(parents=True, exist_ok=True)
+        writer = threading.Thread(
+            target=save_translations, args=(translations, data_output_file), daemon=True
+        )
+        writer.start()
+
+    if not output_dir:
+        output_dir = Path.cwd() / "translated"
+    output_dir = Path(str(output_dir))
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        return start_injects(
+            [str(file) for file in inject_files],
+            translations,
+            output_dir,
+            overwrite=overwrite,
+            output_dir_nested_files=output_dir_nested_files,
+            **batch_options,
+        )
+    finally:
+        if writer is not None:
+            writer.join()
+
+
 def svg_extract_and_injects(
     translations: Mapping,
     inject_file: Path | str,
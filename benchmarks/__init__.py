@@ -0,0 +1,4 @@
+"""Benchmarks and synthetic input generators for CopySVGTranslation.
+
+Run the suite with ``python -m benchmarks.suite``; see :mod:`benchmarks.suite`.
+"""
@@ -0,0 +1,87 @@
+"""
+Latency of one upload handled by a fresh Python process, which imports the
+library and loads the mapping file, against a request to a warm
+:class:`CopySVGTranslation.daemon.TranslationDaemon` over its Unix socket.
+
+python benchmarks/daemon.py
+"""
+import http.client
+import json
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from CopySVGTranslation.daemon import TranslationDaemon  # noqa: E402
+
+from benchmarks.generator import generate_mapping, generate_svg  # noqa: E402
+
+ROUNDS = 10
+MAPPING_SWITCHES = 20_000
+LANGUAGES = 20
+
+COLD = """
+import sys
+from CopySVGTranslation import inject
+inject(sys.argv[1], mapping_files=[sys.argv[2]], output_file=sys.argv[3], save_result=True)
+"""
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__("localhost")
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.unix_path)
+
+
+with tempfile.TemporaryDirectory() as workdir:
+    workdir = Path(workdir)
+    chart = generate_svg(workdir / "chart.svg", switches=20, languages=2)
+    mapping_file = workdir / "mapping.json"
+    mapping = generate_mapping(MAPPING_SWITCHES, 1, LANGUAGES)
+    mapping_file.write_text(json.dumps(mapping), encoding="utf-8")
+    mapping_mb = mapping_file.stat().st_size / 1e6
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        subprocess.run(
+            [sys.executable, "-c", COLD, str(chart), str(mapping_file), str(workdir / "out.svg")],
+            cwd=PROJECT_ROOT,
+            check=True,
+        )
+    cold_elapsed = (time.perf_counter() - start) / ROUNDS
+
+    start = time.perf_counter()
+    daemon = TranslationDaemon([mapping_file])
+    startup = time.perf_counter() - start
+    server = daemon.make_server(workdir / "daemon.sock")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    connection = UnixHTTPConnection(str(workdir / "daemon.sock"))
+    body = chart.read_bytes()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        connection.request("POST", "/inject", body=body)
+        response = connection.getresponse()
+        assert response.status == 200
+        response.read()
+    warm_elapsed = (time.perf_counter() - start) / ROUNDS
+    connection.close()
+    server.shutdown()
+    server.server_close()
+    daemon.close()
+
+print(f"mapping file: {mapping_mb:.1f} MB  chart: {len(body):,} bytes")
+print(f"fresh process per upload:  {cold_elapsed * 1000:8.1f} ms")
+print(f"warm daemon request:       {warm_elapsed * 1000:8.1f} ms")
+print(f"daemon startup (once):     {startup * 1000:8.1f} ms")
@@ -0,0 +1,90 @@
+"""
+Cost of the debug messages of extraction with DEBUG off: eager f-strings
+against the lazy :func:`CopySVGTranslation.diagnostics.debug`.
+
+The messages are the ones extraction logs for every switch and for every
+translated line of a generated source chart, so the payloads have realistic
+sizes and counts.
+
+python benchmarks/debug_logging.py
+"""
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from lxml import etree  # noqa: E402
+
+from CopySVGTranslation import extract  # noqa: E402
+from CopySVGTranslation.diagnostics import debug, debug_enabled  # noqa: E402
+from CopySVGTranslation.extraction.extractor import get_english_default_texts  # noqa: E402
+
+from benchmarks.generator import generate_svg  # noqa: E402
+
+SWITCHES = 5_000
+LINES = 3
+LANGUAGES = 20
+SVG_NS = {"svg": "http://www.w3.org/2000/svg"}
+
+logger = logging.getLogger("CopySVGTranslation")
+logger.setLevel(logging.INFO)
+
+with tempfile.TemporaryDirectory() as workdir:
+    source = generate_svg(
+        Path(workdir) / "source.svg", switches=SWITCHES, lines=LINES, languages=LANGUAGES
+    )
+    root = etree.parse(str(source)).getroot()
+    payloads = [
+        get_english_default_texts(switch.xpath("./svg:text", namespaces=SVG_NS), True)
+        for switch in root.iter("{http://www.w3.org/2000/svg}switch")
+    ]
+    lines = [
+        (tspan.get("id").split("-")[0], tspan.text)
+        for tspan in root.iter("{http://www.w3.org/2000/svg}tspan")
+        if tspan.getparent().get("systemLanguage")
+    ]
+
+    start = time.perf_counter()
+    for new_keys, default_tspans_by_id in payloads:
+        pass
+    for base_id, english_text in lines:
+        pass
+    loop_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for new_keys, default_tspans_by_id in payloads:
+        logger.debug(
+            f"new_keys: {len(new_keys):,}, default_tspans_by_id: {len(default_tspans_by_id):,}"
+        )
+        logger.debug(f"new_keys:{new_keys}")
+        logger.debug(f"default_tspans_by_id:{default_tspans_by_id}")
+    for base_id, english_text in lines:
+        logger.debug(f"{base_id=}, {english_text=}")
+    eager_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for new_keys, default_tspans_by_id in payloads:
+        debug("Default texts", new_keys=new_keys, default_tspans_by_id=default_tspans_by_id)
+    # Per-line messages check the level once per switch, as extract_switch does
+    debugging = debug_enabled()
+    for base_id, english_text in lines:
+        if debugging:
+            debug("Translation", base_id=base_id, english_text=english_text)
+    lazy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    extract(source)
+    extract_elapsed = time.perf_counter() - start
+
+print(f"switches: {SWITCHES:,}  translated lines: {len(lines):,}  (DEBUG off)")
+print(f"empty loops:              {loop_elapsed * 1000:10.1f} ms")
+print(f"eager f-string messages:  {eager_elapsed * 1000:10.1f} ms")
+print(f"lazy diagnostics.debug:   {lazy_elapsed * 1000:10.1f} ms")
+print(f"whole extract():          {extract_elapsed * 1000:10.1f} ms")
+removed = 1 - (lazy_elapsed - loop_elapsed) / (eager_elapsed - loop_elapsed)
+print(f"overhead removed:         {removed:10.1%}")
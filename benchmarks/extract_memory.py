@@ -0,0 +1,60 @@
+"""
+Compare peak memory and time of ``extract()`` and ``extract_streaming()``.
+
+Each extractor runs in a fresh interpreter so the peak RSS of one does not
+hide the other.
+
+python benchmarks/extract_memory.py [switches]
+"""
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+SWITCHES = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+SWITCH = (
+    '<g id="g{i}"><switch>'
+    '<text id="t{i}-ar" systemLanguage="ar"><tspan id="ts{i}-ar">مرحبا {i}</tspan></text>'
+    '<text id="t{i}-fr" systemLanguage="fr"><tspan id="ts{i}-fr">Bonjour {i}</tspan></text>'
+    '<text id="t{i}"><tspan id="ts{i}">Hello {i}</tspan></text>'
+    '</switch><path d="M0 0 L{i} {i}"/></g>\n'
+)
+
+RUNNER = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+from CopySVGTranslation import extract, extract_streaming
+func = {{"extract": extract, "extract_streaming": extract_streaming}}[{name!r}]
+start = time.perf_counter()
+result = func({path!r})
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(f"{{len(result['new']):,}} {{elapsed:.2f}} {{peak:.1f}}")
+"""
+
+
+def write_source(path: Path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0"?>\n<svg xmlns="http://www.w3.org/2000/svg">\n')
+        for i in range(SWITCHES):
+            f.write(SWITCH.format(i=i))
+        f.write("</svg>\n")
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    source = Path(tmp) / "source.svg"
+    write_source(source)
+    size_mb = source.stat().st_size / 1024 / 1024
+    print(f"source: {SWITCHES:,} switches, {size_mb:.1f} MB")
+    print(f"{'extractor':<20} {'keys':>10} {'seconds':>9} {'peak RSS MB':>12}")
+
+    for name in ("extract", "extract_streaming"):
+        code = RUNNER.format(root=str(PROJECT_ROOT), name=name, path=str(source))
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        keys, seconds, peak = output.split()
+        print(f"{name:<20} {keys:>10} {seconds:>9} {peak:>12}")
@@ -0,0 +1,136 @@
+"""Generate realistic multilingual SVG charts and matching translation mappings.
+
+The generated documents look like the charts this package is used on: every
+label is a ``<switch>`` holding one ``<text>`` per language plus the English
+default, some labels are year-suffixed titles, and the rest of the file is
+made of drawing elements. All output is deterministic for a given ``seed``.
+"""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+from CopySVGTranslation.titles import make_title_translations
+
+LANGUAGES = [
+    "ar", "fr", "es", "de", "ru", "zh", "pt", "it",
+    "ja", "ko", "tr", "fa", "hi", "nl", "pl", "sv",
+]
+
+WORDS = [
+    "population", "growth", "income", "share", "deaths", "rate", "energy", "total", "urban",
+    "rural", "exports", "imports", "children", "adults", "emissions", "coverage", "access",
+]
+
+SVG_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<svg xmlns="http://www.w3.org/2000/svg" width="850" height="600" viewBox="0 0 850 600">\n'
+)
+
+
+def language_codes(count: int) -> list[str]:
+    """Return ``count`` language codes, padding with synthetic ``xNN`` codes when needed."""
+    codes = LANGUAGES[:count]
+    codes += [f"x{i:02d}" for i in range(count - len(codes))]
+    return codes
+
+
+def label_text(index: int, line: int) -> str:
+    """Return the English text of ``line`` in label ``index``; every fifth label is a title."""
+    words = f"{WORDS[index % len(WORDS)]} {WORDS[(index * 7 + line) % len(WORDS)]} {index}-{line}"
+    if index % 5 == 0 and line == 0:
+        return f"{words.capitalize()} {1990 + index % 30}"
+    return words.capitalize()
+
+
+def translate(text: str, lang: str) -> str:
+    """Return a fake but stable translation of ``text``, keeping a trailing year."""
+    if len(text) > 4 and text[-4:].isdigit():
+        return f"[{lang}] {text[:-4].strip()} {text[-4:]}"
+    return f"[{lang}] {text}"
+
+
+def _switch(index: int, lines: int, languages: list[str], nested: bool) -> str:
+    x, y = 20 + index % 40 * 20, 20 + index % 29 * 20
+    parts = ['  <switch>\n']
+    for lang in languages + [None]:
+        lang_attr = f' systemLanguage="{lang}"' if lang else ""
+        suffix = f"-{lang}" if lang else ""
+        parts.append(
+            f'    <text id="label{index}{suffix}" x="{x}" y="{y}" font-size="12px"{lang_attr}>\n'
+        )
+        for line in range(lines):
+            english = label_text(index, line)
+            text = translate(english, lang) if lang else english
+            tspan_id = f"label{index}-{line}{suffix}"
+            if nested and lang is None and line == 0:
+                head, _, tail = text.partition(" ")
+                text = f'{head} <tspan font-weight="bold">{tail}</tspan>'
+            parts.append(f'      <tspan id="{tspan_id}" x="{x}" dy="{14 * line}">{text}</tspan>\n')
+        parts.append("    </text>\n")
+    parts.append("  </switch>\n")
+    return "".join(parts)
+
+
+def _shape(rng: random.Random, index: int) -> str:
+    points = " ".join(f"{rng.randint(0, 850)},{rng.randint(0, 600)}" for _ in range(12))
+    fill = f"#{rng.randrange(0x1000000):06x}"
+    return f'  <path id="shape{index}" d="M{points}" fill="{fill}" stroke="none"/>\n'
+
+
+def generate_svg(
+    path: Path | str,
+    switches: int = 100,
+    lines: int = 1,
+    languages: int = 2,
+    nested_rate: float = 0.0,
+    target_bytes: int = 0,
+    seed: int = 0,
+) -> Path:
+    """Write a synthetic multilingual SVG chart to ``path`` and return the path.
+
+    Parameters:
+        switches: Number of ``<switch>`` labels.
+        lines: Number of ``<tspan>`` lines per ``<text>``.
+        languages: Number of translations already present in every switch.
+        nested_rate: Fraction of switches whose default text has a nested ``<tspan>``.
+        target_bytes: Pad the file with ``<path>`` shapes until it is at least this large.
+        seed: Seed for the random drawing data and nested-label choice.
+    """
+    path = Path(path)
+    rng = random.Random(seed)
+    present = language_codes(languages)
+
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        written += f.write(SVG_HEADER)
+        for index in range(switches):
+            written += f.write(_switch(index, lines, present, rng.random() < nested_rate))
+            written += f.write(_shape(rng, index))
+        shape = switches
+        while written < target_bytes:
+            written += f.write(_shape(rng, shape))
+            shape += 1
+        f.write("</svg>\n")
+
+    return path
+
+
+def generate_mapping(switches: int = 100, lines: int = 1, languages: int = 5) -> dict:
+    """Return a mapping in the ``extract`` layout covering the labels of :func:`generate_svg`.
+
+    Title labels are stored for a different year than the one in the chart, so
+    they are only found through the ``"title"`` section.
+    """
+    new = {}
+    for index in range(switches):
+        for line in range(lines):
+            english = label_text(index, line)
+            if len(english) > 4 and english[-4:].isdigit():
+                english = f"{english[:-4]}{int(english[-4:]) - 1}"
+            new[english.lower()] = {
+                lang: translate(english, lang) for lang in language_codes(languages)
+            }
+
+    return {"new": new, "title": make_title_translations(new), "tspans_by_id": {}}
@@ -0,0 +1,46 @@
+"""
+Count how many times ``inject()`` parses XML and time each call.
+
+python benchmarks/inject_parse_count.py
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from lxml import etree  # noqa: E402
+
+from CopySVGTranslation import inject  # noqa: E402
+
+ROUNDS = 200
+SOURCE = PROJECT_ROOT / "tests" / "fixtures" / "target.svg"
+MAPPING = {"new": {"population 2020": {"ar": "السكان 2020", "fr": "Population 2020"}}}
+
+parse_calls = 0
+original_parse = etree.parse
+
+
+def counting_parse(*args, **kwargs):
+    global parse_calls
+    parse_calls += 1
+    return original_parse(*args, **kwargs)
+
+
+etree.parse = counting_parse
+
+with tempfile.TemporaryDirectory() as tmp:
+    output_dir = Path(tmp)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        inject(SOURCE, all_mappings=MAPPING, output_dir=output_dir, save_result=True)
+    elapsed = time.perf_counter() - start
+
+etree.parse = original_parse
+
+print(f"inject() calls:      {ROUNDS}")
+print(f"parses per inject(): {parse_calls / ROUNDS:.2f}")
+print(f"ms per inject():     {elapsed / ROUNDS * 1000:.3f}")
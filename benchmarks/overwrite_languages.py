@@ -0,0 +1,51 @@
+"""
+Translate a chart whose switches already hold 300 languages, once inserting
+only the missing ones and once overwriting every existing translation. The
+work_on_switches column excludes parsing, preparation and writing.
+
+python benchmarks/overwrite_languages.py
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.generator import generate_mapping, generate_svg  # noqa: E402
+from CopySVGTranslation import compile_mapping, inject, make_translation_ready  # noqa: E402
+from CopySVGTranslation.injection import work_on_switches  # noqa: E402
+
+SWITCHES = 200
+LINES = 2
+LANGUAGES = 300
+
+with tempfile.TemporaryDirectory() as tmp:
+    chart = generate_svg(
+        Path(tmp) / "chart.svg", switches=SWITCHES, lines=LINES, languages=LANGUAGES
+    )
+    mapping = compile_mapping(generate_mapping(SWITCHES, LINES, LANGUAGES))
+
+    print(f"switches: {SWITCHES:,}  lines: {LINES}  languages: {LANGUAGES}")
+    print(f"{'mode':<10} {'inject':>12} {'work_on_switches':>18}")
+    for overwrite in (False, True):
+        start = time.perf_counter()
+        inject(chart, all_mappings=mapping, overwrite=overwrite)
+        inject_elapsed = time.perf_counter() - start
+
+        _, root, existing_ids = make_translation_ready(chart, return_ids=True)
+        start = time.perf_counter()
+        stats = work_on_switches(root, existing_ids, mapping, overwrite=overwrite)
+        switches_elapsed = time.perf_counter() - start
+
+        label = "overwrite" if overwrite else "insert"
+        if overwrite:
+            changed = f"{stats['updated_translations']:,} updated"
+        else:
+            changed = f"{stats['skipped_translations']:,} skipped"
+        print(
+            f"{label:<10} {inject_elapsed * 1000:9.1f} ms "
+            f"{switches_elapsed * 1000:15.1f} ms  ({changed})"
+        )
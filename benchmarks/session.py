@@ -0,0 +1,52 @@
+"""
+Per-file cost of ``inject(mapping_files=...)``, which loads and compiles the
+mapping on every call, against one :class:`CopySVGTranslation.TranslationSession`
+reused for every file.
+
+python benchmarks/session.py
+"""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from CopySVGTranslation import TranslationSession, inject  # noqa: E402
+
+from benchmarks.generator import generate_mapping, generate_svg  # noqa: E402
+
+FILES = 100
+SWITCHES = 20
+MAPPING_SWITCHES = 5_000
+LANGUAGES = 20
+
+with tempfile.TemporaryDirectory() as workdir:
+    workdir = Path(workdir)
+    charts = [
+        generate_svg(workdir / f"chart{i}.svg", switches=SWITCHES, languages=2)
+        for i in range(FILES)
+    ]
+    mapping_file = workdir / "mapping.json"
+    mapping = generate_mapping(MAPPING_SWITCHES, 1, LANGUAGES)
+    mapping_file.write_text(json.dumps(mapping), encoding="utf-8")
+
+    start = time.perf_counter()
+    for chart in charts:
+        inject(chart, mapping_files=[mapping_file], return_stats=True)
+    plain_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    session = TranslationSession(mapping_files=[mapping_file])
+    for chart in charts:
+        session.inject(chart)
+    session_elapsed = time.perf_counter() - start
+
+print(f"files: {FILES}  switches per file: {SWITCHES}  mapping entries: {len(session.mapping):,}")
+for label, elapsed in (("inject(mapping_files=...):", plain_elapsed),
+                       ("TranslationSession.inject:", session_elapsed)):
+    print(f"{label:<27} {elapsed / FILES * 1000:8.2f} ms/file  {FILES / elapsed:8.1f} files/s")
+print(f"session setup (once):       {session.setup_seconds * 1000:8.2f} ms")
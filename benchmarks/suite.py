@@ -0,0 +1,238 @@
+"""
+Throughput benchmarks for the extraction, preparation and injection phases.
+
+Every case runs on synthetic charts from :mod:`benchmarks.generator` at several
+sizes. Each (case, size) pair runs in a fresh process, so the reported peak RSS
+belongs to that case alone. The results are written as JSON so they can be
+compared across releases.
+
+python -m benchmarks.suite [--sizes small medium] [--cases inject extract] [--repeat 3]
+    [--output results.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from importlib import metadata
+from multiprocessing import get_context
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+from lxml import etree  # noqa: E402
+
+from CopySVGTranslation import (  # noqa: E402
+    extract,
+    fix_nested_file,
+    inject,
+    make_translation_ready,
+    start_injects,
+)
+from CopySVGTranslation.injection import compile_mapping, work_on_switches  # noqa: E402
+
+from .generator import generate_mapping, generate_svg  # noqa: E402
+
+SIZES = {
+    "small": {"switches": 50, "lines": 1, "languages": 2},
+    "medium": {"switches": 1000, "lines": 2, "languages": 3},
+    "large": {"switches": 5000, "lines": 2, "languages": 3},
+}
+
+# Languages in the mapping; the ones missing from a chart get inserted
+MAPPING_LANGUAGES = 6
+BATCH_FILES = 8
+NESTED_RATE = 0.1
+
+
+def _timed(phases: dict, name: str, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+    return result
+
+
+def bench_extract(workdir: Path, params: dict) -> tuple[int, dict]:
+    source = generate_svg(
+        workdir / "source.svg", languages=MAPPING_LANGUAGES, **_without(params, "languages")
+    )
+    phases: dict = {}
+    _timed(phases, "extract", extract, source)
+    return 1, phases
+
+
+def bench_make_translation_ready(workdir: Path, params: dict) -> tuple[int, dict]:
+    chart = generate_svg(workdir / "chart.svg", **params)
+    phases: dict = {}
+    _timed(phases, "parse_and_prepare", make_translation_ready, chart, write_back=False)
+    return 1, phases
+
+
+def bench_work_on_switches(workdir: Path, params: dict) -> tuple[int, dict]:
+    chart = generate_svg(workdir / "chart.svg", **params)
+    mappings = generate_mapping(params["switches"], params["lines"], MAPPING_LANGUAGES)
+    mapping = compile_mapping(mappings)
+    phases: dict = {}
+    _, root, existing_ids = _timed(
+        phases, "parse_and_prepare", make_translation_ready, chart,
+        write_back=False, return_ids=True,
+    )
+    _timed(phases, "work_on_switches", work_on_switches, root, existing_ids, mapping)
+    return 1, phases
+
+
+def bench_inject(workdir: Path, params: dict) -> tuple[int, dict]:
+    chart = generate_svg(workdir / "chart.svg", **params)
+    mappings = generate_mapping(params["switches"], params["lines"], MAPPING_LANGUAGES)
+    phases: dict = {}
+    mapping = _timed(phases, "compile_mapping", compile_mapping, mappings)
+    _timed(
+        phases, "inject", inject, chart,
+        all_mappings=mapping, output_file=workdir / "out.svg", save_result=True,
+    )
+    return 1, phases
+
+
+def bench_start_injects(workdir: Path, params: dict) -> tuple[int, dict]:
+    files = [generate_svg(workdir / f"chart{i}.svg", seed=i, **params) for i in range(BATCH_FILES)]
+    mappings = generate_mapping(params["switches"], params["lines"], MAPPING_LANGUAGES)
+    output_dir = workdir / "translated"
+    output_dir.mkdir(exist_ok=True)
+    phases: dict = {}
+    _timed(phases, "start_injects", start_injects, files, mappings, output_dir)
+    return len(files), phases
+
+
+def bench_fix_nested_file(workdir: Path, params: dict) -> tuple[int, dict]:
+    chart = generate_svg(
+        workdir / "nested.svg", nested_rate=NESTED_RATE, **_without(params, "nested_rate")
+    )
+    phases: dict = {}
+    _timed(phases, "fix_nested_file", fix_nested_file, chart, workdir / "fixed.svg")
+    return 1, phases
+
+
+CASES = {
+    "extract": bench_extract,
+    "make_translation_ready": bench_make_translation_ready,
+    "work_on_switches": bench_work_on_switches,
+    "inject": bench_inject,
+    "start_injects": bench_start_injects,
+    "fix_nested_file": bench_fix_nested_file,
+}
+
+
+def _without(params: dict, key: str) -> dict:
+    return {k: v for k, v in params.items() if k != key}
+
+
+def peak_rss_mb() -> float | None:
+    """Return the peak resident set size of this process in MiB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_case(case: str, size: str, repeat: int) -> dict:
+    """Run one benchmark case ``repeat`` times and summarize it."""
+    params = SIZES[size]
+    runs = []
+    ops = 0
+    workdir = Path(tempfile.mkdtemp(prefix=f"bench-{case}-"))
+    try:
+        for _ in range(repeat):
+            ops, phases = CASES[case](workdir, dict(params))
+            runs.append(phases)
+        file_bytes = sum(
+            p.stat().st_size for p in workdir.glob("*.svg")
+            if p.name not in ("out.svg", "fixed.svg")
+        )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    totals = [sum(phases.values()) for phases in runs]
+    best = min(totals)
+    return {
+        "case": case,
+        "size": size,
+        "params": params,
+        "input_bytes": file_bytes,
+        "repeat": repeat,
+        "ops_per_run": ops,
+        "ops_per_sec": round(ops / best, 3) if best else None,
+        "seconds": {"best": round(best, 6), "mean": round(sum(totals) / len(totals), 6)},
+        "phases": {name: round(min(phases[name] for phases in runs), 6) for name in runs[0]},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def environment() -> dict:
+    """Describe the interpreter and library versions the results were measured with."""
+    try:
+        version = metadata.version("CopySVGTranslation")
+    except metadata.PackageNotFoundError:
+        version = None
+    return {
+        "package_version": version,
+        "python": platform.python_version(),
+        "lxml": ".".join(map(str, etree.LXML_VERSION)),
+        "libxml2": ".".join(map(str, etree.LIBXML_VERSION)),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def run_suite(cases: list[str], sizes: list[str], repeat: int = 3, isolate: bool = True) -> dict:
+    """Run every case at every size and return the JSON-ready report."""
+    results = []
+    for size in sizes:
+        for case in cases:
+            if isolate:
+                # A fresh process per case keeps the peak RSS figures independent
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                    result = pool.submit(run_case, case, size, repeat).result()
+            else:
+                result = run_case(case, size, repeat)
+            print(
+                f"{size:<7} {case:<24} {result['ops_per_sec']:>10} ops/s  "
+                f"{result['peak_rss_mb']} MB",
+                file=sys.stderr,
+            )
+            results.append(result)
+    return {"environment": environment(), "results": results}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="write the JSON report here instead of stdout")
+    parser.add_argument("--no-isolate", action="store_true", help="run every case in this process")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.cases, args.sizes, repeat=args.repeat, isolate=not args.no_isolate)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
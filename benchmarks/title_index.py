@@ -0,0 +1,49 @@
+"""
+Resolve year titles for 5k switches against 10k title bases, with and without
+a prebuilt index.
+
+python benchmarks/title_index.py
+"""
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from CopySVGTranslation import get_titles_translations, make_title_index  # noqa: E402
+
+TITLES = 10_000
+SWITCHES = 5_000
+
+all_mappings_title = {
+    f"Indicator {i} by Country": {"ar": f"المؤشر {i}", "fr": f"Indicateur {i}"}
+    for i in range(TITLES)
+}
+switch_texts = [
+    [f"indicator {i * 2 % TITLES} by country {1990 + i % 30}", "world"]
+    for i in range(SWITCHES)
+]
+
+start = time.perf_counter()
+scanned = [get_titles_translations(all_mappings_title, texts) for texts in switch_texts]
+scan_elapsed = time.perf_counter() - start
+
+start = time.perf_counter()
+title_index = make_title_index(all_mappings_title)
+build_elapsed = time.perf_counter() - start
+start = time.perf_counter()
+indexed = [
+    get_titles_translations(all_mappings_title, texts, title_index=title_index)
+    for texts in switch_texts
+]
+lookup_elapsed = time.perf_counter() - start
+
+assert indexed == scanned
+
+print(f"titles: {TITLES:,}  switches: {SWITCHES:,}")
+print(f"per-switch normalization: {scan_elapsed * 1000:10.1f} ms")
+print(f"index build (once):       {build_elapsed * 1000:10.1f} ms")
+print(f"indexed lookups:          {lookup_elapsed * 1000:10.1f} ms")
+print(f"speed-up:                 {scan_elapsed / (build_elapsed + lookup_elapsed):10.1f}x")
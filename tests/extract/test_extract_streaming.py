@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pytest
+
+from CopySVGTranslation import extract, extract_streaming
+
+TESTS_DIR = Path(__file__).resolve().parents[1]
+
+SOURCES = [
+    TESTS_DIR / "example" / "source.svg",
+    TESTS_DIR / "fixtures" / "source.svg",
+]
+
+SVG_NESTED_SWITCHES = (
+    '<?xml version="1.0"?>\n'
+    '<svg xmlns="http://www.w3.org/2000/svg">\n'
+    "  <switch>\n"
+    '    <text id="a-fr" systemLanguage="fr"><tspan id="a-fr">Externe 2020</tspan></text>\n'
+    '    <text id="a"><tspan id="a">Outer 2020</tspan></text>\n'
+    '    <g><switch>\n'
+    '      <text id="b-fr" systemLanguage="fr"><tspan id="b-fr">Interne</tspan></text>\n'
+    '      <text id="b"><tspan id="b">Inner</tspan></text>\n'
+    "    </switch></g>\n"
+    "  </switch>\n"
+    '  <switch><text id="c">Plain</text></switch>\n'
+    "</svg>\n"
+)
+
+
+def assert_same_result(expected, result):
+    assert result == expected
+    # Key order is part of the result: later steps iterate these dicts
+    for section in ("new", "title", "tspans_by_id"):
+        assert list(result[section]) == list(expected[section])
+
+
+@pytest.mark.parametrize("source", SOURCES, ids=lambda p: f"{p.parent.name}/{p.name}")
+@pytest.mark.parametrize("case_insensitive", [True, False])
+def test_streaming_extract_matches_extract(source, case_insensitive):
+    assert_same_result(
+        extract(source, case_insensitive), extract_streaming(source, case_insensitive)
+    )
+
+
+def test_streaming_extract_nested_switches_in_document_order(tmp_path):
+    source = tmp_path / "nested.svg"
+    source.write_text(SVG_NESTED_SWITCHES, encoding="utf-8")
+
+    result = extract_streaming(source)
+
+    assert_same_result(extract(source), result)
+    assert list(result["new"]) == ["outer 2020", "inner", "plain"]
+    assert result["new"]["inner"] == {"fr": "Interne"}
+
+
+def test_streaming_extract_invalid_and_missing(tmp_path):
+    bad = tmp_path / "bad.svg"
+    bad.write_text('<svg xmlns="http://www.w3.org/2000/svg"><switch>', encoding="utf-8")
+
+    assert extract_streaming(bad) is None
+    assert extract_streaming(tmp_path / "missing.svg") is None
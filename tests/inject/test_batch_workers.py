@@ -0,0 +1,71 @@
+from pathlib import Path
+
+from CopySVGTranslation import start_injects
+
+SVG_HELLO = (
+    '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">'
+    '<switch><text id="t"><tspan id="ts">Hello</tspan></text></switch></svg>'
+)
+SVG_OTHER = (
+    '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">'
+    '<switch><text id="t"><tspan id="ts">Other</tspan></text></switch></svg>'
+)
+SVG_NESTED = (
+    '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">'
+    '<switch><text id="t"><tspan id="a">A <tspan id="b">B</tspan></tspan></text></switch></svg>'
+)
+
+TRANSLATIONS = {"new": {"hello": {"ar": "مرحبا", "fr": "Bonjour"}}}
+
+
+def make_corpus(tmp_path: Path) -> list[Path]:
+    files = []
+    for i in range(6):
+        path = tmp_path / f"hello{i}.svg"
+        path.write_text(SVG_HELLO, encoding="utf-8")
+        files.append(path)
+    for name, content in (("other.svg", SVG_OTHER), ("nested.svg", SVG_NESTED)):
+        path = tmp_path / name
+        path.write_text(content, encoding="utf-8")
+        files.append(path)
+    files.append(tmp_path / "missing.svg")
+    return files
+
+
+def test_parallel_report_matches_serial(tmp_path):
+    files = make_corpus(tmp_path)
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+    serial_dir.mkdir()
+    parallel_dir.mkdir()
+
+    serial = start_injects(files, TRANSLATIONS, serial_dir)
+    parallel = start_injects(files, TRANSLATIONS, parallel_dir, workers=2)
+
+    assert serial["success"] == parallel["success"] == 6
+    assert serial["no_changes"] == parallel["no_changes"] == 1
+    assert serial["nested_files"] == parallel["nested_files"] == 1
+    assert serial["failed"] == parallel["failed"] == 1
+    assert serial["nested_files_list"] == parallel["nested_files_list"]
+    assert list(serial["files"]) == list(parallel["files"])
+
+    for name, stats in serial["files"].items():
+        parallel_stats = dict(parallel["files"][name])
+        serial_stats = dict(stats)
+        # Output paths differ only by directory
+        parallel_path = Path(parallel_stats.pop("file_path") or "x")
+        serial_path = Path(serial_stats.pop("file_path") or "x")
+        assert parallel_path.name == serial_path.name
+        assert parallel_stats == serial_stats
+
+
+def test_parallel_workers_write_outputs(tmp_path):
+    files = make_corpus(tmp_path)
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+
+    start_injects(files, TRANSLATIONS, out_dir, workers=3)
+
+    written = sorted(p.name for p in out_dir.iterdir())
+    assert written == [f"hello{i}.svg" for i in range(6)]
+    assert "Bonjour" in (out_dir / "hello0.svg").read_text(encoding="utf-8")
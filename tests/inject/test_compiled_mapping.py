@@ -0,0 +1,108 @@
+import pickle
+
+from lxml import etree
+
+from CopySVGTranslation import CompiledMapping, compile_mapping, extract, inject, start_injects
+from CopySVGTranslation.injection import work_on_switches
+
+SVG = (
+    '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">'
+    '<switch><text id="t1"><tspan id="ts1">Hello</tspan></text></switch>'
+    '<switch><text id="t2"><tspan id="ts2">Population 2021</tspan></text></switch>'
+    "</svg>"
+)
+
+MAPPINGS = {
+    "new": {
+        "hello": {"ar": "مرحبا", "fr": "Bonjour"},
+        "population 2020": {"ar": "السكان 2020", "fr": "Population 2020"},
+    },
+    "title": {"Population": {"ar": "السكان", "fr": "Population"}},
+}
+
+
+def test_compiled_mapping_lookups():
+    mapping = CompiledMapping(MAPPINGS)
+
+    assert len(mapping) == 2
+    assert "hello" in mapping
+    assert mapping.get(mapping.key("HELLO")) == {"ar": "مرحبا", "fr": "Bonjour"}
+    assert mapping.languages("hello") == frozenset({"ar", "fr"})
+    assert mapping.get("missing") is None
+    assert mapping.languages("missing") == frozenset()
+    assert mapping.title_translations(["population 1999", "hello"]) == {
+        "population 1999": {"ar": "السكان 1999", "fr": "Population 1999"}
+    }
+
+
+def test_compiled_mapping_case_folding():
+    flat = {"Hello": {"fr": "Salut"}, "hello": {"fr": "Bonjour"}, "World": {"fr": "Monde"}}
+
+    folded = CompiledMapping(flat)
+    assert folded.get("hello") == {"fr": "Bonjour"}
+    assert folded.get("world") == {"fr": "Monde"}
+
+    exact = CompiledMapping(flat, case_insensitive=False)
+    assert exact.get("Hello") == {"fr": "Salut"}
+    assert exact.get("world") is None
+
+
+def test_compile_mapping_reuses_compiled_instances():
+    mapping = compile_mapping(MAPPINGS)
+
+    assert compile_mapping(mapping) is mapping
+    recompiled = compile_mapping(mapping, case_insensitive=False)
+    assert recompiled is not mapping
+    assert recompiled.case_insensitive is False
+
+
+def test_compiled_mapping_matches_plain_mapping(tmp_path):
+    source = tmp_path / "chart.svg"
+    source.write_text(SVG, encoding="utf-8")
+
+    _, plain_stats = inject(
+        source, all_mappings=MAPPINGS, output_file=tmp_path / "plain.svg",
+        save_result=True, return_stats=True,
+    )
+    _, compiled_stats = inject(
+        source, all_mappings=CompiledMapping(MAPPINGS), output_file=tmp_path / "compiled.svg",
+        save_result=True, return_stats=True,
+    )
+
+    assert compiled_stats == plain_stats
+    assert plain_stats["inserted_translations"] == 4
+    assert (tmp_path / "compiled.svg").read_bytes() == (tmp_path / "plain.svg").read_bytes()
+    assert "السكان 2021" in (tmp_path / "compiled.svg").read_text(encoding="utf-8")
+
+
+def test_compiled_mapping_from_extract_in_work_on_switches(tmp_path):
+    source = tmp_path / "source.svg"
+    source.write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg"><switch>'
+        '<text id="a-fr" systemLanguage="fr"><tspan id="a-fr">Bonjour</tspan></text>'
+        '<text id="a"><tspan id="a">Hello</tspan></text></switch></svg>',
+        encoding="utf-8",
+    )
+    mapping = CompiledMapping(extract(source))
+    root = etree.fromstring(SVG.encode("utf-8"))
+
+    stats = work_on_switches(root, {"t1", "ts1", "t2", "ts2"}, mapping)
+
+    assert stats["inserted_translations"] == 1
+    assert root.xpath("//*[@systemLanguage='fr']/*")[0].text == "Bonjour"
+
+
+def test_compiled_mapping_in_parallel_batch(tmp_path):
+    files = []
+    for i in range(3):
+        path = tmp_path / f"chart{i}.svg"
+        path.write_text(SVG, encoding="utf-8")
+        files.append(path)
+    mapping = pickle.loads(pickle.dumps(CompiledMapping(MAPPINGS)))
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+
+    report = start_injects(files, mapping, out_dir, workers=2)
+
+    assert report["success"] == 3
+    assert all(stats["inserted_translations"] == 4 for stats in report["files"].values())
@@ -0,0 +1,59 @@
+import random
+
+from CopySVGTranslation import generate_unique_id, make_translation_ready
+from CopySVGTranslation.injection import IdRegistry, work_on_switches
+
+
+def test_unique_matches_generate_unique_id():
+    rng = random.Random(7)
+    ids = {f"base-ar-{n}" for n in rng.sample(range(1, 40), 25)} | {"base-ar", "other-fr"}
+    registry = IdRegistry(set(ids))
+    for _ in range(30):
+        for base, lang in (("base", "ar"), ("other", "fr"), ("new", "de")):
+            expected = generate_unique_id(base, lang, ids)
+            ids.add(expected)
+            assert registry.unique(f"{base}-{lang}") == expected
+    assert set(registry) == ids
+
+
+def test_unique_searches_again_after_discard():
+    registry = IdRegistry({"a", "a-1", "a-2"})
+    assert registry.unique("a") == "a-3"
+    registry.discard("a-1")
+    assert registry.unique("a") == "a-1"
+    assert registry.unique("a", first_suffix=2) == "a-4"
+
+
+def test_next_trsvg_skips_taken_ids_and_never_goes_back():
+    registry = IdRegistry({"trsvg3", "trsvg4"}, trsvg_start=2)
+    assert registry.next_trsvg() == "trsvg5"
+    registry.raise_trsvg(1)
+    assert registry.next_trsvg() == "trsvg6"
+    registry.raise_trsvg(10)
+    assert registry.next_trsvg() == "trsvg11"
+    assert {"trsvg5", "trsvg6", "trsvg11"} <= set(registry)
+
+
+def test_plain_set_is_used_as_backing_store():
+    ids = {"t1"}
+    registry = IdRegistry(ids)
+    registry.unique("t1")
+    assert ids == {"t1", "t1-1"}
+
+
+def test_make_translation_ready_returns_registry_for_work_on_switches(tmp_path):
+    svg = tmp_path / "chart.svg"
+    svg.write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg">'
+        '<switch><text id="t1"><tspan id="ts1">Hello</tspan></text></switch>'
+        '<text>World</text><rect id="t1-ar"/></svg>',
+        encoding="utf-8",
+    )
+    _tree, root, ids = make_translation_ready(svg, return_ids=True)
+    assert isinstance(ids, IdRegistry)
+    assert set(ids) == set(root.xpath("//@id"))
+
+    mappings = {"new": {"hello": {"ar": "مرحبا"}, "world": {"ar": "عالم"}}}
+    work_on_switches(root, ids, mappings)
+    assert root.xpath("//@id[. = 't1-ar-1']")
+    assert set(ids) == set(root.xpath("//@id"))
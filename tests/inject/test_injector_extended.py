@@ -136,6 +136,39 @@ class TestWorkOnSwitches(unittest.TestCase):
 
         self.assertEqual(stats['updated_translations'], 1)
 
+    def test_work_on_switches_overwrite_many_languages(self):
+        """Every existing language is updated line by line and missing ones are inserted."""
+        langs = [f"x{i:03d}" for i in range(50)]
+        existing = "".join(
+            f'<text id="t-{lang}" systemLanguage="{lang}">'
+            '<tspan>old</tspan><tspan>old</tspan></text>'
+            for lang in langs[:40]
+        )
+        root = etree.fromstring(
+            '<svg xmlns="http://www.w3.org/2000/svg"><switch>'
+            f'{existing}<text id="t"><tspan>Hello</tspan><tspan>World</tspan></text>'
+            '</switch></svg>'
+        )
+        mappings = {"new": {
+            "hello": {lang: f"hello-{lang}" for lang in langs},
+            "world": {lang: f"world-{lang}" for lang in langs[::2]},
+        }}
+
+        stats = work_on_switches(root, {"t"}, mappings, overwrite=True)
+
+        self.assertEqual(stats['updated_translations'], 40)
+        self.assertEqual(stats['inserted_translations'], 10)
+        ns = {"svg": "http://www.w3.org/2000/svg"}
+        for lang in (langs[0], langs[1], langs[45]):
+            lines = root.xpath(
+                f'//svg:text[@systemLanguage="{lang}"]/svg:tspan/text()', namespaces=ns
+            )
+            if lang in langs[::2]:
+                second = f"world-{lang}"
+            else:
+                second = "old" if lang in langs[:40] else "World"
+            self.assertEqual(lines, [f"hello-{lang}", second])
+
     def test_work_on_switches_case_sensitive(self):
         """Test switch processing with case-sensitive matching."""
         svg_content = '''<svg xmlns="http://www.w3.org/2000/svg">
@@ -0,0 +1,90 @@
+from pathlib import Path
+
+from CopySVGTranslation import iter_injects, start_injects
+
+SVG_HELLO = (
+    '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">'
+    '<switch><text id="t"><tspan id="ts">Hello</tspan></text></switch></svg>'
+)
+SVG_OTHER = SVG_HELLO.replace("Hello", "Other")
+SVG_NESTED = (
+    '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">'
+    '<switch><text id="t"><tspan id="a">A <tspan id="b">B</tspan></tspan></text></switch></svg>'
+)
+
+TRANSLATIONS = {"new": {"hello": {"ar": "مرحبا", "fr": "Bonjour"}}}
+
+
+def make_corpus(tmp_path: Path, count: int = 5) -> list[Path]:
+    files = []
+    for i in range(count):
+        path = tmp_path / f"hello{i}.svg"
+        path.write_text(SVG_HELLO, encoding="utf-8")
+        files.append(path)
+    for name, content in (("other.svg", SVG_OTHER), ("nested.svg", SVG_NESTED)):
+        path = tmp_path / name
+        path.write_text(content, encoding="utf-8")
+        files.append(path)
+    files.append(tmp_path / "missing.svg")
+    return files
+
+
+def test_records_follow_the_files_and_match_the_report(tmp_path):
+    files = make_corpus(tmp_path)
+    out = tmp_path / "out"
+    out.mkdir()
+
+    records = list(iter_injects(files, TRANSLATIONS, out))
+    report = start_injects(files, TRANSLATIONS, out)
+
+    assert [record["path"] for record in records] == [str(file) for file in files]
+    statuses = [record["status"] for record in records]
+    assert statuses == ["success"] * 5 + ["no_changes", "nested", "failed"]
+    assert records[0]["output_path"] == str(out / "hello0.svg")
+    assert records[5]["output_path"] is None
+    assert all(record["seconds"] >= 0 for record in records)
+    for record in records:
+        if record["status"] != "nested":
+            assert report["files"][record["name"]] == record["stats"]
+
+
+def test_parallel_records_match_serial(tmp_path):
+    files = make_corpus(tmp_path, count=20)
+    out = tmp_path / "out"
+    out.mkdir()
+
+    def strip(records):
+        return [
+            {key: value for key, value in record.items() if key != "seconds"}
+            for record in records
+        ]
+
+    serial = strip(iter_injects(files, TRANSLATIONS, out))
+    parallel = strip(iter_injects(files, TRANSLATIONS, out, workers=2))
+    assert parallel == serial
+
+
+def test_closing_early_stops_the_batch(tmp_path):
+    files = make_corpus(tmp_path)
+    out = tmp_path / "out"
+    out.mkdir()
+
+    records = iter_injects(files, TRANSLATIONS, out)
+    first = next(records)
+    records.close()
+
+    assert first["name"] == "hello0.svg"
+    assert [path.name for path in out.iterdir()] == ["hello0.svg"]
+
+
+def test_cached_files_come_first(tmp_path):
+    files = make_corpus(tmp_path)
+    out = tmp_path / "out"
+    out.mkdir()
+    manifest = tmp_path / "manifest.sqlite"
+
+    list(iter_injects(files, TRANSLATIONS, out, manifest=manifest))
+    records = list(iter_injects(files, TRANSLATIONS, out, manifest=manifest))
+
+    assert [record["status"] for record in records] == ["cached"] * 7 + ["failed"]
+    assert records[0]["stats"]["cached"] is True
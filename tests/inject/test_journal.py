@@ -0,0 +1,151 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from CopySVGTranslation import start_injects
+from CopySVGTranslation.injection import BatchJournal, batch
+
+SVG_HELLO = (
+    '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">'
+    '<switch><text id="t"><tspan id="ts">Hello</tspan></text></switch></svg>'
+)
+SVG_OTHER = SVG_HELLO.replace("Hello", "Other")
+SVG_NESTED = (
+    '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">'
+    '<switch><text id="t"><tspan id="a">A <tspan id="b">B</tspan></tspan></text></switch></svg>'
+)
+
+TRANSLATIONS = {"new": {"hello": {"ar": "مرحبا", "fr": "Bonjour"}}}
+
+
+def make_corpus(tmp_path: Path) -> tuple[list[Path], Path]:
+    files = []
+    for i in range(5):
+        path = tmp_path / f"hello{i}.svg"
+        path.write_text(SVG_HELLO, encoding="utf-8")
+        files.append(path)
+    for name, content in (("other.svg", SVG_OTHER), ("nested.svg", SVG_NESTED)):
+        path = tmp_path / name
+        path.write_text(content, encoding="utf-8")
+        files.append(path)
+    files.append(tmp_path / "missing.svg")
+    out = tmp_path / "out"
+    out.mkdir()
+    return files, out
+
+
+def comparable(report: dict, journal: Path) -> dict:
+    """Return ``report`` with the stats kept in ``journal``, as the in-memory report has them."""
+    data = {key: value for key, value in report.items() if key not in ("journal", "resumed")}
+    assert "files" not in data
+    data["files"] = dict(BatchJournal(journal).iter_file_stats())
+    return data
+
+
+def test_journal_report_matches_in_memory_report(tmp_path):
+    files, out = make_corpus(tmp_path)
+    journal = tmp_path / "run.jsonl"
+
+    plain = start_injects(files, TRANSLATIONS, out)
+    journaled = start_injects(files, TRANSLATIONS, out, journal=journal)
+
+    assert journaled["journal"] == str(journal)
+    assert comparable(journaled, journal) == plain
+    lines = journal.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == len(files)
+    statuses = {json.loads(line)["status"] for line in lines}
+    assert statuses == {"success", "no_changes", "nested", "failed"}
+
+
+def test_resume_after_crash_skips_journaled_files(tmp_path, monkeypatch):
+    files, out = make_corpus(tmp_path)
+    journal = tmp_path / "run.jsonl"
+    expected = start_injects(files, TRANSLATIONS, out)
+
+    calls = []
+    inject_one = batch._inject_one
+
+    def crash_after_three(file, *args, **kwargs):
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        calls.append(Path(file).name)
+        return inject_one(file, *args, **kwargs)
+
+    monkeypatch.setattr(batch, "_inject_one", crash_after_three)
+    with pytest.raises(KeyboardInterrupt):
+        start_injects(files, TRANSLATIONS, out, journal=journal)
+    # A line cut short by the crash is dropped on resume
+    with open(journal, "ab") as f:
+        f.write(b'{"file": "/half')
+
+    calls.clear()
+    monkeypatch.setattr(batch, "_inject_one", inject_one)
+    resumed = start_injects(files, TRANSLATIONS, out, journal=journal, resume=True)
+
+    assert resumed["resumed"] == 3
+    assert comparable(resumed, journal) == expected
+    assert len(journal.read_text(encoding="utf-8").splitlines()) == len(files)
+
+    again = start_injects(files, TRANSLATIONS, out, journal=journal, resume=True)
+    assert again["resumed"] == len(files)
+    assert comparable(again, journal) == expected
+
+
+def test_journal_report_keeps_only_counters(tmp_path):
+    files, out = make_corpus(tmp_path)
+    journal = tmp_path / "run.jsonl"
+
+    report = start_injects(files, TRANSLATIONS, out, journal=journal)
+    journal.unlink()
+
+    assert "files" not in report
+    assert json.loads(json.dumps(report)) == report
+
+
+def test_files_from_journal_reads_stats_on_lookup(tmp_path):
+    files, out = make_corpus(tmp_path)
+    journal = tmp_path / "run.jsonl"
+
+    plain = start_injects(files, TRANSLATIONS, out)
+    report = start_injects(files, TRANSLATIONS, out, journal=journal, files_from_journal=True)
+
+    assert not isinstance(report["files"], dict)
+    assert dict(report["files"]) == plain["files"]
+
+
+def test_resume_needs_a_journal(tmp_path):
+    with pytest.raises(ValueError):
+        start_injects([], TRANSLATIONS, tmp_path, resume=True)
+    with pytest.raises(ValueError):
+        start_injects([], TRANSLATIONS, tmp_path, files_from_journal=True)
+
+
+def test_resume_drops_a_last_line_without_newline(tmp_path):
+    files, out = make_corpus(tmp_path)
+    journal = tmp_path / "run.jsonl"
+    expected = start_injects(files, TRANSLATIONS, out)
+
+    start_injects(files[:3], TRANSLATIONS, out, journal=journal)
+    # The process died after writing the last entry but before its newline
+    journal.write_bytes(journal.read_bytes()[:-1])
+
+    resumed = start_injects(files, TRANSLATIONS, out, journal=journal, resume=True)
+    assert resumed["resumed"] == 2
+    lines = journal.read_bytes().splitlines(keepends=True)
+    assert len(lines) == len(files)
+    assert all(line.endswith(b"\n") for line in lines)
+
+    again = start_injects(files, TRANSLATIONS, out, journal=journal, resume=True)
+    assert again["resumed"] == len(files)
+    assert comparable(again, journal) == expected
+
+
+def test_journal_syncs_every_entry(tmp_path, monkeypatch):
+    files, out = make_corpus(tmp_path)
+    synced = []
+    monkeypatch.setattr("CopySVGTranslation.injection.journal.os.fsync", synced.append)
+
+    start_injects(files, TRANSLATIONS, out, journal=tmp_path / "run.jsonl")
+
+    assert len(synced) == len(files)
@@ -0,0 +1,78 @@
+import sqlite3
+
+from CopySVGTranslation import start_injects
+
+SVG_HELLO = (
+    '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">'
+    '<switch><text id="t"><tspan id="ts">Hello</tspan></text></switch></svg>'
+)
+SVG_OTHER = (
+    '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">'
+    '<switch><text id="t"><tspan id="ts">Other</tspan></text></switch></svg>'
+)
+
+TRANSLATIONS = {"new": {"hello": {"ar": "مرحبا", "fr": "Bonjour"}}}
+
+
+def make_corpus(tmp_path):
+    files = []
+    for i in range(3):
+        path = tmp_path / f"hello{i}.svg"
+        path.write_text(SVG_HELLO, encoding="utf-8")
+        files.append(path)
+    path = tmp_path / "other.svg"
+    path.write_text(SVG_OTHER, encoding="utf-8")
+    files.append(path)
+    files.append(tmp_path / "missing.svg")
+    out = tmp_path / "out"
+    out.mkdir()
+    return files, out
+
+
+def test_second_run_skips_unchanged_files(tmp_path):
+    files, out = make_corpus(tmp_path)
+    manifest = tmp_path / "manifest.sqlite"
+
+    first = start_injects(files, TRANSLATIONS, out, manifest=manifest)
+    assert first["cached"] == 0
+    assert (first["success"], first["no_changes"], first["failed"]) == (3, 1, 1)
+
+    second = start_injects(files, TRANSLATIONS, out, manifest=manifest)
+    # The missing file failed and is tried again
+    assert second["cached"] == 4
+    assert (second["success"], second["no_changes"], second["failed"]) == (0, 0, 1)
+    assert second["files"]["hello0.svg"]["cached"] is True
+    assert second["files"]["hello0.svg"]["inserted_translations"] == 2
+
+    with sqlite3.connect(str(manifest)) as db:
+        assert db.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 4
+
+
+def test_changed_input_mapping_or_output_is_processed_again(tmp_path):
+    files, out = make_corpus(tmp_path)
+    files = files[:4]
+    manifest = tmp_path / "manifest.sqlite"
+    start_injects(files, TRANSLATIONS, out, manifest=manifest)
+
+    files[0].write_text(SVG_HELLO.replace("Hello", "Hello "), encoding="utf-8")
+    (out / "hello1.svg").unlink()
+    report = start_injects(files, TRANSLATIONS, out, manifest=manifest)
+    assert report["cached"] == 2
+    assert report["success"] == 2
+    assert (out / "hello1.svg").exists()
+
+    changed = {"new": {"hello": {"ar": "مرحبا", "fr": "Salut"}}}
+    assert start_injects(files, changed, out, manifest=manifest)["cached"] == 0
+    assert start_injects(files, changed, out, overwrite=True, manifest=manifest)["cached"] == 0
+    assert start_injects(files, changed, out, overwrite=True, manifest=manifest)["cached"] == 4
+
+
+def test_manifest_works_with_workers(tmp_path):
+    files, out = make_corpus(tmp_path)
+    manifest = tmp_path / "manifest.sqlite"
+
+    first = start_injects(files, TRANSLATIONS, out, workers=2, manifest=manifest)
+    second = start_injects(files, TRANSLATIONS, out, workers=2, manifest=manifest)
+    assert first["success"] == 3
+    assert second["cached"] == 4
+    assert set(second["files"]) == set(first["files"])
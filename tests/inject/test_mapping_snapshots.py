@@ -0,0 +1,93 @@
+import copy
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from CopySVGTranslation import CompiledMapping, inject, start_injects
+
+SVG_TEMPLATE = (
+    '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">'
+    '<switch><text id="t1"><tspan id="ts1">Population {year}</tspan></text></switch>'
+    '<switch><text id="t2"><tspan id="ts2">Hello</tspan></text></switch>'
+    "</svg>"
+)
+
+MAPPINGS = {
+    "new": {
+        "hello": {"ar": "مرحبا", "fr": "Bonjour"},
+    },
+    "title": {"Population": {"ar": "السكان", "fr": "Population"}},
+}
+
+
+def make_files(tmp_path, years=range(2000, 2012)):
+    files = []
+    for year in years:
+        path = tmp_path / f"population-{year}.svg"
+        path.write_text(SVG_TEMPLATE.format(year=year), encoding="utf-8")
+        files.append(path)
+    return files
+
+
+def test_inject_leaves_plain_mapping_untouched(tmp_path):
+    mappings = copy.deepcopy(MAPPINGS)
+
+    for path in make_files(tmp_path, years=(2001, 2002)):
+        tree, stats = inject(path, all_mappings=mappings, return_stats=True)
+        assert stats["inserted_translations"] == 4
+
+    assert mappings == MAPPINGS
+
+
+def test_compiled_mapping_is_read_only():
+    mapping = CompiledMapping(MAPPINGS)
+
+    with pytest.raises(AttributeError):
+        mapping.case_insensitive = False
+    with pytest.raises(TypeError):
+        mapping.get("hello")["de"] = "Hallo"
+    with pytest.raises(TypeError):
+        mapping.source["new"]["hello"] = {}
+
+
+def test_compiled_mapping_is_a_snapshot():
+    mappings = copy.deepcopy(MAPPINGS)
+    mapping = CompiledMapping(mappings)
+
+    mappings["new"]["hello"]["de"] = "Hallo"
+    mappings["new"]["world"] = {"fr": "Monde"}
+
+    assert "de" not in mapping.get("hello")
+    assert mapping.get("world") is None
+
+
+def test_threads_share_one_mapping(tmp_path):
+    files = make_files(tmp_path)
+    mapping = CompiledMapping(MAPPINGS)
+
+    def run(path):
+        tree, stats = inject(path, all_mappings=mapping, return_stats=True)
+        return stats, tree.getroot().xpath("string(//*[@systemLanguage='ar'][1])")
+
+    serial = [run(path) for path in files]
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        threaded = list(pool.map(run, files))
+
+    assert threaded == serial
+    assert serial[0][0]["inserted_translations"] == 4
+    assert serial[0][1] == "السكان 2000"
+
+
+def test_batch_results_do_not_depend_on_file_order(tmp_path):
+    files = make_files(tmp_path)
+    forward_dir = tmp_path / "forward"
+    backward_dir = tmp_path / "backward"
+    forward_dir.mkdir()
+    backward_dir.mkdir()
+
+    forward = start_injects(files, MAPPINGS, forward_dir)
+    backward = start_injects(list(reversed(files)), MAPPINGS, backward_dir)
+
+    assert forward["success"] == backward["success"] == len(files)
+    for path in files:
+        assert (forward_dir / path.name).read_bytes() == (backward_dir / path.name).read_bytes()
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+
+from CopySVGTranslation import extract, inject, plan_injection, plan_injections
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg">'
+    '<switch><text id="t1-ar" systemLanguage="ar"><tspan>Old</tspan></text>'
+    '<text id="t1"><tspan id="ts1">Hello</tspan></text></switch>'
+    '<text id="t2">Unknown label</text>'
+    '<switch><text id="t3"><tspan>Population 2020</tspan></text></switch>'
+    "</svg>"
+)
+
+MAPPINGS = {
+    "new": {"hello": {"ar": "مرحبا", "fr": "Bonjour"}},
+    "title": {"Population": {"ar": "السكان"}},
+}
+
+
+@pytest.fixture
+def chart(tmp_path):
+    path = tmp_path / "chart.svg"
+    path.write_text(SVG, encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("overwrite", [False, True])
+def test_plan_matches_inject_and_leaves_file_alone(chart, overwrite):
+    before = chart.read_bytes()
+    plan = plan_injection(chart, all_mappings=MAPPINGS, overwrite=overwrite)
+    assert chart.read_bytes() == before
+
+    _, stats = inject(chart, all_mappings=MAPPINGS, overwrite=overwrite, return_stats=True)
+    assert plan["stats"] == stats
+    assert plan["changes"] is True
+    assert plan["missing_keys"] == ["unknown label"]
+    assert plan["switches"] == [
+        {
+            "switch": 0,
+            "keys": ["hello"],
+            "insert": ["fr"],
+            "update": ["ar"] if overwrite else [],
+            "skipped": int(not overwrite),
+        },
+        {"switch": 2, "keys": ["population 2020"], "insert": ["ar"], "update": [], "skipped": 0},
+    ]
+
+
+def test_plan_of_fixture_matches_inject():
+    mappings = extract(FIXTURES_DIR / "source.svg")
+    target = FIXTURES_DIR / "target.svg"
+    _, stats = inject(target, all_mappings=mappings, return_stats=True)
+    assert plan_injection(target, all_mappings=mappings)["stats"] == stats
+
+
+def test_plan_reports_errors_like_inject(tmp_path):
+    nested = tmp_path / "nested.svg"
+    nested.write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg">'
+        '<text><tspan>a<tspan>b</tspan></tspan></text></svg>',
+        encoding="utf-8",
+    )
+    assert plan_injection(nested, all_mappings=MAPPINGS)["nested_tspan_error"] is True
+    missing = plan_injection(tmp_path / "missing.svg", all_mappings=MAPPINGS)
+    assert missing == {"error": "File does not exist"}
+
+
+def test_plan_injections_aggregates_the_corpus(chart, tmp_path):
+    unchanged = tmp_path / "done.svg"
+    unchanged.write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg"><switch>'
+        '<text systemLanguage="ar">مرحبا</text><text systemLanguage="fr">Bonjour</text>'
+        "<text>Hello</text>"
+        "</switch></svg>",
+        encoding="utf-8",
+    )
+    report = plan_injections([chart, unchanged, tmp_path / "missing.svg"], MAPPINGS)
+
+    assert (report["changed"], report["unchanged"], report["failed"]) == (1, 1, 1)
+    assert report["inserted_translations"] == 2
+    assert report["missing_keys"] == {"unknown label": 1}
+    assert set(report["files"]) == {"chart.svg", "done.svg", "missing.svg"}
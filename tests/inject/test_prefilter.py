@@ -0,0 +1,77 @@
+import pytest
+
+from CopySVGTranslation import compile_mapping, start_injects
+from CopySVGTranslation.injection.prefilter import compile_needles, prefilter_file
+
+MAPPINGS = {
+    "new": {"hello world": {"ar": "مرحبا بالعالم"}, "a > b": {"ar": "أ > ب"}},
+    "title": {"Population": {"ar": "السكان"}},
+}
+
+SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg"><switch>'
+    '<text id="t1"><tspan id="ts1">{}</tspan></text></switch></svg>'
+)
+
+
+@pytest.fixture
+def needles():
+    return compile_needles(compile_mapping(MAPPINGS))
+
+
+@pytest.mark.parametrize(
+    "body, expected",
+    [
+        ("Something else", "skipped"),
+        ("HELLO   World", "matched"),
+        ("a > b", "matched"),
+        ("Population2020", "matched"),
+        ("population 1999", "matched"),
+        ("Hello &amp; world", "unsupported"),
+        ("<![CDATA[Hello world]]>", "unsupported"),
+    ],
+)
+def test_prefilter_file(tmp_path, needles, body, expected):
+    path = tmp_path / "chart.svg"
+    path.write_text(SVG.format(body), encoding="utf-8")
+    assert prefilter_file(path, needles) == expected
+
+
+def test_prefilter_file_rejects_other_encodings(tmp_path, needles):
+    path = tmp_path / "latin.svg"
+    declaration = b'<?xml version="1.0" encoding="ISO-8859-1"?>'
+    path.write_bytes(declaration + SVG.format("Caf\xe9").encode("latin-1"))
+    assert prefilter_file(path, needles) == "unsupported"
+    assert prefilter_file(tmp_path / "missing.svg", needles) == "unsupported"
+
+
+def test_empty_key_disables_prefilter():
+    assert compile_needles(compile_mapping({"new": {"": {"ar": "x"}}})) is None
+    assert compile_needles(compile_mapping({"new": {}})) is None
+
+
+def test_start_injects_reports_prefilter(tmp_path):
+    files = []
+    bodies = (
+        ("hit.svg", "Hello world"),
+        ("miss.svg", "Nothing here"),
+        ("entity.svg", "Tom &amp; Jerry"),
+    )
+    for name, body in bodies:
+        path = tmp_path / name
+        path.write_text(SVG.format(body), encoding="utf-8")
+        files.append(path)
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    filtered = start_injects(files, MAPPINGS, output_dir, prefilter=True)
+    plain = start_injects(files, MAPPINGS, output_dir)
+
+    assert filtered["prefilter"] == {"skipped": 1, "matched": 1, "unsupported": 1}
+    assert "prefilter" not in plain
+    assert filtered["files"]["miss.svg"]["prefilter"] == "skipped"
+    assert {name: stats.get("new_languages") for name, stats in filtered["files"].items()} == {
+        name: stats.get("new_languages") for name, stats in plain["files"].items()
+    }
+    counts = (filtered["success"], filtered["no_changes"])
+    assert counts == (plain["success"], plain["no_changes"]) == (1, 2)
@@ -0,0 +1,107 @@
+import sqlite3
+from pathlib import Path
+
+from lxml import etree
+
+from CopySVGTranslation import start_injects, start_reinjects
+from CopySVGTranslation.injection import InjectManifest, diff_mappings
+
+
+def chart(*texts: str) -> str:
+    switches = "".join(
+        f'<switch><text id="t{i}"><tspan id="ts{i}">{text}</tspan></text></switch>'
+        for i, text in enumerate(texts)
+    )
+    return f'<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">{switches}</svg>'
+
+
+CHARTS = {
+    "hello.svg": chart("Hello", "Other"),
+    "world.svg": chart("Other", "World"),
+    "title.svg": chart("Population 2020"),
+    "plain.svg": chart("Nothing here"),
+}
+
+OLD = {
+    "new": {"hello": {"fr": "Bonjour"}, "world": {"fr": "Monde"}},
+    "title": {"Population": {"fr": "Population"}},
+}
+
+
+def make_corpus(tmp_path: Path) -> tuple[list[Path], Path]:
+    files = []
+    for name, content in CHARTS.items():
+        path = tmp_path / name
+        path.write_text(content, encoding="utf-8")
+        files.append(path)
+    out = tmp_path / "out"
+    out.mkdir()
+    return files, out
+
+
+def french(path: Path) -> list[str]:
+    root = etree.parse(str(path)).getroot()
+    texts = root.xpath('//*[@systemLanguage="fr"]//text()')
+    return [text.strip() for text in texts if text.strip()]
+
+
+def test_diff_mappings_reports_added_removed_and_changed_keys():
+    new = {
+        "new": {"Hello": {"fr": "Salut"}, "world": {"fr": "Monde"}, "extra": {"de": "Extra"}},
+        "title": {},
+    }
+    assert diff_mappings(OLD, new) == {"new": {"hello", "extra"}, "title": {"population"}}
+    assert diff_mappings(OLD, OLD) == {"new": set(), "title": set()}
+
+
+def test_batch_run_indexes_default_texts(tmp_path):
+    files, out = make_corpus(tmp_path)
+    manifest = tmp_path / "manifest.sqlite"
+    start_injects(files, OLD, out, manifest=manifest)
+
+    with InjectManifest(manifest) as db:
+        assert db.files_with_keys(["other"]) == {
+            str(files[0].resolve()): [1],
+            str(files[1].resolve()): [0],
+        }
+        assert db.files_with_keys([], ["population"]) == {str(files[2].resolve()): [0]}
+        # Texts without a translation are indexed as well
+        assert list(db.files_with_keys(["nothing here"])) == [str(files[3].resolve())]
+
+
+def test_reinject_touches_only_affected_files(tmp_path):
+    files, out = make_corpus(tmp_path)
+    manifest = tmp_path / "manifest.sqlite"
+    start_injects(files, OLD, out, overwrite=True, manifest=manifest)
+    world_mtime = (out / "world.svg").stat().st_mtime_ns
+
+    new = {**OLD, "new": {**OLD["new"], "hello": {"fr": "Salut"}}}
+    report = start_reinjects(OLD, new, out, manifest, overwrite=True)
+
+    assert report["changed_keys"] == ["hello"]
+    assert (report["affected"], report["unaffected"]) == (1, 3)
+    assert report["success"] == 1
+    assert french(out / "hello.svg") == ["Salut"]
+    assert (out / "world.svg").stat().st_mtime_ns == world_mtime
+
+    # The unaffected files are now recorded as up to date with the new mapping
+    full = start_injects(files, new, out, overwrite=True, manifest=manifest)
+    assert full["cached"] == 4
+
+
+def test_reinject_includes_files_the_index_cannot_vouch_for(tmp_path):
+    files, out = make_corpus(tmp_path)
+    manifest = tmp_path / "manifest.sqlite"
+    start_injects(files, OLD, out, manifest=manifest)
+
+    files[1].write_text(chart("Hello"), encoding="utf-8")
+    new = {**OLD, "title": {"Population": {"fr": "Habitants"}}}
+    report = start_reinjects(OLD, new, out, manifest)
+
+    assert report["affected"] == 2
+    assert sorted(report["files"]) == ["title.svg", "world.svg"]
+    assert french(out / "world.svg") == ["Bonjour"]
+
+    with sqlite3.connect(str(manifest)) as db:
+        hashes = {row[0] for row in db.execute("SELECT DISTINCT mapping_hash FROM files")}
+    assert len(hashes) == 1
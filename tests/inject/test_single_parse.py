@@ -0,0 +1,74 @@
+import textwrap
+from pathlib import Path
+
+from lxml import etree
+
+from CopySVGTranslation.injection.injector import inject
+from CopySVGTranslation.injection.utils import file_langs
+
+
+def write_svg(tmp_path: Path, content: str) -> Path:
+    svg_path = tmp_path / "sample.svg"
+    svg_path.write_text(textwrap.dedent(content), encoding="utf-8")
+    return svg_path
+
+
+def count_parses(monkeypatch) -> list:
+    calls = []
+    original_parse = etree.parse
+
+    def counting_parse(*args, **kwargs):
+        calls.append(args[0] if args else None)
+        return original_parse(*args, **kwargs)
+
+    monkeypatch.setattr(etree, "parse", counting_parse)
+    return calls
+
+
+SVG = """
+<svg xmlns=\"http://www.w3.org/2000/svg\">
+    <switch>
+        <text id=\"t1\"><tspan id=\"t1s\">Hello</tspan></text>
+        <text id=\"t1-ar\" systemLanguage=\"ar\"><tspan>مرحبا</tspan></text>
+    </switch>
+</svg>
+"""
+
+
+def test_inject_parses_input_once(tmp_path, monkeypatch):
+    svg_path = write_svg(tmp_path, SVG)
+    calls = count_parses(monkeypatch)
+
+    tree, stats = inject(
+        svg_path,
+        all_mappings={"new": {"hello": {"ar": "مرحبا", "fr": "Bonjour"}}},
+        save_result=False,
+        return_stats=True,
+    )
+
+    assert tree is not None
+    assert len(calls) == 1
+    assert stats["new_languages_list"] == ["fr"]
+
+
+def test_inject_with_save_result_parses_once(tmp_path, monkeypatch):
+    svg_path = write_svg(tmp_path, SVG)
+    output_file = tmp_path / "out" / "sample.svg"
+    calls = count_parses(monkeypatch)
+
+    tree, stats = inject(
+        svg_path,
+        all_mappings={"new": {"hello": {"fr": "Bonjour", "de": "Hallo"}}},
+        output_file=output_file,
+        save_result=True,
+        return_stats=True,
+    )
+
+    assert tree is not None
+    assert len(calls) == 1
+    monkeypatch.undo()
+
+    # The in-memory language set matches what a fresh parse of the output reports
+    assert file_langs(output_file) == {"ar", "de", "fr"}
+    assert stats["all_languages"] == 3
+    assert stats["new_languages_list"] == ["de", "fr"]
@@ -0,0 +1,51 @@
+from CopySVGTranslation import inject
+
+SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg"><switch>'
+    '<text id="t1-ar" systemLanguage="ar"><tspan id="ts1-ar">مرحبا</tspan></text>'
+    '<text id="t1"><tspan id="ts1">Hello</tspan></text>'
+    '</switch></svg>'
+)
+
+
+def write_chart(tmp_path):
+    path = tmp_path / "chart.svg"
+    path.write_text(SVG, encoding="utf-8")
+    return path
+
+
+def test_skip_unchanged_returns_full_run_stats_without_writing(tmp_path):
+    chart = write_chart(tmp_path)
+    mappings = {"new": {"hello": {"ar": "مرحبا"}}}
+
+    full_out = tmp_path / "full.svg"
+    _, full = inject(
+        chart, all_mappings=mappings, output_file=full_out, save_result=True, return_stats=True
+    )
+    skipped_out = tmp_path / "skipped.svg"
+    tree, skipped = inject(
+        chart, all_mappings=mappings, output_file=skipped_out, save_result=True,
+        return_stats=True, skip_unchanged=True,
+    )
+
+    assert skipped == full
+    assert skipped["skipped_translations"] == 1 and skipped["inserted_translations"] == 0
+    assert full_out.exists() and not skipped_out.exists()
+    # The switch was neither renamed nor re-sorted
+    assert tree.getroot()[0].tag == "{http://www.w3.org/2000/svg}switch"
+
+
+def test_skip_unchanged_still_applies_inserts_and_updates(tmp_path):
+    chart = write_chart(tmp_path)
+    mappings = {"new": {"hello": {"ar": "أهلا", "fr": "Bonjour"}}}
+
+    for overwrite in (False, True):
+        _, full = inject(chart, all_mappings=mappings, return_stats=True, overwrite=overwrite)
+        tree, skipped = inject(
+            chart, all_mappings=mappings, return_stats=True, overwrite=overwrite,
+            skip_unchanged=True,
+        )
+        assert skipped == full
+        assert skipped["inserted_translations"] == 1
+        assert skipped["updated_translations"] == int(overwrite)
+        assert tree.getroot()[0].tag == "switch"
@@ -0,0 +1,130 @@
+from pathlib import Path
+
+import pytest
+
+from CopySVGTranslation import inject, inject_streaming
+
+TESTS_DIR = Path(__file__).resolve().parents[1]
+
+FIXTURES = [
+    TESTS_DIR / "fixtures" / "target.svg",
+    TESTS_DIR / "example" / "before_translate.svg",
+    TESTS_DIR / "preparation" / "before_translate.svg",
+]
+
+MAPPINGS = [
+    TESTS_DIR / "example" / "data.json",
+]
+
+TRANSLATIONS = {
+    "new": {
+        "hello": {"ar": "مرحبا", "fr": "Bonjour"},
+        "population 2020": {"ar": "السكان 2020", "fr": "Population 2020"},
+    }
+}
+
+SVG_MIXED = (
+    '<?xml version="1.0"?>\n'
+    '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">\n'
+    "  <!-- header -->\n"
+    '  <g id="g1">\n'
+    '    <switch><text id="t1" x="1" y="2" systemLanguage="fr">'
+    '<tspan id="ts1-fr">Salut</tspan></text>'
+    '<text id="t1"><tspan id="ts1">Hello</tspan></text></switch>\n'
+    '    <a xlink:href="#t1"><text id="t2" xml:space="preserve">Hello</text></a>\n'
+    "  </g>\n"
+    '  <desc>a &amp; "b"</desc>\n'
+    "</svg>\n"
+)
+
+# The second "a" is copied to "a-fr" before the first one gets its inserted French copy
+SVG_COLLIDING_IDS = (
+    '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">'
+    '<switch><text id="a">Hello</text></switch>'
+    '<switch><text id="a" systemLanguage="de,fr">Hallo</text><text id="b">Other</text></switch>'
+    "</svg>"
+)
+
+SVG_NESTED = (
+    '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">'
+    '<switch><text id="t"><tspan id="a">A <tspan id="b">B</tspan></tspan></text></switch></svg>'
+)
+
+
+def run_both(tmp_path: Path, source: Path, **kwargs):
+    tree_out = tmp_path / "tree" / source.name
+    stream_out = tmp_path / "stream" / source.name
+    tree_out.parent.mkdir(exist_ok=True)
+    stream_out.parent.mkdir(exist_ok=True)
+
+    _, tree_stats = inject(
+        source, output_file=tree_out, save_result=True, return_stats=True, **kwargs
+    )
+    stream_stats = inject_streaming(source, output_file=stream_out, **kwargs)
+    return tree_out, tree_stats, stream_out, stream_stats
+
+
+@pytest.mark.parametrize("source", FIXTURES, ids=lambda p: f"{p.parent.name}/{p.name}")
+@pytest.mark.parametrize("overwrite", [False, True])
+def test_streaming_matches_tree_output(tmp_path, source, overwrite):
+    tree_out, tree_stats, stream_out, stream_stats = run_both(
+        tmp_path, source, all_mappings=TRANSLATIONS, overwrite=overwrite
+    )
+
+    assert stream_out.read_bytes() == tree_out.read_bytes()
+    assert stream_stats == tree_stats
+
+
+def test_streaming_loads_mapping_files(tmp_path):
+    source = TESTS_DIR / "example" / "before_translate.svg"
+    tree_out, tree_stats, stream_out, stream_stats = run_both(
+        tmp_path, source, mapping_files=MAPPINGS
+    )
+
+    assert stream_stats["inserted_translations"] > 0
+    assert stream_out.read_bytes() == tree_out.read_bytes()
+    assert stream_stats == tree_stats
+
+
+def test_streaming_matches_tree_ids_when_copies_collide(tmp_path):
+    source = tmp_path / "colliding.svg"
+    source.write_text(SVG_COLLIDING_IDS, encoding="utf-8")
+
+    tree_out, tree_stats, stream_out, stream_stats = run_both(
+        tmp_path, source, all_mappings={"new": {"hello": {"fr": "Bonjour"}}}
+    )
+
+    assert b'id="a-fr-1"' in tree_out.read_bytes()
+    assert stream_out.read_bytes() == tree_out.read_bytes()
+    assert stream_stats == tree_stats
+
+
+@pytest.mark.parametrize("pretty_print", [False, True])
+def test_streaming_keeps_comments_namespaces_and_entities(tmp_path, pretty_print):
+    source = tmp_path / "mixed.svg"
+    source.write_text(SVG_MIXED, encoding="utf-8")
+
+    tree_out, tree_stats, stream_out, stream_stats = run_both(
+        tmp_path, source, all_mappings=TRANSLATIONS, pretty_print=pretty_print
+    )
+
+    assert stream_out.read_bytes() == tree_out.read_bytes()
+    assert stream_stats == tree_stats
+    assert stream_stats["inserted_translations"] == 3
+
+
+def test_streaming_reports_nested_tspans(tmp_path):
+    source = tmp_path / "nested.svg"
+    source.write_text(SVG_NESTED, encoding="utf-8")
+
+    stats = inject_streaming(source, all_mappings=TRANSLATIONS, output_dir=tmp_path / "out")
+
+    assert stats.get("nested_tspan_error") is True
+    assert not (tmp_path / "out" / "nested.svg").exists()
+
+
+def test_streaming_missing_file(tmp_path):
+    stats = inject_streaming(
+        tmp_path / "missing.svg", all_mappings=TRANSLATIONS, output_dir=tmp_path
+    )
+    assert stats == {"error": "File does not exist"}
@@ -0,0 +1,83 @@
+import time
+
+from CopySVGTranslation import inject, start_injects
+from CopySVGTranslation.injection import PhaseTimer
+from CopySVGTranslation.injection.timing import NULL_TIMER, TimingSummary
+
+SVG = (
+    '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">'
+    '<switch><text id="t"><tspan id="ts">Hello</tspan></text></switch></svg>'
+)
+TRANSLATIONS = {"new": {"hello": {"ar": "مرحبا", "fr": "Bonjour"}}}
+
+
+def test_nested_phases_are_charged_exclusively():
+    timer = PhaseTimer()
+    with timer.phase("outer"):
+        time.sleep(0.02)
+        with timer.phase("inner"):
+            time.sleep(0.05)
+
+    phases = timer.as_dict()["phases"]
+    assert phases["inner"]["wall"] >= 0.05
+    # The outer phase is not charged the 50 ms spent in the inner one
+    assert 0.02 <= phases["outer"]["wall"] < phases["inner"]["wall"]
+
+
+def test_inject_records_phases_only_when_asked(tmp_path):
+    chart = tmp_path / "chart.svg"
+    chart.write_text(SVG, encoding="utf-8")
+
+    _, plain = inject(chart, all_mappings=TRANSLATIONS, return_stats=True)
+    assert "timings" not in plain
+
+    output = tmp_path / "out.svg"
+    _, stats = inject(
+        chart, all_mappings=TRANSLATIONS, return_stats=True, save_result=True,
+        output_file=output, timer=PhaseTimer(),
+    )
+    timings = stats.pop("timings")
+    assert stats == plain
+    assert set(timings["phases"]) == {
+        "parse", "prepare", "file_langs", "plan", "apply", "rewrite", "serialize"
+    }
+    assert all(spent["wall"] >= 0 and spent["cpu"] >= 0 for spent in timings["phases"].values())
+    assert timings["nodes"] == 4
+    assert timings["output_bytes"] == output.stat().st_size
+
+
+def test_null_timer_is_a_no_op():
+    with NULL_TIMER.phase("parse"):
+        pass
+    NULL_TIMER.count("nodes", 3)
+    assert not NULL_TIMER.enabled
+
+
+def test_summary_percentiles():
+    summary = TimingSummary()
+    for value in range(1, 101):
+        summary.add({"phases": {"parse": {"wall": value, "cpu": value / 2}}, "nodes": value})
+
+    result = summary.as_dict()
+    assert result["files"] == 100
+    assert result["phases"]["parse"]["wall"] == {"p50": 50, "p95": 95, "max": 100}
+    assert result["phases"]["parse"]["cpu"]["max"] == 50
+    assert result["nodes"] == {"p50": 50, "p95": 95, "max": 100}
+
+
+def test_batch_report_aggregates_timings(tmp_path):
+    files = []
+    for i in range(4):
+        path = tmp_path / f"chart{i}.svg"
+        path.write_text(SVG, encoding="utf-8")
+        files.append(path)
+    out = tmp_path / "out"
+    out.mkdir()
+
+    assert "timings" not in start_injects(files, TRANSLATIONS, out)
+    report = start_injects(files, TRANSLATIONS, out, timings=True, workers=2)
+
+    assert report["timings"]["files"] == 4
+    assert report["timings"]["phases"]["serialize"]["wall"]["max"] >= 0
+    assert report["timings"]["nodes"]["p50"] == 4
+    assert report["files"]["chart0.svg"]["timings"]["output_bytes"] > 0
@@ -0,0 +1,64 @@
+import json
+import os
+
+from CopySVGTranslation import inject, start_injects
+from CopySVGTranslation.injection import PhaseTimer, write_trace
+
+SVG = (
+    '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">'
+    '<switch><text id="t"><tspan id="ts">Hello</tspan></text></switch></svg>'
+)
+TRANSLATIONS = {"new": {"hello": {"ar": "مرحبا", "fr": "Bonjour"}}}
+
+
+def make_corpus(tmp_path, count=6):
+    files = []
+    for i in range(count):
+        path = tmp_path / f"chart{i}.svg"
+        path.write_text(SVG, encoding="utf-8")
+        files.append(path)
+    out = tmp_path / "out"
+    out.mkdir()
+    return files, out
+
+
+def test_inject_phases_as_trace_events(tmp_path):
+    files, _ = make_corpus(tmp_path, count=1)
+    timer = PhaseTimer(trace=True)
+    inject(files[0], all_mappings=TRANSLATIONS, return_stats=True, timer=timer)
+
+    path = write_trace(tmp_path / "inject.json", timer.events)
+    events = json.loads(path.read_text(encoding="utf-8"))
+    spans = [event for event in events if event["ph"] == "X"]
+
+    names = [event["name"] for event in spans]
+    assert names == ["parse", "prepare", "file_langs", "plan", "apply", "rewrite"]
+    assert all(event["pid"] == os.getpid() and event["dur"] >= 0 for event in spans)
+    parse, prepare = spans[0], spans[1]
+    # Nested phases lie within their parent on the timeline
+    assert prepare["ts"] <= parse["ts"]
+    assert parse["ts"] + parse["dur"] <= prepare["ts"] + prepare["dur"] + 1
+
+
+def test_batch_trace_merges_worker_events(tmp_path):
+    files, out = make_corpus(tmp_path)
+    trace = tmp_path / "trace.json"
+
+    plain = start_injects(files, TRANSLATIONS, out, workers=2)
+    report = start_injects(files, TRANSLATIONS, out, workers=2, trace=trace)
+
+    assert report.pop("trace") == str(trace)
+    assert report == plain
+    events = json.loads(trace.read_text(encoding="utf-8"))
+    file_spans = [event for event in events if event.get("cat") == "file"]
+    assert sorted(event["name"] for event in file_spans) == sorted(file.name for file in files)
+    assert all(event["args"]["status"] == "success" for event in file_spans)
+    phases = {event["name"] for event in events if event.get("cat") == "phase"}
+    assert phases >= {"parse", "serialize"}
+
+    batch_span = next(event for event in events if event.get("cat") == "batch")
+    assert batch_span["pid"] == os.getpid()
+    worker_pids = {event["pid"] for event in file_spans}
+    assert os.getpid() not in worker_pids
+    named = {event["pid"]: event["args"]["name"] for event in events if event["ph"] == "M"}
+    assert set(named) == worker_pids | {os.getpid()}
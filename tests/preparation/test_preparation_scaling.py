@@ -0,0 +1,63 @@
+"""
+
+pytest tests/preparation/test_preparation_scaling.py
+
+"""
+
+from CopySVGTranslation.injection import preparation
+from CopySVGTranslation.injection.ids import IdRegistry
+
+
+def write_flat_document(path, texts):
+    """Bare <text> siblings under one <g>: each needs a new switch and a trsvg id."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg"><g>')
+        for i in range(texts):
+            f.write(f'<text x="1">Label {i}<tspan>part</tspan> tail</text>')
+        f.write("</g></svg>")
+    return path
+
+
+class CountingSet(set):
+    """A set that counts membership checks and the ids walked by iteration."""
+
+    probes = 0
+
+    def __contains__(self, item):
+        CountingSet.probes += 1
+        return super().__contains__(item)
+
+    def __iter__(self):
+        for item in super().__iter__():
+            CountingSet.probes += 1
+            yield item
+
+
+class CountingRegistry(IdRegistry):
+    __slots__ = ()
+
+    def __init__(self, ids=None, trsvg_start=0):
+        super().__init__(ids, trsvg_start)
+        self._ids = CountingSet(self._ids)
+
+
+def id_probes(path):
+    CountingSet.probes = 0
+    tree, root = preparation.make_translation_ready(path)
+    return CountingSet.probes, root
+
+
+def test_make_translation_ready_scales_linearly(tmp_path, monkeypatch):
+    monkeypatch.setattr(preparation, "IdRegistry", CountingRegistry)
+
+    small_probes, _ = id_probes(write_flat_document(tmp_path / "small.svg", 2_000))
+    large_probes, root = id_probes(write_flat_document(tmp_path / "large.svg", 20_000))
+
+    # 20k text nodes, each split into three tspans and wrapped in a switch
+    assert len(root[0]) == 20_000
+    assert root[0][-1][0].get("id") == "trsvg80000"
+
+    # Ten times the input must cost about ten times as many id lookups; rescanning
+    # the ids for every new one would cost ~100x
+    assert small_probes > 0
+    assert large_probes <= small_probes * 11
@@ -0,0 +1,51 @@
+"""Smoke tests keeping the benchmark suite and its generator in working order."""
+
+import json
+
+from benchmarks.generator import generate_mapping, generate_svg
+from benchmarks.suite import CASES, SIZES, main, run_case
+from CopySVGTranslation import extract, inject, match_nested_tags
+
+
+def test_generator_is_deterministic(tmp_path):
+    params = {"switches": 10, "lines": 2, "languages": 3, "target_bytes": 20_000}
+    first = generate_svg(tmp_path / "a.svg", **params)
+    second = generate_svg(tmp_path / "b.svg", **params)
+
+    assert first.read_bytes() == second.read_bytes()
+    assert first.stat().st_size >= 20_000
+
+
+def test_generated_chart_round_trip(tmp_path):
+    chart = generate_svg(tmp_path / "chart.svg", switches=10, lines=2, languages=2)
+    source = generate_svg(tmp_path / "source.svg", switches=10, lines=2, languages=4)
+
+    assert len(extract(source)["new"]) == 20
+
+    tree, stats = inject(chart, all_mappings=generate_mapping(10, 2, 4), return_stats=True)
+    assert stats["processed_switches"] == 10
+    assert stats["inserted_translations"] == 20
+    assert stats["new_languages_list"] == ["de", "es"]
+
+
+def test_generator_nested_rate(tmp_path):
+    chart = generate_svg(tmp_path / "nested.svg", switches=20, nested_rate=1.0)
+    assert len(match_nested_tags(chart)) == 20
+
+
+def test_run_case_reports_every_case(tmp_path, monkeypatch):
+    monkeypatch.setitem(SIZES, "tiny", {"switches": 5, "lines": 1, "languages": 1})
+
+    for case in CASES:
+        result = run_case(case, "tiny", repeat=1)
+        assert result["ops_per_sec"] > 0
+        assert result["phases"]
+
+    output = tmp_path / "results.json"
+    main([
+        "--cases", "inject", "--sizes", "tiny", "--repeat", "1",
+        "--no-isolate", "--output", str(output),
+    ])
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["results"][0]["case"] == "inject"
+    assert "python" in report["environment"]
@@ -0,0 +1,239 @@
+"""Tests for the translation daemon and its HTTP front end."""
+
+import http.client
+import json
+import os
+import socket
+import threading
+from pathlib import Path
+
+import pytest
+
+from CopySVGTranslation import extract, inject, plan_injection
+from CopySVGTranslation.daemon import TranslationDaemon
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+TARGET = FIXTURES_DIR / "target.svg"
+
+
+@pytest.fixture
+def translations():
+    return extract(FIXTURES_DIR / "source.svg")
+
+
+@pytest.fixture
+def mapping_file(tmp_path, translations):
+    path = tmp_path / "mapping.json"
+    path.write_text(json.dumps(translations), encoding="utf-8")
+    return path
+
+
+def rewrite(path, data):
+    """Write ``data`` to ``path`` and move its mtime forward, as a later edit would."""
+    stat = path.stat()
+    path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def expected_injection(tmp_path, translations):
+    _, stats = inject(
+        TARGET,
+        all_mappings=translations,
+        output_dir=tmp_path / "expected",
+        save_result=True,
+        return_stats=True,
+    )
+    return stats, (tmp_path / "expected" / TARGET.name).read_text(encoding="utf-8")
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__("localhost")
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.unix_path)
+
+
+def request(connection, method, path, body=None):
+    connection.request(method, path, body=body)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_inject_job_returns_document_and_stats(tmp_path, mapping_file, translations):
+    with TranslationDaemon([mapping_file]) as daemon:
+        code, payload = daemon.run("inject", TARGET.read_bytes())
+
+    stats, svg = expected_injection(tmp_path, translations)
+    assert code == 200
+    assert payload["stats"] == stats
+    assert payload["svg"] == svg
+
+
+def test_extract_and_plan_jobs(mapping_file, translations):
+    with TranslationDaemon([mapping_file]) as daemon:
+        extract_code, extracted = daemon.run("extract", (FIXTURES_DIR / "source.svg").read_bytes())
+        plan_code, planned = daemon.run("plan", TARGET.read_bytes())
+        bad_code, bad = daemon.run("inject", b"<svg")
+        unknown_code, _ = daemon.run("delete", b"")
+        jobs = daemon.health()["jobs"]
+
+    assert (extract_code, extracted["translations"]) == (200, translations)
+    assert plan_code == 200
+    assert planned["plan"]["stats"] == plan_injection(TARGET, all_mappings=translations)["stats"]
+    assert bad_code == 422 and bad["error"]
+    assert unknown_code == 404
+    assert jobs["inject"]["calls"] == 1 and jobs["inject"]["errors"] == 1
+
+
+def test_daemon_needs_a_mapping(tmp_path):
+    with pytest.raises(ValueError):
+        TranslationDaemon([tmp_path / "missing.json"])
+
+
+def test_mappings_reload_when_files_change(mapping_file):
+    with TranslationDaemon([mapping_file]) as daemon:
+        assert daemon.check_mappings() is False
+
+        rewrite(mapping_file, {"new": {"population 2020": {"fr": "Population reloaded"}}})
+        assert daemon.check_mappings() is True
+        _, payload = daemon.run("inject", TARGET.read_bytes())
+        assert "Population reloaded" in payload["svg"]
+
+        # A broken file keeps the loaded mappings
+        stat = mapping_file.stat()
+        mapping_file.write_text("{", encoding="utf-8")
+        os.utime(mapping_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert daemon.check_mappings() is False
+        _, payload = daemon.run("inject", TARGET.read_bytes())
+        assert "Population reloaded" in payload["svg"]
+        assert daemon.health()["reloads"] == 1
+
+
+def test_worker_pool_matches_threads(tmp_path, mapping_file, translations):
+    with TranslationDaemon([mapping_file], workers=2) as daemon:
+        results = [None] * 4
+
+        def run(index):
+            results[index] = daemon.run("inject", TARGET.read_bytes())
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        rewrite(mapping_file, {"new": {"population 2020": {"fr": "Population reloaded"}}})
+        assert daemon.check_mappings() is True
+        _, reloaded = daemon.run("inject", TARGET.read_bytes())
+
+    stats, svg = expected_injection(tmp_path, translations)
+    assert all(result == (200, {"stats": stats, "svg": svg}) for result in results)
+    assert "Population reloaded" in reloaded["svg"]
+
+
+def test_http_over_unix_socket(tmp_path, mapping_file, translations):
+    socket_path = tmp_path / "daemon.sock"
+    with TranslationDaemon([mapping_file]) as daemon:
+        server = daemon.make_server(socket_path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            connection = UnixHTTPConnection(str(socket_path))
+            health_code, health = request(connection, "GET", "/health")
+            code, payload = request(connection, "POST", "/inject", TARGET.read_bytes())
+            missing_code, _ = request(connection, "GET", "/nothing")
+            connection.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    stats, svg = expected_injection(tmp_path, translations)
+    assert (health_code, health["status"]) == (200, "ok")
+    assert (code, payload) == (200, {"stats": stats, "svg": svg})
+    assert missing_code == 404
+
+
+def test_http_over_localhost(mapping_file):
+    with TranslationDaemon([mapping_file], max_upload=10) as daemon:
+        server = daemon.make_server(port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+            code, payload = request(connection, "POST", "/inject", TARGET.read_bytes())
+            connection.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    assert code == 413
+    assert "larger" in payload["error"]
+
+
+def test_http_without_content_length_closes_the_connection(mapping_file):
+    with TranslationDaemon([mapping_file]) as daemon:
+        server = daemon.make_server(port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            address = ("127.0.0.1", server.server_address[1])
+            with socket.create_connection(address, timeout=5) as sock:
+                sock.sendall(
+                    b"POST /inject HTTP/1.1\r\nHost: localhost\r\n"
+                    b"Transfer-Encoding: chunked\r\n\r\n"
+                    b"9\r\nGET /x HT\r\n0\r\n\r\n"
+                )
+                received = b""
+                while chunk := sock.recv(65536):
+                    received += chunk
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    # One 411 response, then the server closes instead of reading the body as a request
+    head, _, body = received.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 411")
+    assert json.loads(body) == {"error": "Content-Length required"}
+
+
+def test_connections_share_a_fixed_thread_pool(mapping_file):
+    with TranslationDaemon([mapping_file], threads=1) as daemon:
+        server = daemon.make_server(port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            first = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+            assert request(first, "GET", "/health")[0] == 200
+            with socket.create_connection(("127.0.0.1", server.server_address[1])) as sock:
+                sock.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\n\r\n")
+                # The only thread still serves the first, kept-alive connection
+                sock.settimeout(0.5)
+                with pytest.raises(TimeoutError):
+                    sock.recv(65536)
+                first.close()
+                sock.settimeout(5)
+                received = sock.recv(65536)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    assert received.startswith(b"HTTP/1.1 200")
+
+
+def test_make_server_replaces_only_stale_sockets(tmp_path, mapping_file):
+    socket_path = tmp_path / "daemon.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(socket_path))
+    stale.close()
+
+    with TranslationDaemon([mapping_file]) as daemon:
+        server = daemon.make_server(socket_path)
+        try:
+            with pytest.raises(OSError, match="already listening"):
+                daemon.make_server(socket_path)
+            assert socket_path.is_socket()
+        finally:
+            server.server_close()
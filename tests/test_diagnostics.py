@@ -0,0 +1,51 @@
+"""Tests for the lazy debug diagnostics channel."""
+
+import logging
+
+from CopySVGTranslation import extract
+from CopySVGTranslation.diagnostics import debug, debug_enabled
+
+
+class Exploding:
+    def __repr__(self):
+        raise AssertionError("rendered while DEBUG is off")
+
+
+def test_nothing_is_rendered_when_debug_is_off(caplog):
+    caplog.set_level(logging.INFO, logger="CopySVGTranslation")
+
+    assert not debug_enabled()
+    debug("Never shown", value=Exploding())
+    assert caplog.records == []
+
+
+def test_records_carry_event_and_fields(caplog):
+    caplog.set_level(logging.DEBUG, logger="CopySVGTranslation")
+
+    debug("No mapping", key="hello", count=2)
+    debug("Plain event")
+
+    first, second = caplog.records
+    assert first.getMessage() == "No mapping: key='hello', count=2"
+    assert first.event == "No mapping"
+    assert first.fields == {"key": "hello", "count": 2}
+    assert first.funcName == "test_records_carry_event_and_fields"
+    assert second.getMessage() == "Plain event"
+
+
+def test_extract_logs_structured_events(caplog, tmp_path):
+    svg = tmp_path / "source.svg"
+    svg.write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg"><switch>'
+        '<text systemLanguage="fr"><tspan id="a-fr">Bonjour</tspan></text>'
+        '<text><tspan id="a">Hello</tspan></text>'
+        '</switch></svg>',
+        encoding="utf-8",
+    )
+    caplog.set_level(logging.DEBUG, logger="CopySVGTranslation")
+
+    extract(svg)
+
+    events = {record.event: record.fields for record in caplog.records if hasattr(record, "event")}
+    assert events["Default texts"]["new_keys"] == ["hello"]
+    assert events["Translation"] == {"base_id": "a", "english_text": "Hello"}
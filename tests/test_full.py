@@ -7,7 +7,7 @@ from pathlib import Path
 
 import pytest
 
-from CopySVGTranslation import extract, svg_extract_and_inject, inject
+from CopySVGTranslation import extract, svg_extract_and_inject, svg_extract_and_inject_many, inject
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
@@ -483,3 +483,106 @@ def test_inject_multiple_operations(tmp_path: Path, target_svg: Path) -> None:
 
     # Both should have inserted the same number of translations
     assert stats1["inserted_translations"] == stats2["inserted_translations"]
+
+
+def test_svg_extract_and_inject_does_not_reload_json(
+    tmp_path: Path, target_svg: Path, monkeypatch
+) -> None:
+    """The extracted translations should reach the injector without a JSON round-trip."""
+    import CopySVGTranslation.injection.injector as injector
+
+    def fail_load(*args, **kwargs):
+        raise AssertionError("mapping JSON should not be reloaded")
+
+    monkeypatch.setattr(injector, "load_all_mappings", fail_load)
+
+    data_output = tmp_path / "translations.json"
+    tree = svg_extract_and_inject(
+        FIXTURES_DIR / "source.svg",
+        target_svg,
+        output_file=tmp_path / "translated.svg",
+        data_output_file=data_output,
+    )
+
+    assert tree is not None
+    saved = json.loads(data_output.read_text(encoding="utf-8"))
+    assert saved == extract(FIXTURES_DIR / "source.svg")
+
+
+def test_svg_extract_and_inject_without_saving_data(tmp_path: Path, target_svg: Path) -> None:
+    """save_data=False should skip the JSON side output entirely."""
+    data_output = tmp_path / "translations.json"
+    output_svg = tmp_path / "translated.svg"
+
+    tree = svg_extract_and_inject(
+        FIXTURES_DIR / "source.svg",
+        target_svg,
+        output_file=output_svg,
+        data_output_file=data_output,
+        save_result=True,
+        save_data=False,
+    )
+
+    assert tree is not None
+    assert output_svg.exists()
+    assert not data_output.exists()
+
+
+def test_svg_extract_and_inject_many_extracts_once(tmp_path: Path, monkeypatch) -> None:
+    """The fan-out workflow should extract once and report every target."""
+    import CopySVGTranslation.workflows as workflows
+
+    calls = []
+    original_extract = workflows.extract
+
+    def counting_extract(*args, **kwargs):
+        calls.append(args)
+        return original_extract(*args, **kwargs)
+
+    monkeypatch.setattr(workflows, "extract", counting_extract)
+
+    targets = []
+    for name in ("a.svg", "b.svg", "c.svg"):
+        target = tmp_path / name
+        target.write_bytes((FIXTURES_DIR / "target.svg").read_bytes())
+        targets.append(target)
+
+    output_dir = tmp_path / "translated"
+    report = svg_extract_and_inject_many(
+        FIXTURES_DIR / "source.svg", targets, output_dir=output_dir
+    )
+
+    assert len(calls) == 1
+    assert report["success"] == 3
+    assert report["failed"] == 0
+    assert set(report["files"]) == {"a.svg", "b.svg", "c.svg"}
+
+    translations = extract(FIXTURES_DIR / "source.svg")
+    _, expected = inject(targets[0], all_mappings=translations, return_stats=True)
+    assert report["files"]["a.svg"]["inserted_translations"] == expected["inserted_translations"]
+    assert (output_dir / "a.svg").read_bytes() == (output_dir / "b.svg").read_bytes()
+
+
+def test_svg_extract_and_inject_many_forwards_batch_options(
+    tmp_path: Path, target_svg: Path
+) -> None:
+    """Options not named by the workflow are passed on to start_injects."""
+    journal = tmp_path / "run.jsonl"
+    report = svg_extract_and_inject_many(
+        FIXTURES_DIR / "source.svg",
+        [target_svg],
+        output_dir=tmp_path / "translated",
+        journal=journal,
+        timings=True,
+    )
+
+    assert report["journal"] == str(journal)
+    assert report["timings"]["files"] == 1
+
+
+def test_svg_extract_and_inject_many_nonexistent_source(tmp_path: Path, target_svg: Path) -> None:
+    """The fan-out workflow should return None when nothing can be extracted."""
+    result = svg_extract_and_inject_many(
+        tmp_path / "missing.svg", [target_svg], output_dir=tmp_path
+    )
+    assert result is None
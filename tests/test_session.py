@@ -0,0 +1,139 @@
+"""Tests for the reusable TranslationSession."""
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from CopySVGTranslation import TranslationSession, extract, inject, plan_injection, start_injects
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def translations():
+    return extract(FIXTURES_DIR / "source.svg")
+
+
+def test_session_inject_matches_inject(tmp_path, translations):
+    session = TranslationSession(translations, output_dir=tmp_path / "session")
+
+    tree, stats = session.inject(FIXTURES_DIR / "target.svg", save_result=True)
+    _, expected = inject(
+        FIXTURES_DIR / "target.svg",
+        all_mappings=translations,
+        output_dir=tmp_path / "plain",
+        save_result=True,
+        return_stats=True,
+    )
+
+    assert tree is not None
+    assert stats == expected
+    session_output = (tmp_path / "session" / "target.svg").read_bytes()
+    assert session_output == (tmp_path / "plain" / "target.svg").read_bytes()
+
+
+def test_session_loads_mapping_files_once(tmp_path, translations):
+    mapping_file = tmp_path / "mapping.json"
+    mapping_file.write_text(json.dumps(translations), encoding="utf-8")
+    session = TranslationSession(mapping_files=[mapping_file])
+    mapping_file.unlink()
+
+    for _ in range(3):
+        tree, stats = session.inject(FIXTURES_DIR / "target.svg")
+        assert tree is not None
+        assert stats["inserted_translations"] > 0
+
+
+def test_session_needs_a_mapping(tmp_path):
+    with pytest.raises(ValueError):
+        TranslationSession()
+    with pytest.raises(ValueError):
+        TranslationSession(mapping_files=[tmp_path / "missing.json"])
+
+
+def test_session_extract_and_plan(translations):
+    session = TranslationSession(translations)
+
+    assert session.extract(FIXTURES_DIR / "source.svg") == translations
+    assert session.plan(FIXTURES_DIR / "target.svg") == plan_injection(
+        FIXTURES_DIR / "target.svg", all_mappings=translations
+    )
+
+
+def test_session_batch_matches_start_injects(tmp_path, translations):
+    inputs = tmp_path / "inputs"
+    inputs.mkdir()
+    files = [inputs / "first.svg", inputs / "second.svg"]
+    for file in files:
+        file.write_bytes((FIXTURES_DIR / "target.svg").read_bytes())
+    session = TranslationSession(translations, output_dir=tmp_path / "session")
+    (tmp_path / "plain").mkdir()
+
+    report = session.batch(files)
+    expected = start_injects(files, translations, tmp_path / "plain")
+
+    assert report["success"] == 2
+    for name, stats in report["files"].items():
+        assert stats.pop("file_path") == str(tmp_path / "session" / name)
+        assert expected["files"][name].pop("file_path") == str(tmp_path / "plain" / name)
+    assert report == expected
+    for file in files:
+        written = (tmp_path / "session" / file.name).read_bytes()
+        assert written == (tmp_path / "plain" / file.name).read_bytes()
+    with pytest.raises(ValueError):
+        TranslationSession(translations).batch(files)
+
+
+def test_session_parser_per_thread(translations):
+    session = TranslationSession(translations)
+    parsers = []
+    thread = threading.Thread(target=lambda: parsers.append(session.parser()))
+    thread.start()
+    thread.join()
+
+    assert session.parser() is session.parser()
+    assert parsers[0] is not session.parser()
+
+
+def test_session_metrics(tmp_path, translations):
+    session = TranslationSession(translations, output_dir=tmp_path)
+    session.inject(FIXTURES_DIR / "target.svg")
+    session.inject(tmp_path / "missing.svg")
+    session.extract(FIXTURES_DIR / "source.svg")
+    session.batch([FIXTURES_DIR / "target.svg", tmp_path / "missing.svg"])
+
+    metrics = session.metrics()
+    operations = metrics["operations"]
+    assert metrics["setup_seconds"] >= 0
+    inject_counts = {key: operations["inject"][key] for key in ("calls", "files", "errors")}
+    assert inject_counts == {"calls": 2, "files": 2, "errors": 1}
+    assert operations["extract"]["calls"] == 1
+    assert operations["plan"]["calls"] == 0
+    assert (operations["batch"]["files"], operations["batch"]["errors"]) == (2, 1)
+    assert operations["inject"]["seconds"] > 0
+
+
+def test_session_plan_fallback_uses_session_parser(monkeypatch, translations):
+    from CopySVGTranslation.injection import planning
+
+    def unsupported(*args, **kwargs):
+        raise planning.StreamingUnsupported("tree path")
+
+    used = []
+    prepare = planning.make_translation_ready
+
+    def recording_prepare(*args, parser=None, **kwargs):
+        used.append(parser)
+        return prepare(*args, parser=parser, **kwargs)
+
+    monkeypatch.setattr(planning, "plan_streaming", unsupported)
+    monkeypatch.setattr(planning, "make_translation_ready", recording_prepare)
+    session = TranslationSession(translations)
+
+    result = session.plan(FIXTURES_DIR / "target.svg")
+
+    expected = plan_injection(FIXTURES_DIR / "target.svg", all_mappings=translations)
+    assert result["stats"] == expected["stats"]
+    assert used[0] is session.parser()
@@ -7,7 +7,12 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from CopySVGTranslation import make_title_translations, get_titles_translations
+from CopySVGTranslation import (  # noqa: E402
+    make_title_translations,
+    get_titles_translations,
+    make_title_index,
+)
+from CopySVGTranslation.titles import lookup_title, split_title_year  # noqa: E402
 
 
 class TestMakeTitlesTranslations:
@@ -205,3 +210,34 @@ class TestBoth:
         rebuilt = get_titles_translations(extracted, texts)
         assert rebuilt["world Cup 6060"]["es"] == "Copa Mundial 6060"
         assert rebuilt["Olympics 2060"]["fr"] == "Jeux olympiques 2060"
+
+
+class TestTitleIndex:
+
+    TITLES = {
+        " COVID-19 pandemic ": {"ar": "جائحة كوفيد", "es": "Pandemia de COVID-19"},
+        "World Cup": {"es": "Copa Mundial"},
+    }
+
+    def test_make_title_index_normalizes_keys(self):
+        index = make_title_index(self.TITLES)
+        assert set(index) == {"covid-19 pandemic", "world cup"}
+
+    def test_split_title_year(self):
+        assert split_title_year("World Cup 2022") == ("world cup", "2022")
+        assert split_title_year("2022") is None
+        assert split_title_year("World Cup") is None
+
+    def test_lookup_title(self):
+        index = make_title_index(self.TITLES)
+        assert lookup_title(index, "covid-19 pandemic 1990") == {
+            "ar": "جائحة كوفيد 1990",
+            "es": "Pandemia de COVID-19 1990",
+        }
+        assert lookup_title(index, "Olympics 2016") is None
+
+    def test_indexed_results_match_scan(self):
+        index = make_title_index(self.TITLES)
+        texts = ["World Cup 2022", "covid-19 pandemic 2020", "hello", "World Cup"]
+        indexed = get_titles_translations(self.TITLES, texts, title_index=index)
+        assert indexed == get_titles_translations(self.TITLES, texts)